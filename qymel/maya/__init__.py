@@ -3,6 +3,9 @@ from .general import *
 from .components import *
 from .iterators import *
 from .nodetypes import *
+from .dependency_graph import *
+from .animation import *
+from .spatial import *
 from .system import *
 from .scopes import *
 from .menu import *
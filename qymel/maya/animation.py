@@ -0,0 +1,118 @@
+import collections.abc as abc
+import concurrent.futures
+
+import maya.api.OpenMaya as _om2
+import numpy as _np
+
+from . import nodetypes as _nodetypes
+from .internal import anim_curve_impl as _anim_curve_impl
+
+
+class AnimCurveSampler(object):
+    u"""
+    複数のアニメーションカーブを同じ時刻列でまとめてサンプリングする
+      結果は (カーブ数, フレーム数) の配列で、値は UI 単位
+      use_key_data=True の場合、キーの情報だけを Maya から抜き出して、補間の計算は NumPy で行う
+      （max_workers を指定するとワーカースレッドで計算する。Maya 外で評価できないカーブは Maya で評価する）
+    """
+
+    @staticmethod
+    def frames(start: float, end: float, step: float = 1.0) -> _np.ndarray:
+        # end を含める
+        count = int(_np.floor((end - start) / step + 1e-9)) + 1
+        return start + _np.arange(max(count, 0), dtype=_np.float64) * step
+
+    @property
+    def curves(self) -> abc.Sequence[_nodetypes.AnimCurve]:
+        return self.__curves
+
+    def __init__(
+            self,
+            curves: abc.Sequence[_nodetypes.AnimCurve],
+            use_key_data: bool = False,
+            max_workers: int|None = None
+    ) -> None:
+        self.__curves = list(curves)
+        self.__use_key_data = use_key_data
+        self.__max_workers = max_workers
+
+    def sample(self, start: float, end: float, step: float = 1.0) -> _np.ndarray:
+        frames = AnimCurveSampler.frames(start, end, step)
+        result = _np.empty((len(self.__curves), len(frames)), dtype=_np.float64)
+        for first, block in self.iter_chunks(start, end, step):
+            result[first:first + len(block)] = block
+        return result
+
+    def iter_chunks(
+            self,
+            start: float,
+            end: float,
+            step: float = 1.0,
+            chunk_size: int = 256
+    ) -> abc.Iterator[tuple[int, _np.ndarray]]:
+        u"""
+        chunk_size 本ずつサンプリングして (先頭のカーブのインデックス, (chunk_size, フレーム数) の配列) を返す
+          全体の行列を持たずに済むので、カーブ数が多い場合はこちらを使う
+        """
+        frames = AnimCurveSampler.frames(start, end, step)
+
+        executor = None
+        if self.__use_key_data and self.__max_workers is not None:
+            executor = concurrent.futures.ThreadPoolExecutor(max_workers=self.__max_workers)
+
+        try:
+            for first in range(0, len(self.__curves), chunk_size):
+                curves = self.__curves[first:first + chunk_size]
+                if self.__use_key_data:
+                    block = self.__sample_key_data(curves, frames, executor)
+                else:
+                    block = self.__sample_maya(curves, frames)
+                yield first, block
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+    def __sample_maya(self, curves: abc.Sequence[_nodetypes.AnimCurve], frames: _np.ndarray) -> _np.ndarray:
+        block = _np.empty((len(curves), len(frames)), dtype=_np.float64)
+
+        # MTime はカーブ間で使いまわす
+        ui_unit = _om2.MTime.uiUnit()
+        mtimes = [_om2.MTime(frame, ui_unit) for frame in frames.tolist()]
+        inputs = frames.tolist()
+
+        for i, curve in enumerate(curves):
+            evaluate = curve.mfn.evaluate
+            args = inputs if curve.is_unitless_input else mtimes
+            block[i] = [evaluate(arg) for arg in args]
+            block[i] *= curve.output_scale
+
+        return block
+
+    def __sample_key_data(
+            self,
+            curves: abc.Sequence[_nodetypes.AnimCurve],
+            frames: _np.ndarray,
+            executor: concurrent.futures.Executor|None
+    ) -> _np.ndarray:
+        block = _np.empty((len(curves), len(frames)), dtype=_np.float64)
+        seconds = frames * _om2.MTime(1.0, _om2.MTime.uiUnit()).asUnits(_om2.MTime.kSeconds)
+
+        # キー情報の抜き出しは Maya の API を呼ぶのでメインスレッドで行う
+        tasks = []
+        for i, curve in enumerate(curves):
+            is_unitless_input = curve.is_unitless_input
+            data = _anim_curve_impl.extract_key_data(curve.mfn, is_unitless_input)
+            if data is None:
+                block[i] = curve.evaluate_many(frames)
+                continue
+            tasks.append((i, data, frames if is_unitless_input else seconds, curve.output_scale))
+
+        def _evaluate(task: tuple) -> tuple[int, _np.ndarray]:
+            index, key_data, times, scale = task
+            return index, _anim_curve_impl.evaluate_key_data(key_data, times) * scale
+
+        results = executor.map(_evaluate, tasks) if executor is not None else map(_evaluate, tasks)
+        for index, values in results:
+            block[index] = values
+
+        return block
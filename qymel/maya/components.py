@@ -19,6 +19,7 @@ TCompElem = typing.TypeVar('TCompElem')
 
 # 呼び出し回数が極端に多くなる可能性のある静的メソッドをキャッシュ化しておく
 _graphs_get_comp_mobject = _graphs.get_comp_mobject
+_om2_MObjectHandle = _om2.MObjectHandle
 
 
 class Component(_objects.MayaObject, typing.Generic[TCompFn, TCompElem, TCompIter]):
@@ -35,10 +36,10 @@ class Component(_objects.MayaObject, typing.Generic[TCompFn, TCompElem, TCompIte
 
     @property
     def exists(self) -> bool:
-        for mel_obj in self.mel_object:
-            if not _cmds.objExists(mel_obj):
-                return False
-        return True
+        mdagpath = self._mdagpath
+        if not mdagpath.isValid() or not _om2_MObjectHandle(mdagpath.node()).isValid():
+            return False
+        return self._is_in_range()
 
     @property
     def mdagpath(self) -> _om2.MDagPath:
@@ -118,6 +119,10 @@ class Component(_objects.MayaObject, typing.Generic[TCompFn, TCompElem, TCompIte
     def set_complete(self, count: int) -> None:
         self.mfn.setCompleteData(count)
 
+    def _is_in_range(self) -> bool:
+        # 要素のインデックスがシェイプの要素数に収まっているか（要素数が分からない型は常に True）
+        return True
+
     @classmethod
     def _create_api_comp(cls: TComponent, elements: collections.abc.Sequence[TCompElem]|None = None) -> TCompFn:
         comp = cls._comp_mfn()
@@ -144,6 +149,16 @@ class SingleIndexedComponent(
     def element(self, index: int) -> int:
         return self.mfn.element(index)
 
+    def _element_count(self) -> int|None:
+        return None
+
+    def _is_in_range(self) -> bool:
+        count = self._element_count()
+        mfn = self.mfn
+        if count is None or mfn.isEmpty:
+            return True
+        return max(mfn.getElements()) < count
+
     @abc.abstractmethod
     def iterator(self) -> TCompIter:
         raise NotImplementedError()
@@ -162,6 +177,17 @@ class DoubleIndexedComponent(
     def element(self, index: int) -> tuple[int, int]:
         return self.mfn.getElement(index)
 
+    def _element_counts(self) -> tuple[int, int]|None:
+        return None
+
+    def _is_in_range(self) -> bool:
+        counts = self._element_counts()
+        mfn = self.mfn
+        if counts is None or mfn.isEmpty:
+            return True
+        elements = mfn.getElements()
+        return max(u for u, _ in elements) < counts[0] and max(v for _, v in elements) < counts[1]
+
     @abc.abstractmethod
     def iterator(self) -> TCompIter:
         raise NotImplementedError()
@@ -175,6 +201,9 @@ class MeshVertex(SingleIndexedComponent[_iterators.MeshVertexIter]):
     def __init__(self, obj: _om2.MObject|str, mdagpath: _om2.MDagPath) -> None:
         super(MeshVertex, self).__init__(obj, mdagpath)
 
+    def _element_count(self) -> int:
+        return _om2.MFnMesh(self.mdagpath).numVertices
+
     def iterator(self) -> _iterators.MeshVertexIter:
         ite = _om2.MItMeshVertex(self.mdagpath, self.mobject)
         return _iterators.MeshVertexIter(ite, self, _om2.MFnMesh(self.mdagpath))
@@ -188,6 +217,9 @@ class MeshFace(SingleIndexedComponent[_iterators.MeshFaceIter]):
     def __init__(self, obj: _om2.MObject|str, mdagpath: _om2.MDagPath) -> None:
         super(MeshFace, self).__init__(obj, mdagpath)
 
+    def _element_count(self) -> int:
+        return _om2.MFnMesh(self.mdagpath).numPolygons
+
     def iterator(self) -> _iterators.MeshFaceIter:
         ite = _om2.MItMeshPolygon(self.mdagpath, self.mobject)
         return _iterators.MeshFaceIter(ite, self, _om2.MFnMesh(self.mdagpath))
@@ -201,6 +233,9 @@ class MeshEdge(SingleIndexedComponent[_iterators.MeshEdgeIter]):
     def __init__(self, obj: _om2.MObject|str, mdagpath: _om2.MDagPath) -> None:
         super(MeshEdge, self).__init__(obj, mdagpath)
 
+    def _element_count(self) -> int:
+        return _om2.MFnMesh(self.mdagpath).numEdges
+
     def iterator(self) -> _iterators.MeshEdgeIter:
         ite = _om2.MItMeshEdge(self.mdagpath, self.mobject)
         return _iterators.MeshEdgeIter(ite, self, _om2.MFnMesh(self.mdagpath))
@@ -214,6 +249,10 @@ class MeshVertexFace(DoubleIndexedComponent[_iterators.MeshFaceVertexIter]):
     def __init__(self, obj: _om2.MObject|str, mdagpath: _om2.MDagPath) -> None:
         super(MeshVertexFace, self).__init__(obj, mdagpath)
 
+    def _element_counts(self) -> tuple[int, int]:
+        mfn = _om2.MFnMesh(self.mdagpath)
+        return mfn.numVertices, mfn.numPolygons
+
     def iterator(self) -> _iterators.MeshFaceVertexIter:
         ite = _om2.MItMeshFaceVertex(self.mdagpath, self.mobject)
         return _iterators.MeshFaceVertexIter(ite, self, _om2.MFnMesh(self.mdagpath))
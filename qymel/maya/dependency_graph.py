@@ -0,0 +1,203 @@
+import collections
+import collections.abc as abc
+
+import maya.api.OpenMaya as _om2
+
+from . import objects as _objects
+from .internal.types import *
+from .internal import graphs as _graphs
+
+
+# 呼び出し回数が極端に多くなる可能性のある静的メソッドをキャッシュ化しておく
+_om2_MObjectHandle = _om2.MObjectHandle
+_om2_MDagPath_getAPathTo = _om2.MDagPath.getAPathTo
+_om2_MFn_kDagNode = _om2.MFn.kDagNode
+_graphs_to_node_instance = _graphs.to_node_instance
+
+
+class DependencyGraphSnapshot(object):
+    u"""
+    シーン中の全コネクションを一度だけ集めて、ノードの整数IDによる隣接リストにしたもの
+      構築後の上流・下流の問い合わせでは Maya を呼ばない（結果をラッパーにする時を除く）
+      start_tracking() 中はコネクションやノードの増減をコールバックで反映する
+    """
+
+    @property
+    def node_count(self) -> int:
+        return len(self.__ids)
+
+    @property
+    def is_tracking(self) -> bool:
+        return len(self.__callback_ids) > 0
+
+    def __init__(self) -> None:
+        self.__ids: dict[int, int] = {}
+        self.__handles: list[_om2.MObjectHandle|None] = []
+        self.__sources: list[collections.Counter] = []
+        self.__destinations: list[collections.Counter] = []
+        self.__callback_ids: list[int] = []
+        self.build()
+
+    def build(self) -> None:
+        self.__ids.clear()
+        self.__handles.clear()
+        self.__sources.clear()
+        self.__destinations.clear()
+
+        ite = _om2.MItDependencyNodes()
+        while not ite.isDone():
+            self.__add_node(ite.thisNode())
+            ite.next()
+
+        tmp_mfn = _om2.MFnDependencyNode()
+        for dst_id, handle in enumerate(self.__handles):
+            tmp_mfn.setObject(handle.object())
+            for mplug in tmp_mfn.getConnections():
+                if not mplug.isDestination:
+                    continue
+                for src_mplug in mplug.connectedTo(True, False):
+                    src_id = self.__ids.get(_om2_MObjectHandle(src_mplug.node()).hashCode(), None)
+                    if src_id is not None:
+                        self.__add_edge(src_id, dst_id)
+
+    def start_tracking(self) -> None:
+        if self.is_tracking:
+            return
+        self.__callback_ids = [
+            _om2.MDGMessage.addConnectionCallback(self.__on_connection_changed),
+            _om2.MDGMessage.addNodeAddedCallback(self.__on_node_added, 'dependNode'),
+            _om2.MDGMessage.addNodeRemovedCallback(self.__on_node_removed, 'dependNode'),
+        ]
+
+    def stop_tracking(self) -> None:
+        if not self.is_tracking:
+            return
+        _om2.MMessage.removeCallbacks(self.__callback_ids)
+        self.__callback_ids = []
+
+    def node_id(self, node: _objects.MayaObject) -> int|None:
+        return self.__ids.get(node.mobject_handle.hashCode(), None)
+
+    def contains(self, node: _objects.MayaObject) -> bool:
+        return self.node_id(node) is not None
+
+    def source_ids(self, node_id: int) -> list[int]:
+        return list(self.__sources[node_id])
+
+    def destination_ids(self, node_id: int) -> list[int]:
+        return list(self.__destinations[node_id])
+
+    def upstream_ids(self, node_id: int, max_depth: int|None = None) -> list[int]:
+        return self.__traverse(node_id, self.__sources, max_depth)
+
+    def downstream_ids(self, node_id: int, max_depth: int|None = None) -> list[int]:
+        return self.__traverse(node_id, self.__destinations, max_depth)
+
+    def sources(self, node: _objects.MayaObject) -> list[TDependNode]:
+        return self.__to_nodes(self.source_ids(self.__require_id(node)))
+
+    def destinations(self, node: _objects.MayaObject) -> list[TDependNode]:
+        return self.__to_nodes(self.destination_ids(self.__require_id(node)))
+
+    def upstream(self, node: _objects.MayaObject, max_depth: int|None = None) -> list[TDependNode]:
+        return self.__to_nodes(self.upstream_ids(self.__require_id(node), max_depth))
+
+    def downstream(self, node: _objects.MayaObject, max_depth: int|None = None) -> list[TDependNode]:
+        return self.__to_nodes(self.downstream_ids(self.__require_id(node), max_depth))
+
+    def history(self, node: _objects.MayaObject) -> list[TDependNode]:
+        # listHistory と同様に自分自身を先頭に含める
+        node_id = self.__require_id(node)
+        return self.__to_nodes([node_id] + self.upstream_ids(node_id))
+
+    def future(self, node: _objects.MayaObject) -> list[TDependNode]:
+        node_id = self.__require_id(node)
+        return self.__to_nodes([node_id] + self.downstream_ids(node_id))
+
+    def node(self, node_id: int) -> TDependNode|None:
+        handle = self.__handles[node_id]
+        if handle is None or not handle.isAlive():
+            return None
+
+        mobj = handle.object()
+        mdagpath = _om2_MDagPath_getAPathTo(mobj) if mobj.hasFn(_om2_MFn_kDagNode) else None
+        return _graphs_to_node_instance(_om2.MFnDependencyNode(mobj), mdagpath)
+
+    def __add_node(self, mobj: _om2.MObject) -> int:
+        handle = _om2_MObjectHandle(mobj)
+        hash_code = handle.hashCode()
+
+        node_id = self.__ids.get(hash_code, None)
+        if node_id is not None:
+            return node_id
+
+        node_id = len(self.__handles)
+        self.__ids[hash_code] = node_id
+        self.__handles.append(handle)
+        self.__sources.append(collections.Counter())
+        self.__destinations.append(collections.Counter())
+        return node_id
+
+    def __add_edge(self, src_id: int, dst_id: int) -> None:
+        self.__sources[dst_id][src_id] += 1
+        self.__destinations[src_id][dst_id] += 1
+
+    def __remove_edge(self, src_id: int, dst_id: int) -> None:
+        for counter, key in ((self.__sources[dst_id], src_id), (self.__destinations[src_id], dst_id)):
+            counter[key] -= 1
+            if counter[key] <= 0:
+                del counter[key]
+
+    def __require_id(self, node: _objects.MayaObject) -> int:
+        node_id = self.node_id(node)
+        if node_id is None:
+            raise KeyError('{} is not in the snapshot'.format(node))
+        return node_id
+
+    def __traverse(self, node_id: int, adjacency: list[collections.Counter], max_depth: int|None) -> list[int]:
+        result = []
+        visited = {node_id}
+        queue = collections.deque([(node_id, 0)])
+
+        while len(queue) > 0:
+            current_id, depth = queue.popleft()
+            if max_depth is not None and depth >= max_depth:
+                continue
+            for other_id in adjacency[current_id]:
+                if other_id in visited:
+                    continue
+                visited.add(other_id)
+                result.append(other_id)
+                queue.append((other_id, depth + 1))
+
+        return result
+
+    def __to_nodes(self, node_ids: abc.Iterable[int]) -> list[TDependNode]:
+        nodes = (self.node(node_id) for node_id in node_ids)
+        return [node for node in nodes if node is not None]
+
+    def __on_connection_changed(self, src_mplug: _om2.MPlug, dst_mplug: _om2.MPlug, made: bool, *_) -> None:
+        src_id = self.__add_node(src_mplug.node())
+        dst_id = self.__add_node(dst_mplug.node())
+        if made:
+            self.__add_edge(src_id, dst_id)
+        elif self.__sources[dst_id][src_id] > 0:
+            self.__remove_edge(src_id, dst_id)
+
+    def __on_node_added(self, mobj: _om2.MObject, *_) -> None:
+        self.__add_node(mobj)
+
+    def __on_node_removed(self, mobj: _om2.MObject, *_) -> None:
+        node_id = self.__ids.pop(_om2_MObjectHandle(mobj).hashCode(), None)
+        if node_id is None:
+            return
+
+        # ID は振り直さずに欠番にする
+        for src_id in list(self.__sources[node_id]):
+            self.__destinations[src_id].pop(node_id, None)
+        for dst_id in list(self.__destinations[node_id]):
+            self.__sources[dst_id].pop(node_id, None)
+
+        self.__handles[node_id] = None
+        self.__sources[node_id].clear()
+        self.__destinations[node_id].clear()
@@ -1,14 +1,18 @@
+import collections
 import collections.abc as abc
 import typing
 import functools
 
 import maya.cmds as _cmds
 import maya.api.OpenMaya as _om2
+import numpy as _np
 
 from .internal.types import *
 from .internal import graphs as _graphs
 from .internal import factory as _factory
 from .internal import plug_impl as _plug_impl
+from .internal import modifier_impl as _modifier_impl
+from .internal import name_cache_impl as _name_cache_impl
 
 if typing.TYPE_CHECKING:
     from . import nodetypes as _nodetypes
@@ -16,6 +20,7 @@ if typing.TYPE_CHECKING:
 
 # 呼び出し回数が極端に多くなる可能性のある静的メソッドをキャッシュ化しておく
 _om2_MFnComponent = _om2.MFnComponent
+_om2_MObjectHandle = _om2.MObjectHandle
 _om2_MFnDependencyNode = _om2.MFnDependencyNode
 _om2_MFnDagNode = _om2.MFnDagNode
 _om2_MDagPath_getAPathTo = _om2.MDagPath.getAPathTo
@@ -29,6 +34,8 @@ _graphs_eval_node = _graphs.eval_node
 _graphs_eval_plug = _graphs.eval_plug
 _graphs_eval_component = _graphs.eval_component
 _factory_PlugFactory_create = _factory.PlugFactory.create
+_name_cache_impl_generation = _name_cache_impl.generation
+_name_cache_impl_watch_attributes = _name_cache_impl.watch_attributes
 
 
 def deprecated(message):
@@ -68,14 +75,38 @@ def eval_component(comp_name: str) -> TComponent:
     return _graphs_eval_component(comp_name, tmp_mfn)
 
 
+def is_name_cache_enabled() -> bool:
+    return _name_cache_impl.is_enabled()
+
+
+def set_name_cache_enabled(enabled: bool) -> None:
+    u"""
+    ノードやプラグの名前の文字列（full_name, mel_object）のキャッシュを切り替える
+      キャッシュはリネームや親子付けの変更のコールバックで無効になる。デバッグ時に疑わしい場合は切っておく
+    """
+    _name_cache_impl.set_enabled(enabled)
+
+
 class Plug(object):
 
     @property
     def mel_object(self) -> str:
+        # リネームや親子付けの変更があるまでは、前回の文字列を使いまわす
+        generation = _name_cache_impl_generation()
+        if generation is not None and generation == self._mel_object_generation:
+            return self._mel_object
+
         mfn_node = self.mfn_node
         if isinstance(mfn_node, _om2_MFnDagNode):
-            return '{}.{}'.format(mfn_node.fullPathName(), self._mplug.partialName())
-        return self._mplug.name()
+            mel_object = '{}.{}'.format(mfn_node.fullPathName(), self._mplug.partialName())
+        else:
+            mel_object = self._mplug.name()
+
+        if generation is not None:
+            _name_cache_impl_watch_attributes(self._mplug.node())
+        self._mel_object = mel_object
+        self._mel_object_generation = generation
+        return mel_object
 
     @property
     def mplug(self) -> _om2.MPlug:
@@ -110,7 +141,24 @@ class Plug(object):
 
     @property
     def full_name(self) -> str:
-        return _cmds.ls(self.mel_object, long=True)[0]
+        # cmds.ls(mel_object, long=True) と同じ文字列を API だけで組み立てる
+        generation = _name_cache_impl_generation()
+        if generation is not None and generation == self._full_name_generation:
+            return self._full_name
+
+        mplug = self._mplug
+        mfn_node = self.mfn_node
+        if isinstance(mfn_node, _om2_MFnDagNode):
+            node_name = mfn_node.fullPathName()
+        else:
+            node_name = mfn_node.name()
+        full_name = '{}.{}'.format(node_name, mplug.partialName(includeNonMandatoryIndices=True, useLongNames=True))
+
+        if generation is not None:
+            _name_cache_impl_watch_attributes(mplug.node())
+        self._full_name = full_name
+        self._full_name_generation = generation
+        return full_name
 
     @property
     def api_type(self) -> int:
@@ -142,14 +190,27 @@ class Plug(object):
 
     @property
     def exists(self) -> bool:
-        return _cmds.objExists(self.mel_object)
+        mplug = self._mplug
+        if mplug.isNull or not self._node_handle.isValid():
+            return False
+
+        # 動的アトリビュートは削除されている可能性がある
+        mattr = mplug.attribute()
+        if not _om2_MObjectHandle(mattr).isValid():
+            return False
+        return not mplug.isDynamic or self.mfn_node.hasAttribute(_om2.MFnAttribute(mattr).name)
 
     def __init__(self, plug: _om2.MPlug|str) -> None:
         if isinstance(plug, str):
             plug = _graphs.get_mplug(plug)
         self._mplug = _graphs.keep_mplug(plug)
+        self._node_handle = _om2_MObjectHandle(self._mplug.node())
         self._mfn_node: _om2.MFnDependencyNode|None = None
         self._node: _nodetypes.DependNode|None = None
+        self._mel_object: str|None = None
+        self._mel_object_generation: int|None = None
+        self._full_name: str|None = None
+        self._full_name_generation: int|None = None
 
     def __str__(self) -> str:
         return repr(self)
@@ -165,6 +226,42 @@ class Plug(object):
 
         return Plug(mplug.elementByLogicalIndex(item))
 
+    def logical_indices(self) -> _np.ndarray:
+        u"""
+        存在する要素の論理インデックス（疎な配列では連続しない）
+        """
+        mplug = self._mplug
+
+        if not mplug.isArray:
+            raise RuntimeError('{} is not array'.format(self.name))
+
+        return _np.array(mplug.getExistingArrayAttributeIndices(), dtype=_np.int64)
+
+    def elements(self) -> list['Plug']:
+        u"""
+        存在する要素のプラグを論理インデックス順に返す
+        """
+        mplug = self._mplug
+
+        if not mplug.isArray:
+            raise RuntimeError('{} is not array'.format(self.name))
+
+        return [_factory_PlugFactory_create(mplug.elementByPhysicalIndex(i)) for i in range(mplug.numElements())]
+
+    def get_elements(self, as_array: bool = False) -> tuple[_np.ndarray, list[object]|_np.ndarray]:
+        u"""
+        存在する要素の (論理インデックス, 値) をまとめて読む
+        """
+        mplug = self._mplug
+
+        if not mplug.isArray:
+            raise RuntimeError('{} is not array'.format(self.name))
+        if mplug.isNetworked:
+            raise RuntimeError('{} is networked'.format(self.name))
+
+        indices, values = _plug_impl.plug_get_elements_impl(mplug)
+        return _np.array(indices, dtype=_np.int64), (_np.array(values) if as_array else values)
+
     def node(self) -> TDependNode:
         if self._node is None:
             mfn_node = self.mfn_node
@@ -183,6 +280,19 @@ class Plug(object):
 
         return _plug_impl.plug_get_impl(mplug)
 
+    @staticmethod
+    def get_many(plugs: abc.Iterable['Plug'], as_array: bool = False) -> list[object]|_np.ndarray:
+        values = _plug_impl.plug_get_many_impl([plug._mplug for plug in plugs])
+        return _np.array(values) if as_array else values
+
+    @staticmethod
+    def getter_cache_info() -> _plug_impl.GetterCacheInfo:
+        return _plug_impl.getter_cache_info()
+
+    @staticmethod
+    def clear_getter_cache() -> None:
+        _plug_impl.clear_getter_cache()
+
     def get_attr(self, **kwargs) -> object:
         return _cmds_getAttr(self.mel_object, **kwargs)
 
@@ -205,6 +315,237 @@ class Plug(object):
 _factory.PlugFactory.register(Plug)
 
 
+class PlugWriter(object):
+    u"""
+    プラグへの書き込みをためておいて、1 つの MDGModifier でまとめて適用する
+      undoable=True の場合、まとめた書き込み全体が 1 回の undo で戻る
+      値は Plug.get() が返すのと同じ形式（UI単位）で、compound と array には NumPy 配列も渡せる
+      array にリストや配列を渡すと i 番目の値を論理インデックス i に書き込む
+      疎な配列に書き込む場合は {論理インデックス: 値} の dict を渡す（get_elements() の値は dict(zip(*plug.get_elements())) で渡せる）
+
+    with PlugWriter() as writer:
+        for node in nodes:
+            writer.set(node.tx, 1.0)
+    """
+
+    def __init__(self, undoable: bool = True) -> None:
+        self.__undoable = undoable
+        self.__entries: list[tuple[_om2.MPlug, object]] = []
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+    def __enter__(self) -> 'PlugWriter':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        # 例外で抜けた場合はためた書き込みを捨てる
+        if exc_type is None:
+            self.apply()
+        else:
+            self.clear()
+
+    def set(self, plug: Plug|_om2.MPlug|str, value: object) -> None:
+        self.__entries.append((_to_mplug(plug), value))
+
+    def extend(self, plugs: abc.Iterable[Plug|_om2.MPlug|str], values: abc.Iterable[object]) -> None:
+        for plug, value in zip(plugs, values):
+            self.set(plug, value)
+
+    def clear(self) -> None:
+        self.__entries.clear()
+
+    def apply(self) -> None:
+        entries = self.__entries
+        if len(entries) == 0:
+            return
+        self.__entries = []
+
+        modifier = _om2.MDGModifier()
+        resolve_setter = _plug_impl.resolve_setter
+        for mplug, value in entries:
+            resolve_setter(mplug)(modifier, mplug, value)
+
+        _modifier_impl.commit(modifier, self.__undoable)
+
+
+# ConnectionBatch で適用できなかった接続操作
+ConnectionFailure = collections.namedtuple('ConnectionFailure', ['operation', 'source', 'destination', 'message'])
+
+
+class ConnectionBatch(object):
+    u"""
+    connect/disconnect をためておいて、1 つの MDGModifier でまとめて適用する
+      undoable=True の場合、まとめた操作全体が 1 回の undo で戻る
+      適用できなかった操作は failures に残り、他の操作は適用される
+
+    with ConnectionBatch() as batch:
+        for src, dst in pairs:
+            batch.connect(src, dst)
+    for failure in batch.failures:
+        print(failure)
+    """
+
+    CONNECT = 'connect'
+    DISCONNECT = 'disconnect'
+
+    @property
+    def failures(self) -> list[ConnectionFailure]:
+        return self.__failures
+
+    def __init__(self, undoable: bool = True) -> None:
+        self.__undoable = undoable
+        self.__entries: list[tuple[str, _om2.MPlug, _om2.MPlug, bool]] = []
+        self.__failures: list[ConnectionFailure] = []
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+    def __enter__(self) -> 'ConnectionBatch':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        # 例外で抜けた場合はためた操作を捨てる
+        if exc_type is None:
+            self.apply()
+        else:
+            self.clear()
+
+    def connect(self, source: Plug|_om2.MPlug|str, destination: Plug|_om2.MPlug|str, force: bool = False) -> None:
+        u"""
+        force=True の場合、destination の既存の接続を切ってから接続する
+        """
+        self.__entries.append((ConnectionBatch.CONNECT, _to_mplug(source), _to_mplug(destination), force))
+
+    def disconnect(self, source: Plug|_om2.MPlug|str, destination: Plug|_om2.MPlug|str) -> None:
+        self.__entries.append((ConnectionBatch.DISCONNECT, _to_mplug(source), _to_mplug(destination), False))
+
+    def clear(self) -> None:
+        self.__entries.clear()
+
+    def apply(self) -> list[ConnectionFailure]:
+        u"""
+        ためた操作を適用して、今回適用できなかった操作を返す
+        """
+        entries = self.__entries
+        self.__entries = []
+        failures: list[ConnectionFailure] = []
+
+        # 適用後の接続状態を追いかけながら、失敗が分かっている操作を先に弾く
+        sources: dict[str, _om2.MPlug|None] = {}
+        operations: list[tuple[tuple[str, _om2.MPlug, _om2.MPlug, bool], list[tuple[str, _om2.MPlug, _om2.MPlug]]]] = []
+        for entry in entries:
+            steps, message = _plan_connection(entry, sources)
+            if message is not None:
+                failures.append(_to_connection_failure(entry, message))
+            elif len(steps) > 0:
+                operations.append((entry, steps))
+
+        if len(operations) > 0:
+            def _operation() -> list[_om2.MDGModifier]:
+                return _apply_connections(operations, failures)
+            _modifier_impl.run(_operation, self.__undoable)
+
+        self.__failures.extend(failures)
+        return failures
+
+
+def _to_mplug(plug: Plug|_om2.MPlug|str) -> _om2.MPlug:
+    if isinstance(plug, Plug):
+        return plug._mplug
+    if isinstance(plug, str):
+        return _graphs.get_mplug(plug)
+    return plug
+
+
+def _to_connection_failure(entry: tuple[str, _om2.MPlug, _om2.MPlug, bool], message: str) -> ConnectionFailure:
+    operation, source, destination, _ = entry
+    return ConnectionFailure(operation, Plug(source), Plug(destination), message)
+
+
+def _plan_connection(
+        entry: tuple[str, _om2.MPlug, _om2.MPlug, bool],
+        sources: dict[str, _om2.MPlug|None]
+) -> tuple[list[tuple[str, _om2.MPlug, _om2.MPlug]], str|None]:
+    # entry を MDGModifier に積む手順に分解する。失敗が分かっている場合はその理由を返す
+    operation, source, destination, force = entry
+    if source.isNull or destination.isNull:
+        return [], 'null plug'
+
+    key = destination.name()
+    if key in sources:
+        current = sources[key]
+    else:
+        current = destination.source() if destination.isDestination else None
+    is_connected = current is not None and not current.isNull and current == source
+
+    if operation == ConnectionBatch.DISCONNECT:
+        if not is_connected:
+            return [], 'not connected'
+        sources[key] = None
+        return [(ConnectionBatch.DISCONNECT, source, destination)], None
+
+    if is_connected:
+        return [], None
+    if destination.isLocked:
+        return [], 'destination is locked'
+
+    steps = []
+    if current is not None and not current.isNull:
+        if not force:
+            return [], 'destination is already connected from {}'.format(current.name())
+        steps.append((ConnectionBatch.DISCONNECT, current, destination))
+    steps.append((ConnectionBatch.CONNECT, source, destination))
+
+    sources[key] = source
+    return steps, None
+
+
+def _apply_connections(
+        operations: list[tuple[tuple[str, _om2.MPlug, _om2.MPlug, bool], list[tuple[str, _om2.MPlug, _om2.MPlug]]]],
+        failures: list[ConnectionFailure]
+) -> list[_om2.MDGModifier]:
+    # まず全部を 1 つの MDGModifier で適用する
+    modifier = _om2.MDGModifier()
+    try:
+        for _, steps in operations:
+            _queue_connection_steps(modifier, steps)
+    except RuntimeError:
+        pass
+    else:
+        try:
+            modifier.doIt()
+            return [modifier]
+        except RuntimeError:
+            modifier.undoIt()
+
+    # 失敗した場合は、どの操作が原因かを特定するために 1 操作ずつ適用しなおす
+    modifiers = []
+    for entry, steps in operations:
+        modifier = _om2.MDGModifier()
+        try:
+            _queue_connection_steps(modifier, steps)
+        except RuntimeError as e:
+            failures.append(_to_connection_failure(entry, str(e)))
+            continue
+        try:
+            modifier.doIt()
+        except RuntimeError as e:
+            modifier.undoIt()
+            failures.append(_to_connection_failure(entry, str(e)))
+            continue
+        modifiers.append(modifier)
+    return modifiers
+
+
+def _queue_connection_steps(modifier: _om2.MDGModifier, steps: list[tuple[str, _om2.MPlug, _om2.MPlug]]) -> None:
+    for operation, source, destination in steps:
+        if operation == ConnectionBatch.CONNECT:
+            modifier.connect(source, destination)
+        else:
+            modifier.disconnect(source, destination)
+
+
 class ColorSet(object):
 
     @property
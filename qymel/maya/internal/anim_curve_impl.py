@@ -0,0 +1,159 @@
+import collections
+
+import maya.api.OpenMaya as _om2
+import maya.api.OpenMayaAnim as _om2anim
+import numpy as _np
+
+
+# times は秒（入力が unitless のカーブはそのままの値）、values と接線の y は内部単位
+CurveKeyData = collections.namedtuple(
+    'CurveKeyData',
+    [
+        'times', 'values',
+        'in_x', 'in_y', 'out_x', 'out_y',
+        'out_types', 'is_weighted',
+        'pre_infinity', 'post_infinity',
+    ]
+)
+
+
+_SUPPORTED_INFINITY_TYPES = (_om2anim.MFnAnimCurve.kConstant, _om2anim.MFnAnimCurve.kLinear)
+
+# 重み付き接線の Bezier を x について解く時の二分法の反復回数（2^-40 まで詰める）
+_BISECTION_ITERATIONS = 40
+
+
+def extract_key_data(mfn: _om2anim.MFnAnimCurve, is_unitless_input: bool) -> CurveKeyData|None:
+    u"""
+    カーブの評価に必要なキーの情報を配列にして抜き出す
+      Maya 外で評価できないカーブ（cycle などの infinity）は None を返す
+    """
+    if mfn.preInfinityType not in _SUPPORTED_INFINITY_TYPES or mfn.postInfinityType not in _SUPPORTED_INFINITY_TYPES:
+        return None
+
+    key_count = mfn.numKeys
+    if is_unitless_input:
+        times = [mfn.unitlessInput(i) for i in range(key_count)]
+    else:
+        times = [mfn.input(i).asUnits(_om2.MTime.kSeconds) for i in range(key_count)]
+
+    in_tangents = [mfn.getTangentXY(i, True) for i in range(key_count)]
+    out_tangents = [mfn.getTangentXY(i, False) for i in range(key_count)]
+
+    in_xy = _np.array(in_tangents, dtype=_np.float64).reshape(-1, 2)
+    out_xy = _np.array(out_tangents, dtype=_np.float64).reshape(-1, 2)
+
+    return CurveKeyData(
+        _np.array(times, dtype=_np.float64),
+        _np.array([mfn.value(i) for i in range(key_count)], dtype=_np.float64),
+        in_xy[:, 0], in_xy[:, 1],
+        out_xy[:, 0], out_xy[:, 1],
+        _np.array([mfn.outTangentType(i) for i in range(key_count)], dtype=_np.int64),
+        mfn.isWeighted,
+        mfn.preInfinityType,
+        mfn.postInfinityType,
+    )
+
+
+def evaluate_key_data(data: CurveKeyData, times: _np.ndarray) -> _np.ndarray:
+    u"""
+    extract_key_data() で抜き出したキーから times（秒）の値（内部単位）を計算する
+      Maya の API を呼ばないので、ワーカースレッドから呼んでよい
+    """
+    key_times = data.times
+    key_values = data.values
+    key_count = len(key_times)
+
+    if key_count == 0:
+        return _np.zeros(len(times), dtype=_np.float64)
+    if key_count == 1:
+        return _np.full(len(times), key_values[0], dtype=_np.float64)
+
+    # 各時刻が属するセグメント
+    seg = _np.clip(_np.searchsorted(key_times, times, side='right') - 1, 0, key_count - 2)
+    t0 = key_times[seg]
+    t1 = key_times[seg + 1]
+    p0 = key_values[seg]
+    p3 = key_values[seg + 1]
+    dt = t1 - t0
+
+    if data.is_weighted:
+        result = _evaluate_bezier(
+            times, t0, t1, p0, p3,
+            data.out_x[seg], data.out_y[seg], data.in_x[seg + 1], data.in_y[seg + 1]
+        )
+    else:
+        m0 = _slope(data.out_x[seg], data.out_y[seg])
+        m1 = _slope(data.in_x[seg + 1], data.in_y[seg + 1])
+        s = _np.clip((times - t0) / dt, 0.0, 1.0)
+        s2 = s * s
+        s3 = s2 * s
+        result = (
+            p0 * (2.0 * s3 - 3.0 * s2 + 1.0)
+            + m0 * dt * (s3 - 2.0 * s2 + s)
+            + p3 * (-2.0 * s3 + 3.0 * s2)
+            + m1 * dt * (s3 - s2)
+        )
+
+    out_types = data.out_types[seg]
+    result = _np.where(out_types == _om2anim.MFnAnimCurve.kTangentStep, p0, result)
+    result = _np.where(out_types == _om2anim.MFnAnimCurve.kTangentStepNext, p3, result)
+
+    before = times < key_times[0]
+    if _np.any(before):
+        if data.pre_infinity == _om2anim.MFnAnimCurve.kLinear:
+            slope = _slope(data.in_x[0], data.in_y[0])
+            result[before] = key_values[0] + (times[before] - key_times[0]) * slope
+        else:
+            result[before] = key_values[0]
+
+    after = times > key_times[-1]
+    if _np.any(after):
+        if data.post_infinity == _om2anim.MFnAnimCurve.kLinear:
+            slope = _slope(data.out_x[-1], data.out_y[-1])
+            result[after] = key_values[-1] + (times[after] - key_times[-1]) * slope
+        else:
+            result[after] = key_values[-1]
+
+    return result
+
+
+def _slope(x: _np.ndarray|float, y: _np.ndarray|float) -> _np.ndarray:
+    x = _np.asarray(x, dtype=_np.float64)
+    y = _np.asarray(y, dtype=_np.float64)
+    safe_x = _np.where(x == 0.0, 1.0, x)
+    return _np.where(x == 0.0, 0.0, y / safe_x)
+
+
+def _evaluate_bezier(
+        times: _np.ndarray,
+        t0: _np.ndarray,
+        t1: _np.ndarray,
+        p0: _np.ndarray,
+        p3: _np.ndarray,
+        out_x: _np.ndarray,
+        out_y: _np.ndarray,
+        in_x: _np.ndarray,
+        in_y: _np.ndarray
+) -> _np.ndarray:
+    # 制御点はキーから接線の 1/3 だけ離れた位置にある
+    x1 = t0 + out_x / 3.0
+    x2 = t1 - in_x / 3.0
+    y1 = p0 + out_y / 3.0
+    y2 = p3 - in_y / 3.0
+
+    def _bezier(a: _np.ndarray, b: _np.ndarray, c: _np.ndarray, d: _np.ndarray, u: _np.ndarray) -> _np.ndarray:
+        v = 1.0 - u
+        return a * v * v * v + 3.0 * b * u * v * v + 3.0 * c * u * u * v + d * u * u * u
+
+    # x(u) は単調増加なので、二分法で x(u) = times となる u を求める
+    target = _np.clip(times, t0, t1)
+    lower = _np.zeros(len(times), dtype=_np.float64)
+    upper = _np.ones(len(times), dtype=_np.float64)
+    for _ in range(_BISECTION_ITERATIONS):
+        middle = (lower + upper) * 0.5
+        is_below = _bezier(t0, x1, x2, t1, middle) < target
+        lower = _np.where(is_below, middle, lower)
+        upper = _np.where(is_below, upper, middle)
+
+    return _bezier(p0, y1, y2, p3, (lower + upper) * 0.5)
@@ -0,0 +1,102 @@
+import collections.abc as abc
+import itertools
+
+import maya.api.OpenMaya as _om2
+
+
+# ノードのプラグが dirty になった時に、登録した関数を 1 回だけ呼ぶ
+#   ノードごとに nodeDirtyPlug のコールバックを 1 つだけ登録し、そのノードを監視している全員で共有する
+#   呼んだ関数は全ノードの登録から外すので、キャッシュを持っている間だけ監視が残る
+#   登録が無くなったノードのコールバックは、コールバックの中では外さずに次の watch() / unwatch() で外す
+_keys = itertools.count()
+_node_callbacks: dict[int, tuple[_om2.MObjectHandle, int]] = {}
+_node_listeners: dict[int, dict[int, abc.Callable[[], None]]] = {}
+_watched_nodes: dict[int, set[int]] = {}
+_idle_nodes: set[int] = set()
+
+
+def new_key() -> int:
+    u"""
+    watch() / unwatch() に渡すキーを発行する
+    """
+    return next(_keys)
+
+
+def watch(key: int, mobjs: abc.Iterable[_om2.MObject], listener: abc.Callable[[], None]) -> None:
+    u"""
+    mobjs のいずれかのプラグが dirty になったら listener を 1 回だけ呼ぶ
+      同じキーで呼ぶと監視するノードを追加する（listener は最後に渡したものになる）
+      listener がラッパーを掴むと解放されなくなるので、キャッシュそのものだけを掴むこと
+    """
+    nodes = _watched_nodes.setdefault(key, set())
+    for mobj in mobjs:
+        hash_code = _om2.MObjectHandle(mobj).hashCode()
+        entry = _node_callbacks.get(hash_code, None)
+        if entry is not None:
+            handle, callback_id = entry
+            if not handle.isAlive() or handle.object() != mobj:
+                # 削除されたノードと同じハッシュ値のノードなので、コールバックを作り直す
+                _remove_callback(callback_id)
+                entry = None
+        if entry is None:
+            callback_id = _om2.MNodeMessage.addNodeDirtyPlugCallback(mobj, _on_dirty, hash_code)
+            _node_callbacks[hash_code] = (_om2.MObjectHandle(mobj), callback_id)
+
+        _node_listeners.setdefault(hash_code, {})
+        nodes.add(hash_code)
+        _idle_nodes.discard(hash_code)
+
+    for hash_code in nodes:
+        _node_listeners[hash_code][key] = listener
+    _remove_idle_callbacks()
+
+
+def unwatch(key: int) -> None:
+    u"""
+    key で登録した監視を全て外す
+    """
+    _release(key)
+    _remove_idle_callbacks()
+
+
+def watched_node_count() -> int:
+    u"""
+    監視されているノードの数
+    """
+    return len(_node_callbacks) - len(_idle_nodes)
+
+
+def _release(key: int) -> None:
+    for hash_code in _watched_nodes.pop(key, ()):
+        listeners = _node_listeners.get(hash_code, None)
+        if listeners is None:
+            continue
+        listeners.pop(key, None)
+        if len(listeners) == 0:
+            del _node_listeners[hash_code]
+            _idle_nodes.add(hash_code)
+
+
+def _remove_idle_callbacks() -> None:
+    for hash_code in _idle_nodes:
+        entry = _node_callbacks.pop(hash_code, None)
+        if entry is not None:
+            _remove_callback(entry[1])
+    _idle_nodes.clear()
+
+
+def _remove_callback(callback_id: int) -> None:
+    # 削除されたノードのコールバックは外せないことがある
+    try:
+        _om2.MMessage.removeCallback(callback_id)
+    except RuntimeError:
+        pass
+
+
+def _on_dirty(mobj: _om2.MObject, mplug: _om2.MPlug, hash_code: int) -> None:
+    listeners = _node_listeners.get(hash_code, None)
+    if listeners is None:
+        return
+    for key, listener in list(listeners.items()):
+        _release(key)
+        listener()
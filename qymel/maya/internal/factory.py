@@ -1,6 +1,9 @@
 import typing
 import sys
+import os
 import inspect
+import json
+import tempfile
 
 import maya.cmds as _cmds
 import maya.api.OpenMaya as _om2
@@ -13,6 +16,41 @@ class NodeFactory(object):
     _cls_dict: dict[str, typing.Type[TDependNode]] = {}
     _default_cls_dict: dict[str, typing.Type[TDependNode]] = {}
     _dynamic_cls_cache: dict[str, typing.Type[TDependNode]] = {}
+    _type_hierarchy: dict[str, list[str]]|None = None
+    _plugin_type_hierarchy: dict[str, list[str]] = {}
+    _type_hierarchy_path: str|None = None
+
+    # キャッシュファイルの形式が変わったら上げる
+    _TYPE_HIERARCHY_FORMAT = 2
+
+    @staticmethod
+    def load_type_hierarchy(cache_dir: str|None = None) -> None:
+        u"""
+        全ノードタイプの継承関係を一括で引いておく
+          Maya 本体のノードタイプの結果は Maya のバージョンごとにディスクへ保存し、次回以降の起動ではそれを読むだけで済ませる
+          プラグインのノードタイプは、プラグインの更新や別プラグインとの名前の衝突で変わりうるのでメモリ上にだけ持つ
+        """
+        if cache_dir is None:
+            cache_dir = os.path.join(_cmds.internalVar(userAppDir=True), 'qymel', 'cache')
+        path = os.path.join(cache_dir, 'node_type_hierarchy_{}.json'.format(_cmds.about(apiVersion=True)))
+
+        NodeFactory._type_hierarchy_path = path
+        NodeFactory._plugin_type_hierarchy = {}
+
+        hierarchy = NodeFactory.__load_type_hierarchy_file(path)
+        if hierarchy is None:
+            plugin_types = NodeFactory.__plugin_node_types()
+            hierarchy = {}
+            for type_name in _cmds.allNodeTypes():
+                if type_name in plugin_types:
+                    continue
+                inherited_types = NodeFactory.__query_inherited_types(type_name)
+                if inherited_types:
+                    hierarchy[type_name] = inherited_types
+            NodeFactory._type_hierarchy = hierarchy
+            NodeFactory.__save_type_hierarchy()
+        else:
+            NodeFactory._type_hierarchy = hierarchy
 
     @staticmethod
     def register(module_name: str) -> None:
@@ -61,15 +99,17 @@ class NodeFactory(object):
         if cls is not None:
             return cls
 
-        if mdagpath:
-            node_path = mdagpath.fullPathName()
-        else:
-            node_path = mfn.absoluteName()
-
         # 定義済みクラスの中で一番近いクラスを継承して、新しいクラスを動的につくる
         base_cls = None
 
-        base_cls_name_candidates = _cmds.nodeType(node_path, inherited=True)
+        base_cls_name_candidates = NodeFactory.__inherited_types(type_name)
+        if not base_cls_name_candidates:
+            if mdagpath:
+                node_path = mdagpath.fullPathName()
+            else:
+                node_path = mfn.absoluteName()
+            base_cls_name_candidates = _cmds.nodeType(node_path, inherited=True) or []
+
         for base_cls_name in reversed(base_cls_name_candidates):
             base_cls = NodeFactory._dynamic_cls_cache.get(base_cls_name, None)
             if base_cls is None:
@@ -89,6 +129,91 @@ class NodeFactory(object):
 
         return cls
 
+    @staticmethod
+    def inherited_types(type_name: str) -> list[str]:
+        u"""
+        cmds.nodeType(type_name, isTypeName=True, inherited=True) と同じく、type_name 自身を含む継承しているタイプ
+        """
+        return NodeFactory.__inherited_types(type_name)
+
+    @staticmethod
+    def __inherited_types(type_name: str) -> list[str]:
+        if NodeFactory._type_hierarchy is None:
+            NodeFactory.load_type_hierarchy()
+
+        inherited_types = NodeFactory._type_hierarchy.get(type_name, None)
+        if inherited_types is not None:
+            return inherited_types
+
+        inherited_types = NodeFactory._plugin_type_hierarchy.get(type_name, None)
+        if inherited_types is not None:
+            return inherited_types
+
+        # プラグインのノードタイプは、見つけた時点でメモリ上のテーブルにだけ追加しておく
+        inherited_types = NodeFactory.__query_inherited_types(type_name)
+        if inherited_types:
+            NodeFactory._plugin_type_hierarchy[type_name] = inherited_types
+        return inherited_types
+
+    @staticmethod
+    def __query_inherited_types(type_name: str) -> list[str]:
+        try:
+            return _cmds.nodeType(type_name, isTypeName=True, inherited=True) or []
+        except RuntimeError:
+            return []
+
+    @staticmethod
+    def __plugin_node_types() -> set[str]:
+        plugin_types = set()
+        for plugin in _cmds.pluginInfo(query=True, listPlugins=True) or []:
+            plugin_types.update(_cmds.pluginInfo(plugin, query=True, dependNode=True) or [])
+        return plugin_types
+
+    @staticmethod
+    def __load_type_hierarchy_file(path: str) -> dict[str, list[str]]|None:
+        # 読めない、壊れている、形式が古いファイルは無かったことにして作り直す
+        if not os.path.isfile(path):
+            return None
+        try:
+            with open(path, 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if not isinstance(data, dict) or data.get('format', None) != NodeFactory._TYPE_HIERARCHY_FORMAT:
+            return None
+        hierarchy = data.get('types', None)
+        if not isinstance(hierarchy, dict):
+            return None
+        for inherited_types in hierarchy.values():
+            if not isinstance(inherited_types, list):
+                return None
+        return hierarchy
+
+    @staticmethod
+    def __save_type_hierarchy() -> None:
+        path = NodeFactory._type_hierarchy_path
+        if path is None:
+            return
+
+        # 複数の mayapy から同時に書かれても壊れないように、一時ファイルに書いてから置き換える
+        cache_dir = os.path.dirname(path)
+        data = {'format': NodeFactory._TYPE_HIERARCHY_FORMAT, 'types': NodeFactory._type_hierarchy}
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=cache_dir, prefix='.node_type_hierarchy_', suffix='.tmp')
+        except OSError:
+            return
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(data, f)
+            os.replace(tmp_path, path)
+        except OSError:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
 
 class PlugFactory(object):
 
@@ -1,3 +1,6 @@
+import collections.abc as abc
+import weakref
+
 import maya.cmds as _cmds
 import maya.api.OpenMaya as _om2
 
@@ -7,6 +10,7 @@ from . import factory as _factory
 
 # 呼び出し回数が極端に多くなる可能性のある静的メソッドをキャッシュ化しておく
 _om2_MGlobal_getSelectionListByName = _om2.MGlobal.getSelectionListByName
+_om2_MObjectHandle = _om2.MObjectHandle
 _factory_PlugFactory_create = _factory.PlugFactory.create
 _factory_NodeFactory_create = _factory.NodeFactory.create
 _factory_NodeFactory_create_default = _factory.NodeFactory.create_default
@@ -112,14 +116,170 @@ def create_node(*args: str, **kwargs: object) -> TDependNode:
 
 
 def to_node_instance(mfn: _om2.MFnDependencyNode, mdagpath: _om2.MDagPath|None = None) -> TDependNode:
-    type_name = mfn.typeName
     mobj = mfn.object()
 
-    node = _factory_NodeFactory_create(type_name, mobj, mdagpath)
+    node = _NodeInstanceCache.find(mobj, mdagpath)
     if node is not None:
         return node
 
-    return _factory_NodeFactory_create_default(mfn, mdagpath)
+    node = _factory_NodeFactory_create(mfn.typeName, mobj, mdagpath)
+    if node is None:
+        node = _factory_NodeFactory_create_default(mfn, mdagpath)
+
+    _NodeInstanceCache.store(node, mdagpath)
+    return node
+
+
+def clear_node_instance_cache() -> None:
+    _NodeInstanceCache.clear()
+
+
+# _NodeInstanceCache の入れ物がこの数を超えたら、空になったものを掃除する
+_PRUNE_THRESHOLD = 1024
+
+
+class _NodeInstanceCache(object):
+    u"""
+    同じノードに対して同じラッパーを返すための弱参照キャッシュ
+      MObjectHandle.hashCode() -> インスタンス番号 -> ラッパー
+      ラッパーが温めた mfn やプラグのキャッシュを使い回せるようにする
+    """
+
+    entries: dict[int, weakref.WeakValueDictionary] = {}
+    callback_ids: list[int] = []
+    prune_threshold = _PRUNE_THRESHOLD
+
+    @staticmethod
+    def find(mobj: _om2.MObject, mdagpath: _om2.MDagPath|None) -> TDependNode|None:
+        hash_code = _om2_MObjectHandle(mobj).hashCode()
+        instances = _NodeInstanceCache.entries.get(hash_code, None)
+        if instances is None:
+            return None
+
+        node = instances.get(mdagpath.instanceNumber() if mdagpath is not None else 0, None)
+        if node is None:
+            # ラッパーが全て解放された入れ物は捨てておく（hashCode のキーが溜まり続けないように）
+            if len(instances) == 0:
+                del _NodeInstanceCache.entries[hash_code]
+            return None
+
+        # hashCode の衝突やパスの付け替えを考慮して、本当に同じものを指しているか確認する
+        handle = node.mobject_handle
+        if not handle.isAlive() or handle.object() != mobj:
+            return None
+        if mdagpath is not None and not (node.mdagpath.isValid() and node.mdagpath == mdagpath):
+            return None
+
+        return node
+
+    @staticmethod
+    def store(node: TDependNode, mdagpath: _om2.MDagPath|None) -> None:
+        if len(_NodeInstanceCache.callback_ids) == 0:
+            _NodeInstanceCache.add_callbacks()
+
+        hash_code = node.mobject_handle.hashCode()
+        instances = _NodeInstanceCache.entries.get(hash_code, None)
+        if instances is None:
+            # 一度も引かれずに解放された入れ物も残らないよう、新しく作る時にまとめて掃除する
+            if len(_NodeInstanceCache.entries) >= _NodeInstanceCache.prune_threshold:
+                _NodeInstanceCache.prune()
+                _NodeInstanceCache.prune_threshold = max(_PRUNE_THRESHOLD, len(_NodeInstanceCache.entries) * 2)
+            instances = weakref.WeakValueDictionary()
+            _NodeInstanceCache.entries[hash_code] = instances
+
+        instances[mdagpath.instanceNumber() if mdagpath is not None else 0] = node
+
+    @staticmethod
+    def clear(*_) -> None:
+        _NodeInstanceCache.entries.clear()
+
+    @staticmethod
+    def prune() -> None:
+        u"""
+        ラッパーが全て解放された入れ物を捨てる
+        """
+        entries = _NodeInstanceCache.entries
+        for hash_code in [hash_code for hash_code, instances in entries.items() if len(instances) == 0]:
+            del entries[hash_code]
+
+    @staticmethod
+    def add_callbacks() -> None:
+        _NodeInstanceCache.callback_ids = [
+            _om2.MDGMessage.addNodeRemovedCallback(_NodeInstanceCache.on_node_removed, 'dependNode'),
+            _om2.MSceneMessage.addCallback(_om2.MSceneMessage.kBeforeNew, _NodeInstanceCache.clear),
+            _om2.MSceneMessage.addCallback(_om2.MSceneMessage.kBeforeOpen, _NodeInstanceCache.clear),
+        ]
+
+    @staticmethod
+    def on_node_removed(mobj: _om2.MObject, *_) -> None:
+        _NodeInstanceCache.entries.pop(_om2_MObjectHandle(mobj).hashCode(), None)
+
+
+def iter_dag(
+        root: _om2.MDagPath|None = None,
+        breadth_first: bool = False,
+        fn_types: abc.Sequence[int]|None = None,
+        no_intermediate: bool = False
+) -> abc.Iterator[TDagNode]:
+    u"""
+    MItDag で root 以下（root 自身は含まない）の DAG ノードを辿る
+      名前を経由せず MDagPath から直接ラッパーをつくる
+      root が None のときはワールド以下すべてを辿る
+    """
+    traversal_type = _om2.MItDag.kBreadthFirst if breadth_first else _om2.MItDag.kDepthFirst
+
+    # 型フィルタが1つなら MItDag 側で絞り込める
+    filter_type = _om2.MFn.kInvalid
+    if fn_types is not None and len(fn_types) == 1:
+        filter_type = fn_types[0]
+        fn_types = None
+
+    ite = _om2.MItDag(traversal_type, filter_type)
+    if root is not None:
+        ite.reset(root, traversal_type, filter_type)
+
+    tmp_mfn = _om2.MFnDagNode()
+
+    while not ite.isDone():
+        mdagpath = ite.getPath()
+        ite.next()
+
+        if root is not None and mdagpath == root:
+            continue
+
+        mobj = mdagpath.node()
+        if mobj.hasFn(_om2.MFn.kWorld):
+            continue
+        if fn_types is not None and not any(mobj.hasFn(fn_type) for fn_type in fn_types):
+            continue
+
+        tmp_mfn.setObject(mdagpath)
+        if no_intermediate and tmp_mfn.isIntermediateObject:
+            continue
+
+        yield to_node_instance(tmp_mfn, mdagpath)
+
+
+def iter_children(
+        mdagpath: _om2.MDagPath,
+        fn_types: abc.Sequence[int]|None = None,
+        no_intermediate: bool = False
+) -> abc.Iterator[TDagNode]:
+    tmp_mfn = _om2.MFnDagNode()
+
+    for i in range(mdagpath.childCount()):
+        mobj = mdagpath.child(i)
+        if fn_types is not None and not any(mobj.hasFn(fn_type) for fn_type in fn_types):
+            continue
+
+        child_mdagpath = _om2.MDagPath(mdagpath)
+        child_mdagpath.push(mobj)
+
+        tmp_mfn.setObject(child_mdagpath)
+        if no_intermediate and tmp_mfn.isIntermediateObject:
+            continue
+
+        yield to_node_instance(tmp_mfn, child_mdagpath)
 
 
 def get_mobject(node_name: str) -> tuple[_om2.MObject, _om2.MDagPath|None]:
@@ -0,0 +1,234 @@
+import collections
+
+import numpy as _np
+
+try:
+    import scipy.spatial as _scipy_spatial
+except ImportError:
+    _scipy_spatial = None
+
+
+# 点を KD 分割した木
+#   indices: (点数,) 葉ごとに連続するように並べ替えた元の点のインデックス
+#   mins, maxs: (ノード数, 3) 各ノードに含まれる点のバウンディングボックス
+#   children: (ノード数, 2) 子ノードの番号。葉は -1
+#   ranges: (ノード数, 2) 各ノードに含まれる点の indices 上の範囲 [開始, 終了)
+#   scipy_tree: scipy が使える場合は scipy.spatial.cKDTree。クエリはそちらに任せる
+KdTree = collections.namedtuple('KdTree', ['points', 'indices', 'mins', 'maxs', 'children', 'ranges', 'scipy_tree'])
+
+_ROOT = 0
+
+
+def build(points: _np.ndarray, leaf_size: int = 32) -> KdTree:
+    points = _np.asarray(points, dtype=_np.float64).reshape(-1, 3)
+    count = len(points)
+
+    scipy_tree = None
+    if _scipy_spatial is not None and count > 0:
+        scipy_tree = _scipy_spatial.cKDTree(points, leafsize=leaf_size)
+
+    indices = _np.arange(count, dtype=_np.int64)
+    mins: list[_np.ndarray] = []
+    maxs: list[_np.ndarray] = []
+    children: list[tuple[int, int]] = []
+    ranges: list[tuple[int, int]] = []
+
+    def _add_node(start: int, end: int) -> int:
+        mins.append(_np.full(3, _np.inf))
+        maxs.append(_np.full(3, -_np.inf))
+        children.append((-1, -1))
+        ranges.append((start, end))
+        return len(ranges) - 1
+
+    stack = [_add_node(0, count)]
+    while len(stack) > 0:
+        node = stack.pop()
+        start, end = ranges[node]
+        if start == end:
+            continue
+
+        coords = points[indices[start:end]]
+        mins[node] = coords.min(axis=0)
+        maxs[node] = coords.max(axis=0)
+        if end - start <= leaf_size:
+            continue
+
+        # 一番広がっている軸の中央値で分割する
+        axis = int(_np.argmax(maxs[node] - mins[node]))
+        middle = (end - start) // 2
+        order = _np.argpartition(coords[:, axis], middle)
+        indices[start:end] = indices[start:end][order]
+
+        left = _add_node(start, start + middle)
+        right = _add_node(start + middle, end)
+        children[node] = (left, right)
+        stack.append(right)
+        stack.append(left)
+
+    return KdTree(
+        points,
+        indices,
+        _np.array(mins, dtype=_np.float64).reshape(-1, 3),
+        _np.array(maxs, dtype=_np.float64).reshape(-1, 3),
+        _np.array(children, dtype=_np.int64).reshape(-1, 2),
+        _np.array(ranges, dtype=_np.int64).reshape(-1, 2),
+        scipy_tree,
+    )
+
+
+def nearest(tree: KdTree, queries: _np.ndarray) -> tuple[_np.ndarray, _np.ndarray]:
+    u"""
+    各クエリ点に最も近い点のインデックスと距離を返す（点が 1 つも無い場合はインデックス -1、距離 inf）
+    """
+    queries = _np.asarray(queries, dtype=_np.float64).reshape(-1, 3)
+    result_ids = _np.full(len(queries), -1, dtype=_np.int64)
+    result_distances = _np.full(len(queries), _np.inf, dtype=_np.float64)
+    if len(tree.points) == 0 or len(queries) == 0:
+        return result_ids, result_distances
+
+    if tree.scipy_tree is not None:
+        distances, ids = tree.scipy_tree.query(queries, k=1)
+        return _np.asarray(ids, dtype=_np.int64), _np.asarray(distances, dtype=_np.float64)
+
+    # 各クエリ点を含む葉まで降りて暫定の最短距離を決めてから、全体を枝刈りしながら辿る
+    _search_nearest(tree, queries, _descend(tree, queries), result_ids, result_distances)
+    stack = [(_ROOT, _np.arange(len(queries)))]
+    while len(stack) > 0:
+        node, query_ids = stack.pop()
+        query_ids = query_ids[_box_squared_distances(tree, node, queries[query_ids]) < result_distances[query_ids]]
+        if len(query_ids) == 0:
+            continue
+
+        left, right = tree.children[node]
+        if left < 0:
+            _search_leaf(tree, node, queries, query_ids, result_ids, result_distances)
+            continue
+
+        # クエリ点ごとに近い方の子を先に調べると、遠い方の子を調べる時には枝刈りが効く
+        prefers_left = (
+            _box_squared_distances(tree, left, queries[query_ids])
+            <= _box_squared_distances(tree, right, queries[query_ids])
+        )
+        left_first = query_ids[prefers_left]
+        right_first = query_ids[~prefers_left]
+        stack.append((right, left_first))
+        stack.append((left, right_first))
+        stack.append((left, left_first))
+        stack.append((right, right_first))
+
+    return result_ids, _np.sqrt(result_distances)
+
+
+def within_radius(tree: KdTree, queries: _np.ndarray, radius: float) -> list[_np.ndarray]:
+    u"""
+    各クエリ点から radius 以内にある点のインデックス（昇順）を返す
+    """
+    queries = _np.asarray(queries, dtype=_np.float64).reshape(-1, 3)
+    if len(tree.points) == 0:
+        return [_np.zeros(0, dtype=_np.int64) for _ in range(len(queries))]
+
+    if tree.scipy_tree is not None:
+        neighbors = tree.scipy_tree.query_ball_point(queries, radius, return_sorted=True)
+        return [_np.asarray(ids, dtype=_np.int64) for ids in neighbors]
+
+    squared_radius = radius * radius
+    hit_query_ids: list[_np.ndarray] = []
+    hit_point_ids: list[_np.ndarray] = []
+
+    stack = [(_ROOT, _np.arange(len(queries)))]
+    while len(stack) > 0:
+        node, query_ids = stack.pop()
+        query_ids = query_ids[_box_squared_distances(tree, node, queries[query_ids]) <= squared_radius]
+        if len(query_ids) == 0:
+            continue
+
+        left, right = tree.children[node]
+        if left >= 0:
+            stack.append((right, query_ids))
+            stack.append((left, query_ids))
+            continue
+
+        start, end = tree.ranges[node]
+        point_ids = tree.indices[start:end]
+        offsets = tree.points[point_ids][_np.newaxis, :, :] - queries[query_ids][:, _np.newaxis, :]
+        pair_ids, slot_ids = _np.nonzero(_np.einsum('ijk,ijk->ij', offsets, offsets) <= squared_radius)
+        hit_query_ids.append(query_ids[pair_ids])
+        hit_point_ids.append(point_ids[slot_ids])
+
+    if len(hit_query_ids) == 0:
+        return [_np.zeros(0, dtype=_np.int64) for _ in range(len(queries))]
+
+    all_query_ids = _np.concatenate(hit_query_ids)
+    all_point_ids = _np.concatenate(hit_point_ids)
+    order = _np.lexsort((all_point_ids, all_query_ids))
+    all_query_ids = all_query_ids[order]
+    all_point_ids = all_point_ids[order]
+    bounds = _np.searchsorted(all_query_ids, _np.arange(len(queries) + 1))
+    return [all_point_ids[bounds[i]:bounds[i + 1]] for i in range(len(queries))]
+
+
+def _box_squared_distances(tree: KdTree, node: int, queries: _np.ndarray) -> _np.ndarray:
+    # (クエリ数,) 各クエリ点からノードのボックスまでの距離の 2 乗
+    offsets = _np.maximum(_np.maximum(tree.mins[node] - queries, queries - tree.maxs[node]), 0.0)
+    return _np.einsum('ij,ij->i', offsets, offsets)
+
+
+def _descend(tree: KdTree, queries: _np.ndarray) -> _np.ndarray:
+    # 各クエリ点について、ボックスが近い方の子を選びながら葉まで降りた時の葉の番号
+    leaves = _np.full(len(queries), _ROOT, dtype=_np.int64)
+    active = _np.arange(len(queries))
+    while len(active) > 0:
+        lefts = tree.children[leaves[active], 0]
+        rights = tree.children[leaves[active], 1]
+        internal = lefts >= 0
+        active, lefts, rights = active[internal], lefts[internal], rights[internal]
+        if len(active) == 0:
+            break
+
+        offsets_left = _np.maximum(_np.maximum(tree.mins[lefts] - queries[active], queries[active] - tree.maxs[lefts]), 0.0)
+        offsets_right = _np.maximum(_np.maximum(tree.mins[rights] - queries[active], queries[active] - tree.maxs[rights]), 0.0)
+        prefers_left = (
+            _np.einsum('ij,ij->i', offsets_left, offsets_left)
+            <= _np.einsum('ij,ij->i', offsets_right, offsets_right)
+        )
+        leaves[active] = _np.where(prefers_left, lefts, rights)
+    return leaves
+
+
+def _search_nearest(
+        tree: KdTree,
+        queries: _np.ndarray,
+        leaves: _np.ndarray,
+        best_ids: _np.ndarray,
+        best_distances: _np.ndarray
+) -> None:
+    # 同じ葉に降りたクエリ点ごとにまとめて調べる
+    order = _np.argsort(leaves, kind='stable')
+    sorted_leaves = leaves[order]
+    unique_leaves, starts = _np.unique(sorted_leaves, return_index=True)
+    ends = _np.append(starts[1:], len(order))
+    for leaf, start, end in zip(unique_leaves.tolist(), starts.tolist(), ends.tolist()):
+        _search_leaf(tree, leaf, queries, order[start:end], best_ids, best_distances)
+
+
+def _search_leaf(
+        tree: KdTree,
+        leaf: int,
+        queries: _np.ndarray,
+        query_ids: _np.ndarray,
+        best_ids: _np.ndarray,
+        best_distances: _np.ndarray
+) -> None:
+    start, end = tree.ranges[leaf]
+    if start == end:
+        return
+    point_ids = tree.indices[start:end]
+    offsets = tree.points[point_ids][_np.newaxis, :, :] - queries[query_ids][:, _np.newaxis, :]
+    distances = _np.einsum('ijk,ijk->ij', offsets, offsets)
+    slots = _np.argmin(distances, axis=1)
+    candidates = distances[_np.arange(len(query_ids)), slots]
+
+    improved = candidates < best_distances[query_ids]
+    improved_ids = query_ids[improved]
+    best_distances[improved_ids] = candidates[improved]
+    best_ids[improved_ids] = point_ids[slots[improved]]
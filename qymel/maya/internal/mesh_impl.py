@@ -0,0 +1,116 @@
+import maya.api.OpenMaya as _om2
+import numpy as _np
+
+
+def to_point_array(mpoints: _om2.MPointArray|_om2.MFloatPointArray) -> _np.ndarray:
+    if len(mpoints) == 0:
+        return _np.zeros((0, 3), dtype=_np.float64)
+    return _np.array(mpoints, dtype=_np.float64)[:, :3]
+
+
+def to_vector_array(mvectors: _om2.MVectorArray|_om2.MFloatVectorArray) -> _np.ndarray:
+    if len(mvectors) == 0:
+        return _np.zeros((0, 3), dtype=_np.float64)
+    return _np.array(mvectors, dtype=_np.float64)
+
+
+def to_color_array(mcolors: _om2.MColorArray) -> _np.ndarray:
+    if len(mcolors) == 0:
+        return _np.zeros((0, 4), dtype=_np.float64)
+    return _np.array(mcolors, dtype=_np.float64)
+
+
+def to_index_array(mints: _om2.MIntArray|_om2.MUintArray) -> _np.ndarray:
+    return _np.array(mints, dtype=_np.int64)
+
+
+def to_double_array(mdoubles: _om2.MDoubleArray) -> _np.ndarray:
+    # API 2.0 の配列はバッファプロトコルを持たないのでコピーは避けられないが、
+    # _np.array() のような要素ごとの形状の推定をせずに、要素数を決め打ちして 1 回の走査で読む
+    return _np.fromiter(mdoubles, dtype=_np.float64, count=len(mdoubles))
+
+
+def to_mdouble_array(values: _np.ndarray) -> _om2.MDoubleArray:
+    # MDoubleArray はリストからの構築が C 側の 1 回のループで済む（要素ごとに append するより桁違いに速い）
+    return _om2.MDoubleArray(_np.ascontiguousarray(values, dtype=_np.float64).ravel().tolist())
+
+
+def get_topology(mfn_mesh: _om2.MFnMesh) -> tuple[_np.ndarray, _np.ndarray]:
+    counts, connects = mfn_mesh.getVertices()
+    return to_index_array(counts), to_index_array(connects)
+
+
+def get_face_vertex_normals(mfn_mesh: _om2.MFnMesh, space: int) -> _np.ndarray:
+    normals = to_vector_array(mfn_mesh.getNormals(space))
+    _, normal_ids = mfn_mesh.getNormalIds()
+    return normals[to_index_array(normal_ids)]
+
+
+def get_edge_vertices(mfn_mesh: _om2.MFnMesh) -> _np.ndarray:
+    # エッジ→頂点の一括取得APIが無いので、エッジ単位で取得するしかない
+    get_edge_vertices_ = mfn_mesh.getEdgeVertices
+    edge_count = mfn_mesh.numEdges
+    result = _np.empty((edge_count, 2), dtype=_np.int64)
+    for i in range(edge_count):
+        result[i] = get_edge_vertices_(i)
+    return result
+
+
+def get_face_vertex_uv_ids(mfn_mesh: _om2.MFnMesh, uv_set: str, face_vertex_counts: _np.ndarray) -> _np.ndarray:
+    # UVの割り当てられていないフェースバーテックスは -1 で埋める
+    uv_counts, uv_ids = mfn_mesh.getAssignedUVs(uv_set)
+    assigned = _np.repeat(to_index_array(uv_counts) > 0, face_vertex_counts)
+    result = _np.full(len(assigned), -1, dtype=_np.int64)
+    result[assigned] = to_index_array(uv_ids)
+    return result
+
+
+def get_face_vertex_links(face_vertex_counts: _np.ndarray) -> tuple[_np.ndarray, _np.ndarray]:
+    # フェースバーテックスごとに、所属するフェースIDと同じフェース内の次のフェースバーテックスを返す
+    face_count = len(face_vertex_counts)
+    offsets = _np.cumsum(face_vertex_counts) - face_vertex_counts
+    face_ids = _np.repeat(_np.arange(face_count, dtype=_np.int64), face_vertex_counts)
+    next_ids = _np.arange(len(face_ids), dtype=_np.int64) + 1
+    last_ids = offsets + face_vertex_counts - 1
+    next_ids[last_ids[face_vertex_counts > 0]] = offsets[face_vertex_counts > 0]
+    return face_ids, next_ids
+
+
+def to_edge_keys(v0: _np.ndarray, v1: _np.ndarray, vertex_count: int) -> _np.ndarray:
+    return _np.minimum(v0, v1) * vertex_count + _np.maximum(v0, v1)
+
+
+def get_boundary_edge_keys(
+        face_vertex_counts: _np.ndarray,
+        face_vertex_indices: _np.ndarray,
+        vertex_count: int
+) -> tuple[_np.ndarray, _np.ndarray, _np.ndarray]:
+    # 1フェースからしか参照されていないエッジを境界エッジとみなす
+    face_ids, next_ids = get_face_vertex_links(face_vertex_counts)
+    keys = to_edge_keys(face_vertex_indices, face_vertex_indices[next_ids], vertex_count)
+    unique_keys, counts = _np.unique(keys, return_counts=True)
+    return unique_keys[counts == 1], keys, face_ids
+
+
+def sum_by_face(values: _np.ndarray, face_ids: _np.ndarray, face_count: int) -> _np.ndarray:
+    if values.ndim == 1:
+        return _np.bincount(face_ids, weights=values, minlength=face_count)
+    return _np.column_stack([
+        _np.bincount(face_ids, weights=values[:, i], minlength=face_count) for i in range(values.shape[1])
+    ])
+
+
+def get_face_areas(mfn_mesh: _om2.MFnMesh, points: _np.ndarray) -> _np.ndarray:
+    triangle_counts, triangle_vertices = mfn_mesh.getTriangles()
+    triangles = to_index_array(triangle_vertices).reshape(-1, 3)
+    p0 = points[triangles[:, 0]]
+    crosses = _np.cross(points[triangles[:, 1]] - p0, points[triangles[:, 2]] - p0)
+    areas = _np.linalg.norm(crosses, axis=1) * 0.5
+    face_ids = _np.repeat(_np.arange(len(triangle_counts), dtype=_np.int64), to_index_array(triangle_counts))
+    return _np.bincount(face_ids, weights=areas, minlength=len(triangle_counts))
+
+
+def normalize(vectors: _np.ndarray) -> _np.ndarray:
+    lengths = _np.linalg.norm(vectors, axis=1)
+    lengths[lengths == 0.0] = 1.0
+    return vectors / lengths[:, _np.newaxis]
@@ -0,0 +1,60 @@
+import collections.abc as _abc
+import os
+
+import maya.cmds as _cmds
+import maya.api.OpenMaya as _om2
+
+
+COMMAND_NAME = 'qymelCommitModifier'
+
+_PLUGIN_NAME = 'qymel_modifier_command'
+_PLUGIN_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'plugins', f'{_PLUGIN_NAME}.py')
+
+# プラグインのコマンドに渡す操作（コマンドには引数で MDGModifier を渡せないので、ここを経由する）
+#   操作は実行したモディファイアのリストを返し、コマンドはそれを redo/undo に使う
+TModifierOperation = _abc.Callable[[], list[_om2.MDGModifier]]
+
+_pending: list[TModifierOperation] = []
+
+
+def commit(modifier: _om2.MDGModifier, undoable: bool = True) -> None:
+    u"""
+    modifier を実行する
+      undoable=True の場合はプラグインのコマンド経由で実行して、undo キューに 1 つの操作として積む
+      プラグインが読み込めない場合は undo できない状態で実行する
+    """
+    def _operation() -> list[_om2.MDGModifier]:
+        modifier.doIt()
+        return [modifier]
+
+    run(_operation, undoable)
+
+
+def run(operation: TModifierOperation, undoable: bool = True) -> None:
+    u"""
+    operation を実行する。operation が実行したモディファイアは、まとめて 1 回の undo で戻る
+    """
+    if not undoable or not _ensure_plugin():
+        operation()
+        return
+
+    _pending.append(operation)
+    try:
+        getattr(_cmds, COMMAND_NAME)()
+    finally:
+        if len(_pending) > 0 and _pending[-1] is operation:
+            _pending.pop()
+
+
+def take_pending() -> TModifierOperation:
+    return _pending.pop()
+
+
+def _ensure_plugin() -> bool:
+    if _cmds.pluginInfo(_PLUGIN_NAME, query=True, loaded=True):
+        return True
+    try:
+        _cmds.loadPlugin(_PLUGIN_PATH, quiet=True)
+        return True
+    except RuntimeError:
+        return False
@@ -0,0 +1,100 @@
+import maya.api.OpenMaya as _om2
+
+
+# ラッパーが名前の文字列をキャッシュするときの世代番号
+#   名前の変更や DAG の親子付けの変更があるたびに進めて、それより前にキャッシュした名前を無効にする
+#   リネームや親子付けの変更は子孫のフルパスも変えるので、ノード単位ではなくシーン全体で 1 つの番号を持つ
+#   アトリビュートのリネームはノードごとのコールバックでしか受け取れないので、プラグの名前をキャッシュしたノードだけを監視する
+_enabled = True
+_generation = 0
+_callback_ids: list[int] = []
+_attribute_callbacks: dict[int, tuple[_om2.MObjectHandle, int]] = {}
+
+
+def generation() -> int|None:
+    u"""
+    現在の世代番号を返す。キャッシュが無効な場合は None
+    """
+    if not _enabled:
+        return None
+    if len(_callback_ids) == 0:
+        _add_callbacks()
+    return _generation
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def set_enabled(enabled: bool) -> None:
+    global _enabled
+    _enabled = enabled
+    if not enabled:
+        _remove_callbacks()
+    invalidate()
+
+
+def watch_attributes(mobj: _om2.MObject) -> None:
+    u"""
+    mobj のアトリビュートのリネームで世代番号を進めるようにする。プラグの名前をキャッシュする前に呼ぶ
+    """
+    hash_code = _om2.MObjectHandle(mobj).hashCode()
+    entry = _attribute_callbacks.get(hash_code, None)
+    if entry is not None:
+        handle, callback_id = entry
+        if handle.isAlive() and handle.object() == mobj:
+            return
+        _remove_callback(callback_id)
+
+    callback_id = _om2.MNodeMessage.addAttributeChangedCallback(mobj, _on_attribute_changed)
+    _attribute_callbacks[hash_code] = (_om2.MObjectHandle(mobj), callback_id)
+
+
+def invalidate() -> None:
+    global _generation
+    _generation += 1
+
+
+def _add_callbacks() -> None:
+    global _callback_ids
+    _callback_ids = [
+        _om2.MNodeMessage.addNameChangedCallback(_om2.MObject.kNullObj, _on_name_changed),
+        _om2.MDagMessage.addAllDagChangesCallback(_on_dag_changed),
+        _om2.MNamespaceMessage.addNamespaceRenamedCallback(_on_namespace_renamed),
+    ]
+
+
+def _remove_callbacks() -> None:
+    global _callback_ids
+    if len(_callback_ids) > 0:
+        _om2.MMessage.removeCallbacks(_callback_ids)
+    _callback_ids = []
+
+    for _, callback_id in _attribute_callbacks.values():
+        _remove_callback(callback_id)
+    _attribute_callbacks.clear()
+
+
+def _remove_callback(callback_id: int) -> None:
+    # 削除されたノードのコールバックは外せないことがある
+    try:
+        _om2.MMessage.removeCallback(callback_id)
+    except RuntimeError:
+        pass
+
+
+def _on_name_changed(*_) -> None:
+    invalidate()
+
+
+def _on_dag_changed(*_) -> None:
+    invalidate()
+
+
+def _on_namespace_renamed(*_) -> None:
+    invalidate()
+
+
+def _on_attribute_changed(msg: int, *_) -> None:
+    if msg & _om2.MNodeMessage.kAttributeRenamed:
+        invalidate()
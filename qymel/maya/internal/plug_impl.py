@@ -1,39 +1,297 @@
+import collections
+import collections.abc as _abc
+
 import maya.cmds as _cmds
 import maya.api.OpenMaya as _om2
 
 
+TPlugGetter = _abc.Callable[[_om2.MPlug], object]
+TPlugSetter = _abc.Callable[[_om2.MDGModifier, _om2.MPlug, object], None]
+
+GetterCacheInfo = collections.namedtuple('GetterCacheInfo', ['hits', 'misses', 'size'])
+
+
+# 呼び出し回数が極端に多くなる可能性のある静的メソッドをキャッシュ化しておく
+_om2_MObjectHandle = _om2.MObjectHandle
+_om2_MFnAttribute = _om2.MFnAttribute
+
+
+# キャッシュするクロージャの最大数。動的アトリビュートはノードごとに別の MObject になるので上限を設けておく
+_MAX_CACHE_SIZE = 4096
+
+
+class _GetterCache(object):
+    u"""
+    アトリビュート定義（MObject）ごとに、値を取り出すクロージャをキャッシュしておく
+      同じノードタイプの静的アトリビュートは同じ MObject を共有するので、どのノードのプラグでもヒットする
+      最近使っていないものから捨て、シーンを開き直すと全て捨てる
+    """
+
+    entries: collections.OrderedDict[tuple[int, bool], tuple[_om2.MObjectHandle, TPlugGetter]] = collections.OrderedDict()
+    hits = 0
+    misses = 0
+
+
+class _SetterCache(object):
+    u"""
+    _GetterCache の書き込み版
+    """
+
+    entries: collections.OrderedDict[tuple[int, bool], tuple[_om2.MObjectHandle, TPlugSetter]] = collections.OrderedDict()
+
+
+_callback_ids: list[int] = []
+
+
 def plug_get_impl(mplug: _om2.MPlug) -> object:
-    mobj = mplug.attribute()
-    api_type = mobj.apiType()
+    return resolve_getter(mplug)(mplug)
+
+
+def plug_get_many_impl(mplugs: _abc.Iterable[_om2.MPlug]) -> list[object]:
+    # ネットワークプラグは Maya 側で破棄されうるので、getter を使いまわす前に弾いておく
+    mplugs = list(mplugs)
+    for mplug in mplugs:
+        if mplug.isNetworked:
+            raise RuntimeError('{} is networked'.format(mplug.name()))
+    return [resolve_getter(mplug)(mplug) for mplug in mplugs]
+
+
+def plug_get_elements_impl(mplug: _om2.MPlug) -> tuple[list[int], list[object]]:
+    u"""
+    配列プラグの存在する要素の (論理インデックス, 値) を論理インデックス順に返す
+    """
+    getter = _resolve_attribute_getter(mplug.attribute(), False)
+    indices = []
+    values = []
+    for i in range(mplug.numElements()):
+        element = mplug.elementByPhysicalIndex(i)
+        indices.append(element.logicalIndex())
+        values.append(getter(element))
+    return indices, values
 
+
+def resolve_getter(mplug: _om2.MPlug) -> TPlugGetter:
+    return _resolve_attribute_getter(mplug.attribute(), mplug.isArray)
+
+
+def resolve_setter(mplug: _om2.MPlug) -> TPlugSetter:
+    u"""
+    modifier に mplug への値の書き込みを積む関数を返す（値は plug_get_impl() が返すのと同じ形式、UI単位）
+      compound と array は、NumPy 配列を含む要素のシーケンスを受け付ける（array は {論理インデックス: 値} の dict も可）
+    """
+    return _resolve_attribute_setter(mplug.attribute(), mplug.isArray)
+
+
+def getter_cache_info() -> GetterCacheInfo:
+    return GetterCacheInfo(_GetterCache.hits, _GetterCache.misses, len(_GetterCache.entries))
+
+
+def clear_getter_cache() -> None:
+    _clear_entries()
+    _GetterCache.hits = 0
+    _GetterCache.misses = 0
+
+
+def _clear_entries(*_) -> None:
+    _GetterCache.entries.clear()
+    _SetterCache.entries.clear()
+
+
+def _store_entry(entries: collections.OrderedDict, key: tuple[int, bool], entry: tuple) -> None:
+    global _callback_ids
+    if len(_callback_ids) == 0:
+        _callback_ids = [
+            _om2.MSceneMessage.addCallback(_om2.MSceneMessage.kBeforeNew, _clear_entries),
+            _om2.MSceneMessage.addCallback(_om2.MSceneMessage.kBeforeOpen, _clear_entries),
+        ]
+
+    entries[key] = entry
+    if len(entries) > _MAX_CACHE_SIZE:
+        entries.popitem(last=False)
+
+
+def _resolve_attribute_getter(mattr: _om2.MObject, is_array: bool) -> TPlugGetter:
+    handle = _om2_MObjectHandle(mattr)
+    key = (handle.hashCode(), is_array)
+
+    entry = _GetterCache.entries.get(key, None)
+    if entry is not None:
+        # 削除された動的アトリビュートのアドレスが再利用されている可能性があるので生存確認しておく
+        cached_handle, getter = entry
+        if cached_handle.isAlive() and cached_handle.object() == mattr:
+            _GetterCache.hits += 1
+            _GetterCache.entries.move_to_end(key)
+            return getter
+
+    _GetterCache.misses += 1
+    getter = _compile_getter(mattr, is_array)
+    _store_entry(_GetterCache.entries, key, (handle, getter))
+    return getter
+
+
+def _compile_getter(mattr: _om2.MObject, is_array: bool) -> TPlugGetter:
     # array
-    if mplug.isArray:
-        return [plug_get_impl(mplug.elementByLogicalIndex(i)) for i in range(mplug.numElements())]
+    if is_array:
+        return _compile_array_getter(_resolve_attribute_getter(mattr, False))
 
     # compound
-    if mplug.isCompound:
-        return tuple(plug_get_impl(mplug.child(i)) for i in range(mplug.numChildren()))
+    if mattr.hasFn(_om2.MFn.kCompoundAttribute):
+        mfn = _om2.MFnCompoundAttribute(mattr)
+        children = [mfn.child(i) for i in range(mfn.numChildren())]
+        getters = [_resolve_attribute_getter(child, _om2_MFnAttribute(child).array) for child in children]
+        return _compile_compound_getter(getters)
+
+    api_type = mattr.apiType()
 
     try:
         # typed
         if api_type == _om2.MFn.kTypedAttribute:
-            attr_type = _om2.MFnTypedAttribute(mobj).attrType()
-            return _typed_attr_table[attr_type](mplug)
+            attr_type = _om2.MFnTypedAttribute(mattr).attrType()
+            return _with_fallback(_typed_attr_table[attr_type])
 
         # numeric
         if api_type == _om2.MFn.kNumericAttribute:
-            numeric_type = _om2.MFnNumericAttribute(mobj).numericType()
-            return _numeric_attr_table[numeric_type](mplug)
+            numeric_type = _om2.MFnNumericAttribute(mattr).numericType()
+            return _with_fallback(_numeric_attr_table[numeric_type])
 
         # # generic
         # if api_type == _om2.MFn.kGenericAttribute:
         #     pass
 
-        return _api_type_table[api_type](mplug)
+        return _with_fallback(_api_type_table[api_type])
 
     except:
-        # print('not-supported plug data: {}, {}'.format(mplug, mobj.apiTypeStr))
-        return _cmds.getAttr(mplug.name())
+        # print('not-supported plug data: {}'.format(mattr.apiTypeStr))
+        return _get_by_command
+
+
+def _compile_array_getter(element_getter: TPlugGetter) -> TPlugGetter:
+    # 疎な配列（worldMesh, weightList など）の論理インデックスは 0 から連続しているとは限らないので、
+    # 物理インデックスで存在する要素だけを論理インデックス順に読む
+    def _get(mplug: _om2.MPlug) -> list[object]:
+        return [element_getter(mplug.elementByPhysicalIndex(i)) for i in range(mplug.numElements())]
+    return _get
+
+
+def _compile_compound_getter(getters: list[TPlugGetter]) -> TPlugGetter:
+    # double3 などよく使う子の数はループを展開しておく
+    if len(getters) == 2:
+        getter0, getter1 = getters
+
+        def _get2(mplug: _om2.MPlug) -> tuple[object, ...]:
+            return getter0(mplug.child(0)), getter1(mplug.child(1))
+        return _get2
+
+    if len(getters) == 3:
+        getter0, getter1, getter2 = getters
+
+        def _get3(mplug: _om2.MPlug) -> tuple[object, ...]:
+            return getter0(mplug.child(0)), getter1(mplug.child(1)), getter2(mplug.child(2))
+        return _get3
+
+    if len(getters) == 4:
+        getter0, getter1, getter2, getter3 = getters
+
+        def _get4(mplug: _om2.MPlug) -> tuple[object, ...]:
+            return getter0(mplug.child(0)), getter1(mplug.child(1)), getter2(mplug.child(2)), getter3(mplug.child(3))
+        return _get4
+
+    def _get(mplug: _om2.MPlug) -> tuple[object, ...]:
+        return tuple(getter(mplug.child(i)) for i, getter in enumerate(getters))
+    return _get
+
+
+def _with_fallback(getter: TPlugGetter) -> TPlugGetter:
+    def _get(mplug: _om2.MPlug) -> object:
+        try:
+            return getter(mplug)
+        except:
+            return _get_by_command(mplug)
+    return _get
+
+
+def _resolve_attribute_setter(mattr: _om2.MObject, is_array: bool) -> TPlugSetter:
+    handle = _om2_MObjectHandle(mattr)
+    key = (handle.hashCode(), is_array)
+
+    entry = _SetterCache.entries.get(key, None)
+    if entry is not None:
+        cached_handle, setter = entry
+        if cached_handle.isAlive() and cached_handle.object() == mattr:
+            _SetterCache.entries.move_to_end(key)
+            return setter
+
+    setter = _compile_setter(mattr, is_array)
+    _store_entry(_SetterCache.entries, key, (handle, setter))
+    return setter
+
+
+def _compile_setter(mattr: _om2.MObject, is_array: bool) -> TPlugSetter:
+    # array
+    if is_array:
+        element_setter = _resolve_attribute_setter(mattr, False)
+
+        def _set_array(modifier: _om2.MDGModifier, mplug: _om2.MPlug, values: _abc.Iterable[object]) -> None:
+            # dict は {論理インデックス: 値} として疎な配列に書き込む
+            #   それ以外は既存の要素に関係なく、i 番目の値を論理インデックス i に書き込む
+            items = values.items() if isinstance(values, _abc.Mapping) else enumerate(values)
+            for i, value in items:
+                element_setter(modifier, mplug.elementByLogicalIndex(int(i)), value)
+        return _set_array
+
+    # compound
+    if mattr.hasFn(_om2.MFn.kCompoundAttribute):
+        mfn = _om2.MFnCompoundAttribute(mattr)
+        children = [mfn.child(i) for i in range(mfn.numChildren())]
+        setters = [_resolve_attribute_setter(child, _om2_MFnAttribute(child).array) for child in children]
+
+        def _set_compound(modifier: _om2.MDGModifier, mplug: _om2.MPlug, values: _abc.Iterable[object]) -> None:
+            for i, (setter, value) in enumerate(zip(setters, values)):
+                setter(modifier, mplug.child(i), value)
+        return _set_compound
+
+    api_type = mattr.apiType()
+    setter = None
+
+    if api_type == _om2.MFn.kTypedAttribute:
+        setter = _typed_attr_setter_table.get(_om2.MFnTypedAttribute(mattr).attrType(), None)
+    elif api_type == _om2.MFn.kNumericAttribute:
+        setter = _numeric_attr_setter_table.get(_om2.MFnNumericAttribute(mattr).numericType(), None)
+    else:
+        setter = _api_type_setter_table.get(api_type, None)
+
+    if setter is None:
+        attr_name = _om2_MFnAttribute(mattr).name
+
+        def _not_supported(*_) -> None:
+            raise TypeError('not-supported plug data: {} ({})'.format(attr_name, mattr.apiTypeStr))
+        return _not_supported
+
+    return setter
+
+
+def _set_matrix(modifier: _om2.MDGModifier, mplug: _om2.MPlug, value: object) -> None:
+    matrix = _om2.MMatrix([float(v) for v in _flatten(value)])
+    modifier.newPlugValue(mplug, _om2.MFnMatrixData().create(matrix))
+
+
+def _flatten(value: object) -> list[object]:
+    # 4x4 の NumPy 配列やタプルのタプルを 16 要素にならす
+    if hasattr(value, 'ravel'):
+        return value.ravel().tolist()
+    if isinstance(value, _om2.MMatrix):
+        return list(value)
+    result = []
+    for v in value:
+        if isinstance(v, _abc.Iterable):
+            result.extend(v)
+        else:
+            result.append(v)
+    return result
+
+
+def _get_by_command(mplug: _om2.MPlug) -> object:
+    return _cmds.getAttr(mplug.name())
 
 
 def _get_component_list_data(mplug: _om2.MPlug) -> tuple[object, ...]:
@@ -75,3 +333,35 @@ _numeric_attr_table = {
     _om2.MFnNumericData.kFloat: lambda plug: plug.asDouble(),
     _om2.MFnNumericData.kAddr: lambda plug: plug.asDouble(),
 }
+
+
+_api_type_setter_table = {
+    _om2.MFn.kDoubleLinearAttribute: lambda mod, plug, v: mod.newPlugValueMDistance(plug, _om2.MDistance(float(v), _om2.MDistance.uiUnit())),
+    _om2.MFn.kFloatLinearAttribute: lambda mod, plug, v: mod.newPlugValueMDistance(plug, _om2.MDistance(float(v), _om2.MDistance.uiUnit())),
+    _om2.MFn.kDoubleAngleAttribute: lambda mod, plug, v: mod.newPlugValueMAngle(plug, _om2.MAngle(float(v), _om2.MAngle.uiUnit())),
+    _om2.MFn.kFloatAngleAttribute: lambda mod, plug, v: mod.newPlugValueMAngle(plug, _om2.MAngle(float(v), _om2.MAngle.uiUnit())),
+    _om2.MFn.kEnumAttribute: lambda mod, plug, v: mod.newPlugValueInt(plug, int(v)),
+    _om2.MFn.kMatrixAttribute: _set_matrix,
+    _om2.MFn.kFloatMatrixAttribute: _set_matrix,
+    _om2.MFn.kTimeAttribute: lambda mod, plug, v: mod.newPlugValueMTime(plug, _om2.MTime(float(v), _om2.MTime.uiUnit())),
+}
+
+_typed_attr_setter_table = {
+    _om2.MFnData.kString: lambda mod, plug, v: mod.newPlugValueString(plug, str(v)),
+    _om2.MFnData.kStringArray: lambda mod, plug, v: mod.newPlugValue(plug, _om2.MFnStringArrayData().create([str(s) for s in v])),
+    _om2.MFnData.kIntArray: lambda mod, plug, v: mod.newPlugValue(plug, _om2.MFnIntArrayData().create([int(i) for i in v])),
+    _om2.MFnData.kFloatArray: lambda mod, plug, v: mod.newPlugValue(plug, _om2.MFnFloatArrayData().create([float(f) for f in v])),
+    _om2.MFnData.kDoubleArray: lambda mod, plug, v: mod.newPlugValue(plug, _om2.MFnDoubleArrayData().create([float(f) for f in v])),
+    _om2.MFnData.kVectorArray: lambda mod, plug, v: mod.newPlugValue(plug, _om2.MFnVectorArrayData().create([_om2.MVector(*[float(f) for f in vec]) for vec in v])),
+    _om2.MFnData.kMatrix: _set_matrix,
+}
+
+_numeric_attr_setter_table = {
+    _om2.MFnNumericData.kBoolean: lambda mod, plug, v: mod.newPlugValueBool(plug, bool(v)),
+    _om2.MFnNumericData.kInt: lambda mod, plug, v: mod.newPlugValueInt(plug, int(v)),
+    _om2.MFnNumericData.kByte: lambda mod, plug, v: mod.newPlugValueInt(plug, int(v)),
+    _om2.MFnNumericData.kShort: lambda mod, plug, v: mod.newPlugValueInt(plug, int(v)),
+    _om2.MFnNumericData.kLong: lambda mod, plug, v: mod.newPlugValueInt(plug, int(v)),
+    _om2.MFnNumericData.kDouble: lambda mod, plug, v: mod.newPlugValueDouble(plug, float(v)),
+    _om2.MFnNumericData.kFloat: lambda mod, plug, v: mod.newPlugValueFloat(plug, float(v)),
+}
@@ -4,8 +4,10 @@ import abc
 import maya.cmds as _cmds
 import maya.api.OpenMaya as _om2
 import maya.OpenMaya as _om
+import numpy as _np
 
 from .internal.types import *
+from .internal import mesh_impl as _mesh_impl
 
 if typing.TYPE_CHECKING:
     from . import components as _components
@@ -64,6 +66,10 @@ class ComponentIter(typing.Generic[TMItComp]):
 
         return self
 
+    def _element_indices(self) -> _np.ndarray:
+        # Component.elements と同じ並びのインデックス配列
+        return _np.array(self._comp.elements, dtype=_np.int64)
+
 
 class MeshVertexIter(ComponentIter[_om2.MItMeshVertex]):
 
@@ -163,6 +169,25 @@ class MeshVertexIter(ComponentIter[_om2.MItMeshVertex]):
     def position(self, space: int = _om2.MSpace.kObject) -> _om2.MPoint:
         return self._miter.position(space)
 
+    def positions(self, space: int = _om2.MSpace.kObject) -> _np.ndarray:
+        points = _mesh_impl.to_point_array(self._mfn_mesh.getPoints(space))
+        return points[self._element_indices()]
+
+    def vertex_normals(self, space: int = _om2.MSpace.kObject) -> _np.ndarray:
+        normals = _mesh_impl.to_vector_array(self._mfn_mesh.getVertexNormals(True, space))
+        return normals[self._element_indices()]
+
+    def on_boundary_mask(self) -> _np.ndarray:
+        mfn_mesh = self._mfn_mesh
+        vertex_count = mfn_mesh.numVertices
+        counts, connects = _mesh_impl.get_topology(mfn_mesh)
+        boundary_keys, _, _ = _mesh_impl.get_boundary_edge_keys(counts, connects, vertex_count)
+
+        mask = _np.zeros(vertex_count, dtype=bool)
+        mask[boundary_keys // vertex_count] = True
+        mask[boundary_keys % vertex_count] = True
+        return mask[self._element_indices()]
+
 
 class MeshFaceIter(ComponentIter[_om2.MItMeshPolygon]):
 
@@ -270,6 +295,40 @@ class MeshFaceIter(ComponentIter[_om2.MItMeshPolygon]):
 
         return result
 
+    def centers(self, space: int = _om2.MSpace.kObject) -> _np.ndarray:
+        mfn_mesh = self._mfn_mesh
+        points = _mesh_impl.to_point_array(mfn_mesh.getPoints(space))
+        counts, connects = _mesh_impl.get_topology(mfn_mesh)
+        face_ids, _ = _mesh_impl.get_face_vertex_links(counts)
+        sums = _mesh_impl.sum_by_face(points[connects], face_ids, len(counts))
+        centers = sums / _np.maximum(counts, 1)[:, _np.newaxis]
+        return centers[self._element_indices()]
+
+    def areas(self, space: int = _om2.MSpace.kObject) -> _np.ndarray:
+        mfn_mesh = self._mfn_mesh
+        points = _mesh_impl.to_point_array(mfn_mesh.getPoints(space))
+        return _mesh_impl.get_face_areas(mfn_mesh, points)[self._element_indices()]
+
+    def face_normals(self, space: int = _om2.MSpace.kObject) -> _np.ndarray:
+        # Newell 法で多角形の法線を求める
+        mfn_mesh = self._mfn_mesh
+        points = _mesh_impl.to_point_array(mfn_mesh.getPoints(space))
+        counts, connects = _mesh_impl.get_topology(mfn_mesh)
+        face_ids, next_ids = _mesh_impl.get_face_vertex_links(counts)
+        crosses = _np.cross(points[connects], points[connects[next_ids]])
+        normals = _mesh_impl.sum_by_face(crosses, face_ids, len(counts))
+        return _mesh_impl.normalize(normals)[self._element_indices()]
+
+    def is_zero_area_mask(self, space: int = _om2.MSpace.kObject, tolerance: float = 1e-10) -> _np.ndarray:
+        return self.areas(space) <= tolerance
+
+    def on_boundary_mask(self) -> _np.ndarray:
+        mfn_mesh = self._mfn_mesh
+        counts, connects = _mesh_impl.get_topology(mfn_mesh)
+        boundary_keys, keys, face_ids = _mesh_impl.get_boundary_edge_keys(counts, connects, mfn_mesh.numVertices)
+        boundary_counts = _np.bincount(face_ids, weights=_np.isin(keys, boundary_keys), minlength=len(counts))
+        return (boundary_counts > 0)[self._element_indices()]
+
 
 class MeshEdgeIter(ComponentIter[_om2.MItMeshEdge]):
 
@@ -314,6 +373,27 @@ class MeshEdgeIter(ComponentIter[_om2.MItMeshEdge]):
     def points(self, space: int = _om2.MSpace.kObject) -> _om2.MPointArray:
         return _om2.MPointArray([self._miter.point(0, space), self._miter.point(1, space)])
 
+    def vertex_index_pairs(self) -> _np.ndarray:
+        return _mesh_impl.get_edge_vertices(self._mfn_mesh)[self._element_indices()]
+
+    def centers(self, space: int = _om2.MSpace.kObject) -> _np.ndarray:
+        points = _mesh_impl.to_point_array(self._mfn_mesh.getPoints(space))
+        pairs = self.vertex_index_pairs()
+        return (points[pairs[:, 0]] + points[pairs[:, 1]]) * 0.5
+
+    def lengths(self, space: int = _om2.MSpace.kObject) -> _np.ndarray:
+        points = _mesh_impl.to_point_array(self._mfn_mesh.getPoints(space))
+        pairs = self.vertex_index_pairs()
+        return _np.linalg.norm(points[pairs[:, 1]] - points[pairs[:, 0]], axis=1)
+
+    def on_boundary_mask(self) -> _np.ndarray:
+        mfn_mesh = self._mfn_mesh
+        vertex_count = mfn_mesh.numVertices
+        counts, connects = _mesh_impl.get_topology(mfn_mesh)
+        boundary_keys, _, _ = _mesh_impl.get_boundary_edge_keys(counts, connects, vertex_count)
+        pairs = self.vertex_index_pairs()
+        return _np.isin(_mesh_impl.to_edge_keys(pairs[:, 0], pairs[:, 1], vertex_count), boundary_keys)
+
 
 class MeshFaceVertexIter(ComponentIter[_om2.MItMeshFaceVertex]):
 
@@ -389,6 +469,28 @@ class MeshFaceVertexIter(ComponentIter[_om2.MItMeshFaceVertex]):
     def position(self, space: int = _om2.MSpace.kObject) -> _om2.MPoint:
         return self._miter.position(space)
 
+    def positions(self, space: int = _om2.MSpace.kObject) -> _np.ndarray:
+        points = _mesh_impl.to_point_array(self._mfn_mesh.getPoints(space))
+        return points[self._element_indices().reshape(-1, 2)[:, 0]]
+
+    def face_vertex_normals(self, space: int = _om2.MSpace.kObject) -> _np.ndarray:
+        normals = _mesh_impl.get_face_vertex_normals(self._mfn_mesh, space)
+        return normals[self._face_vertex_ids()]
+
+    def _face_vertex_ids(self) -> _np.ndarray:
+        # (頂点ID, フェースID) の組から、メッシュ全体でのフェースバーテックスの通し番号を引く
+        mfn_mesh = self._mfn_mesh
+        vertex_count = mfn_mesh.numVertices
+        counts, connects = _mesh_impl.get_topology(mfn_mesh)
+        face_ids, _ = _mesh_impl.get_face_vertex_links(counts)
+
+        keys = face_ids * vertex_count + connects
+        order = _np.argsort(keys, kind='stable')
+
+        elements = self._element_indices().reshape(-1, 2)
+        element_keys = elements[:, 1] * vertex_count + elements[:, 0]
+        return order[_np.searchsorted(keys, element_keys, sorter=order)]
+
 
 def _get_color_set_name(color_set: TColorSet|None, default_value: str|None) -> str:
     if color_set is None:
@@ -1,9 +1,12 @@
 import collections.abc as abc
+import enum
 import typing
+import weakref
 
 import maya.cmds as _cmds
 import maya.api.OpenMaya as _om2
 import maya.api.OpenMayaAnim as _om2anim
+import numpy as _np
 
 from . import objects as _objects
 from . import general as _general
@@ -11,6 +14,13 @@ from . import components as _components
 from . import iterators as _iterators
 from .internal import factory as _factory
 from .internal import graphs as _graphs
+from .internal import plug_impl as _plug_impl
+from .internal import mesh_impl as _mesh_impl
+from .internal import dirty_watch_impl as _dirty_watch_impl
+from .internal import name_cache_impl as _name_cache_impl
+
+if typing.TYPE_CHECKING:
+    from . import spatial as _spatial
 
 
 # 呼び出し回数が極端に多くなる可能性のある静的メソッドをキャッシュ化しておく
@@ -20,6 +30,7 @@ _graphs_eval_plug = _graphs.eval_plug
 _graphs_to_node_instance = _graphs.to_node_instance
 _graphs_to_comp_instance = _graphs.to_comp_instance
 _factory_PlugFactory_create = _factory.PlugFactory.create
+_name_cache_impl_generation = _name_cache_impl.generation
 
 
 TFnDependNode = typing.TypeVar('TFnDependNode', bound=_om2.MFnDependencyNode)
@@ -44,6 +55,16 @@ class DependNode(_objects.MayaObject, typing.Generic[TFnDependNode]):
         kwargs['noIntermediate'] = True
         return _graphs.ls_nodes(*args, **kwargs)
 
+    @staticmethod
+    def get_attr_batch(
+            nodes: abc.Iterable['DependNode'],
+            attr: str,
+            as_array: bool = False
+    ) -> list[object]|_np.ndarray:
+        mplugs = [node.mfn.findPlug(attr, False) for node in nodes]
+        values = _plug_impl.plug_get_many_impl(mplugs)
+        return _np.array(values) if as_array else values
+
     @property
     def mel_object(self) -> str:
         return self.full_name
@@ -76,7 +97,15 @@ class DependNode(_objects.MayaObject, typing.Generic[TFnDependNode]):
 
     @property
     def full_name(self) -> str:
-        return self.mfn.name()
+        # リネームや親子付けの変更があるまでは、前回の文字列を使いまわす
+        generation = _name_cache_impl_generation()
+        if generation is not None and generation == self._full_name_generation:
+            return self._full_name
+
+        full_name = self._get_full_name()
+        self._full_name = full_name
+        self._full_name_generation = generation
+        return full_name
 
     @property
     def abs_name(self) -> str:
@@ -101,6 +130,8 @@ class DependNode(_objects.MayaObject, typing.Generic[TFnDependNode]):
         super(DependNode, self).__init__(obj)
         self._mfn: _om2.MFnDependencyNode|None = None
         self._plugs: dict[str, _general.Plug] = {}
+        self._full_name: str|None = None
+        self._full_name_generation: int|None = None
 
     def __str__(self) -> str:
         return repr(self)
@@ -108,6 +139,9 @@ class DependNode(_objects.MayaObject, typing.Generic[TFnDependNode]):
     def __repr__(self) -> str:
         return f"{self.__class__.__name__}('{self.full_name}')"
 
+    def _get_full_name(self) -> str:
+        return self.mfn.name()
+
     def __getattr__(self, item: str) -> _general.Plug:
         plug = self._plugs.get(item, None)
         if plug is not None:
@@ -175,6 +209,145 @@ class ContainerBase(DependNode[TFnDependNode], typing.Generic[TFnDependNode]):
     _mel_type = 'containerBase'
 
 
+class MembershipIndex(object):
+    u"""
+    セットのメンバーを MObjectHandle.hashCode() の集合として持っておくもの
+      contains() はラッパーの生成や名前解決をせずに O(1) で判定する
+      flatten_components=True の場合、コンポーネントのメンバーを (ノード, コンポーネントタイプ) ごとの
+      インデックス配列に展開して保持する（シングルインデックスのコンポーネントのみ）
+    """
+
+    @staticmethod
+    def from_selection(selection: _om2.MSelectionList, flatten_components: bool = False) -> 'MembershipIndex':
+        nodes: dict[int, tuple[_om2.MObjectHandle, _om2.MDagPath|None]] = {}
+        component_owners: dict[int, tuple[_om2.MObjectHandle, _om2.MDagPath|None]] = {}
+        components: dict[tuple[int, int], list[_np.ndarray]] = {}
+
+        for i in range(selection.length()):
+            mobj = selection.getDependNode(i)
+            handle = _om2.MObjectHandle(mobj)
+            hash_code = handle.hashCode()
+
+            if not mobj.hasFn(_om2.MFn.kDagNode):
+                nodes[hash_code] = (handle, None)
+                continue
+
+            mdagpath, mcomp = selection.getComponent(i)
+            if mcomp.isNull():
+                nodes[hash_code] = (handle, mdagpath)
+                continue
+
+            component_owners[hash_code] = (handle, mdagpath)
+            if flatten_components and mcomp.hasFn(_om2.MFn.kSingleIndexedComponent):
+                elements = _om2.MFnSingleIndexedComponent(mcomp).getElements()
+                components.setdefault((hash_code, mcomp.apiType()), []).append(_np.array(elements, dtype=_np.int64))
+
+        flatten = {key: _np.unique(_np.concatenate(arrays)) for key, arrays in components.items()}
+        return MembershipIndex(nodes, component_owners, flatten)
+
+    @property
+    def hash_codes(self) -> frozenset[int]:
+        return frozenset(self.__nodes.keys())
+
+    def __init__(
+            self,
+            nodes: dict[int, tuple[_om2.MObjectHandle, _om2.MDagPath|None]],
+            component_owners: dict[int, tuple[_om2.MObjectHandle, _om2.MDagPath|None]]|None = None,
+            components: dict[tuple[int, int], _np.ndarray]|None = None
+    ) -> None:
+        self.__nodes = nodes
+        self.__component_owners = component_owners or {}
+        self.__components = components or {}
+
+    def __len__(self) -> int:
+        return len(self.__nodes)
+
+    def __contains__(self, node: DependNode) -> bool:
+        return self.contains(node)
+
+    def contains(self, node: DependNode, include_components: bool = False) -> bool:
+        u"""
+        include_components=True の場合、コンポーネントだけがメンバーになっているノードも含める
+        """
+        hash_code = node.mobject_handle.hashCode()
+        if hash_code in self.__nodes:
+            return True
+        return include_components and hash_code in self.__component_owners
+
+    def nodes(self) -> list[DependNode]:
+        return self.__to_nodes(self.__nodes)
+
+    def component_owners(self) -> list[DependNode]:
+        return self.__to_nodes(self.__component_owners)
+
+    def component_indices(self, node: DependNode, component_type: int = _om2.MFn.kMeshVertComponent) -> _np.ndarray:
+        u"""
+        node（シェイプ）のコンポーネントのうちメンバーになっているもののインデックス（昇順）
+          flatten_components=True で構築していない場合は常に空になる
+        """
+        key = (node.mobject_handle.hashCode(), component_type)
+        return self.__components.get(key, _np.zeros(0, dtype=_np.int64))
+
+    def intersection(self, *others: 'MembershipIndex') -> 'MembershipIndex':
+        return self.__combine(others, set.intersection, _np.intersect1d)
+
+    def difference(self, *others: 'MembershipIndex') -> 'MembershipIndex':
+        return self.__combine(others, set.difference, _np.setdiff1d)
+
+    def union(self, *others: 'MembershipIndex') -> 'MembershipIndex':
+        return self.__combine(others, set.union, _np.union1d)
+
+    def __combine(
+            self,
+            others: abc.Sequence['MembershipIndex'],
+            set_op: abc.Callable[..., set],
+            array_op: abc.Callable[[_np.ndarray, _np.ndarray], _np.ndarray]
+    ) -> 'MembershipIndex':
+        indices = [self] + list(others)
+
+        def _pick(key_set: set, tables: list[dict]) -> dict:
+            result = {}
+            for key in key_set:
+                for table in tables:
+                    if key in table:
+                        result[key] = table[key]
+                        break
+            return result
+
+        node_keys = set_op(*[set(index.__nodes) for index in indices])
+
+        components = {}
+        for key in set(self.__components).union(*[other.__components for other in others]):
+            empty = _np.zeros(0, dtype=_np.int64)
+            result = self.__components.get(key, empty)
+            for other in others:
+                result = array_op(result, other.__components.get(key, empty))
+            if len(result) > 0:
+                components[key] = result
+
+        # コンポーネントを展開してあるノードは、演算後にインデックスが残ったものだけをメンバーとする
+        #   vtx[0:3] と vtx[0] の差のように、所有ノードの集合演算だけでは残るべきノードが消えてしまうため
+        flattened = {hash_code for index in indices for hash_code, _ in index.__components}
+        owner_keys = {hash_code for hash_code, _ in components}
+        for hash_code in set_op(*[set(index.__component_owners) for index in indices]):
+            if hash_code not in flattened:
+                owner_keys.add(hash_code)
+
+        return MembershipIndex(
+            _pick(node_keys, [index.__nodes for index in indices]),
+            _pick(owner_keys, [index.__component_owners for index in indices]),
+            components,
+        )
+
+    def __to_nodes(self, table: dict[int, tuple[_om2.MObjectHandle, _om2.MDagPath|None]]) -> list[DependNode]:
+        result = []
+        for handle, mdagpath in table.values():
+            if not handle.isAlive():
+                continue
+            result.append(_graphs_to_node_instance(_om2.MFnDependencyNode(handle.object()), mdagpath))
+        return result
+
+
 class DisplayLayer(DependNode[TFnDependNode], typing.Generic[TFnDependNode]):
 
     _mfn_type = _om2.MFn.kDisplayLayer
@@ -197,6 +370,16 @@ class DisplayLayer(DependNode[TFnDependNode], typing.Generic[TFnDependNode]):
         members = _cmds.editDisplayLayerMembers(self.mel_object, query=True, fullNames=True)
         return [_graphs_eval_node(node, tmp_mfn) for node in members or []]
 
+    def membership_index(self) -> MembershipIndex:
+        # レイヤーのメンバーは drawInfo から drawOverride へのコネクションなので、それを直接たどる
+        selection = _om2.MSelectionList()
+        draw_info = self.mfn.findPlug('drawInfo', False)
+        for mplug in draw_info.connectedTo(False, True):
+            mobj = mplug.node()
+            if mobj.hasFn(_om2.MFn.kDagNode):
+                selection.add(_om2.MDagPath.getAPathTo(mobj))
+        return MembershipIndex.from_selection(selection)
+
     def make_current(self) -> None:
         _cmds.editDisplayLayerMembers(currentDisplayLayer=self.mel_object)
 
@@ -273,6 +456,76 @@ class SkinCluster(DependNode[_om2anim.MFnSkinCluster]):
 
         return result
 
+    def weights_array(
+            self,
+            mesh: 'Mesh',
+            component: _components.MeshVertex|None = None,
+            influences: abc.Sequence['Joint']|None = None
+    ) -> _np.ndarray:
+        u"""
+        (頂点数, インフルエンス数) の float64 配列でウェイトを返す
+          influences を省略した場合の列の並びは influenceObjects() の並びに一致する
+        """
+        mfn: _om2anim.MFnSkinCluster = self.mfn
+
+        if component is None:
+            component = mesh.vertex_comp()
+
+        if influences is None:
+            flatten_weights, infl_count = mfn.getWeights(mesh.mdagpath, component.mobject)
+        else:
+            influence_indices = self.__influence_indices(influences)
+            flatten_weights = mfn.getWeights(mesh.mdagpath, component.mobject, influence_indices)
+            infl_count = len(influence_indices)
+
+        return _mesh_impl.to_double_array(flatten_weights).reshape(-1, infl_count)
+
+    def set_weights_array(
+            self,
+            mesh: 'Mesh',
+            weights: _np.ndarray,
+            component: _components.MeshVertex|None = None,
+            influences: abc.Sequence['Joint']|None = None,
+            normalize: bool = True
+    ) -> None:
+        u"""
+        (頂点数, インフルエンス数) の配列でウェイトを書き込む
+          influences を指定した場合は、その列だけを書き換える（weights の列は influences の並びに対応する）
+        """
+        mfn: _om2anim.MFnSkinCluster = self.mfn
+
+        if component is None:
+            component = mesh.vertex_comp()
+
+        if influences is None:
+            influence_indices = _om2.MIntArray(range(len(mfn.influenceObjects())))
+        else:
+            influence_indices = self.__influence_indices(influences)
+
+        weights = _np.ascontiguousarray(weights, dtype=_np.float64)
+        if weights.ndim != 2 or weights.shape[1] != len(influence_indices):
+            raise ValueError(f'invalid weights shape: {weights.shape}, {len(influence_indices)} influences expected')
+        if weights.shape[0] != len(component):
+            raise ValueError(f'invalid weights shape: {weights.shape}, {len(component)} vertices expected')
+
+        mfn.setWeights(
+            mesh.mdagpath,
+            component.mobject,
+            influence_indices,
+            _mesh_impl.to_mdouble_array(weights),
+            normalize,
+            False)
+
+    def __influence_indices(self, influences: abc.Sequence['Joint']) -> _om2.MIntArray:
+        # getWeights/setWeights のインデックスは influenceObjects() 上の位置であって、
+        # indexForInfluenceObject() が返す matrix プラグの論理インデックスではない
+        mfn: _om2anim.MFnSkinCluster = self.mfn
+        physical_indices = {mdagpath.fullPathName(): i for i, mdagpath in enumerate(mfn.influenceObjects())}
+        try:
+            return _om2.MIntArray([physical_indices[infl.mdagpath.fullPathName()] for infl in influences])
+        except KeyError as e:
+            raise ValueError(f'{e.args[0]} is not an influence of {self.mel_object}')
+
 
 class Entity(ContainerBase[TFnDependNode], typing.Generic[TFnDependNode]):
     pass
@@ -319,6 +572,11 @@ class ObjectSet(Entity[_om2.MFnSet]):
 
         return result
 
+    def membership_index(self, flatten_components: bool = False) -> MembershipIndex:
+        # 入れ子になったセットのメンバーも展開しておく
+        mfn: _om2.MFnSet = self.mfn
+        return MembershipIndex.from_selection(mfn.getMembers(True), flatten_components)
+
     def add(self, obj: _objects.MayaObject, force: bool = False) -> None:
         if not force:
             _cmds.sets(obj.mel_object, addElement=self.mel_object)
@@ -385,6 +643,21 @@ class AnimCurve(DependNode[_om2anim.MFnAnimCurve]):
     def key_count(self) -> int:
         return self.mfn.numKeys
 
+    @property
+    def is_unitless_input(self) -> bool:
+        u"""
+        入力が時間ではなく単位無しの値（animCurveU*）かどうか
+        """
+        return self.__class__._input_type is None
+
+    @property
+    def output_scale(self) -> float:
+        u"""
+        出力値を内部単位から UI 単位へ変換する倍率
+        """
+        # 内部単位 → UI単位 は線形なので、1 を変換した値を掛ければよい
+        return self._to_output(1.0)
+
     def key(self, index: int) -> float:
         return self.mfn.input(index).asUnits(_om2.MTime.uiUnit())
 
@@ -403,6 +676,68 @@ class AnimCurve(DependNode[_om2anim.MFnAnimCurve]):
         value = self.mfn.evaluate(self._to_input(time))
         return self._to_output(value)
 
+    def keys_array(self) -> _np.ndarray:
+        mfn = self.mfn
+        count = mfn.numKeys
+        input_type = self.__class__._input_type
+        if input_type is None:
+            return _np.fromiter((mfn.unitlessInput(i) for i in range(count)), dtype=_np.float64, count=count)
+
+        # 値と単位をそのまま読み、UI単位への変換は単位ごとに 1 回の掛け算で済ませる
+        inputs = [mfn.input(i) for i in range(count)]
+        times = _np.fromiter((input_.value for input_ in inputs), dtype=_np.float64, count=count)
+        units = _np.fromiter((input_.unit for input_ in inputs), dtype=_np.int64, count=count)
+
+        ui_unit = input_type.uiUnit()
+        for unit in _np.unique(units).tolist():
+            scale = input_type(1.0, unit).asUnits(ui_unit)
+            if scale != 1.0:
+                times[units == unit] *= scale
+        return times
+
+    def values_array(self) -> _np.ndarray:
+        mfn = self.mfn
+        values = _np.array([mfn.value(i) for i in range(mfn.numKeys)], dtype=_np.float64)
+        return values * self.output_scale
+
+    def evaluate_many(self, times: abc.Iterable[float]|_np.ndarray) -> _np.ndarray:
+        mfn = self.mfn
+        to_input = self._to_input
+
+        # 入力の変換は evaluate と同じくクラスごとの _to_input に任せ、出力の単位変換はまとめて最後に一度だけ行う
+        values = [mfn.evaluate(to_input(float(time))) for time in times]
+        return _np.array(values, dtype=_np.float64) * self.output_scale
+
+    def set_keys_array(
+            self,
+            times: abc.Sequence[float]|_np.ndarray,
+            values: abc.Sequence[float]|_np.ndarray,
+            in_tangent_type: int = _om2anim.MFnAnimCurve.kTangentGlobal,
+            out_tangent_type: int = _om2anim.MFnAnimCurve.kTangentGlobal,
+            keep_existing_keys: bool = False
+    ) -> None:
+        u"""
+        MFnAnimCurve.addKeys でキーをまとめて打つ（API 経由なので undo には積まれない）
+          times, values は UI 単位で渡す
+        """
+        times = _np.asarray(times, dtype=_np.float64)
+        values = _np.asarray(values, dtype=_np.float64) / self.output_scale
+
+        mfn = self.mfn
+        input_type = self.__class__._input_type
+        if input_type is None:
+            # 入力がunitlessのカーブには addKeys が使えないので1つずつ打つ
+            if not keep_existing_keys:
+                for i in reversed(range(mfn.numKeys)):
+                    mfn.remove(i)
+            for time, value in zip(times.tolist(), values.tolist()):
+                mfn.addKey(time, value, in_tangent_type, out_tangent_type)
+            return
+
+        ui_unit = input_type.uiUnit()
+        mtimes = _om2.MTimeArray([_om2.MTime(time, ui_unit) for time in times.tolist()])
+        mfn.addKeys(mtimes, values.tolist(), in_tangent_type, out_tangent_type, keep_existing_keys)
+
     def in_tangent_type(self, index: int) -> int:
         return self.mfn.inTangentType(index)
 
@@ -520,8 +855,8 @@ class AnimCurveUA(AnimCurve):
 
     _mel_type = 'animCurveUA'
 
-    _in_type = None
-    _out_type = _om2.MAngle
+    _input_type = None
+    _output_type = _om2.MAngle
 
     @staticmethod
     def create(**kwargs) -> 'AnimCurveUA':
@@ -566,6 +901,18 @@ class AnimCurveUU(AnimCurve):
 
 TFnDagNode = typing.TypeVar('TFnDagNode', bound=_om2.MFnDagNode)
 
+# DagNode.relatives() で cmds を経由せずに扱える listRelatives のフラグ（短縮形 -> 正式名）
+#   path, fullPath は名前の形式を変えるだけなので、ラッパーを返す場合は無視してよい
+_NATIVE_RELATIVES_FLAGS = {
+    'children': 'children', 'c': 'children',
+    'allDescendents': 'allDescendents', 'ad': 'allDescendents',
+    'shapes': 'shapes', 's': 'shapes',
+    'type': 'type', 'typ': 'type',
+    'noIntermediate': 'noIntermediate', 'ni': 'noIntermediate',
+    'path': 'path', 'pa': 'path',
+    'fullPath': 'fullPath', 'f': 'fullPath',
+}
+
 
 class DagNode(Entity[TFnDagNode], typing.Generic[TFnDagNode]):
 
@@ -582,10 +929,6 @@ class DagNode(Entity[TFnDagNode], typing.Generic[TFnDagNode]):
     def mdagpath(self) -> _om2.MDagPath:
         return self._mdagpath
 
-    @property
-    def full_name(self) -> str:
-        return self._mdagpath.fullPathName()
-
     @property
     def root_node(self) -> 'DagNode':
         mdagpath = _om2.MDagPath(self.mdagpath)
@@ -646,6 +989,9 @@ class DagNode(Entity[TFnDagNode], typing.Generic[TFnDagNode]):
         super(DagNode, self).__init__(obj.node())
         self._mdagpath = obj
 
+    def _get_full_name(self) -> str:
+        return self._mdagpath.fullPathName()
+
     def __repr__(self) -> str:
         if self.is_world:
             return f'{self.__class__.__name__}(world)'
@@ -655,6 +1001,11 @@ class DagNode(Entity[TFnDagNode], typing.Generic[TFnDagNode]):
         if self.is_world:
             raise NotImplementedError('World.relatives() is not implemented')
 
+        # 子や子孫を辿るだけなら cmds を経由せずに、listRelatives と同じ順番で返す
+        relatives = self.__native_relatives(kwargs)
+        if relatives is not None:
+            return relatives
+
         kwargs['path'] = True
         others = _cmds.listRelatives(self.mel_object, **kwargs)
         if others is None:
@@ -663,6 +1014,43 @@ class DagNode(Entity[TFnDagNode], typing.Generic[TFnDagNode]):
         tmp_mfn = _om2.MFnDependencyNode()
         return [_graphs_eval_node(name, tmp_mfn) for name in others]
 
+    def __native_relatives(self, kwargs: dict[str, object]) -> list['DagNode']|None:
+        options = {}
+        for key, value in kwargs.items():
+            flag = _NATIVE_RELATIVES_FLAGS.get(key, None)
+            if flag is None:
+                return None
+            options[flag] = value
+
+        fn_types = [_om2.MFn.kShape] if options.get('shapes', False) else None
+        no_intermediate = bool(options.get('noIntermediate', False))
+        if options.get('allDescendents', False):
+            # listRelatives -allDescendents は深さ優先の逆順（子孫が先、親が後）
+            relatives = list(_graphs.iter_dag(self.mdagpath, False, fn_types, no_intermediate))
+            relatives.reverse()
+        else:
+            relatives = list(_graphs.iter_children(self.mdagpath, fn_types, no_intermediate))
+
+        type_names = options.get('type', None)
+        if type_names is None:
+            return relatives
+
+        if isinstance(type_names, str):
+            type_names = [type_names]
+        type_names = set(type_names)
+        matches: dict[str, bool] = {}
+
+        result = []
+        for node in relatives:
+            type_name = node.node_type
+            matched = matches.get(type_name, None)
+            if matched is None:
+                matched = not type_names.isdisjoint(_factory.NodeFactory.inherited_types(type_name) or [type_name])
+                matches[type_name] = matched
+            if matched:
+                result.append(node)
+        return result
+
     def parent(self, index: int = 0) -> typing['DagNode', None]:
         if self.is_world:
             return None
@@ -726,6 +1114,13 @@ class DagNode(Entity[TFnDagNode], typing.Generic[TFnDagNode]):
         return None
 
     def children(self, **kwargs) -> list['DagNode']:
+        # noIntermediate 以外の指定がなければ cmds を経由せずに辿る
+        no_intermediate = kwargs.pop('noIntermediate', kwargs.pop('ni', False))
+        if len(kwargs) == 0 and not self.is_world:
+            return list(self.iter_children(no_intermediate=no_intermediate))
+        if no_intermediate:
+            kwargs['noIntermediate'] = True
+
         if self.is_world:
             kwargs['assemblies'] = True
             return _graphs.ls_nodes(**kwargs)
@@ -733,6 +1128,13 @@ class DagNode(Entity[TFnDagNode], typing.Generic[TFnDagNode]):
         kwargs['children'] = True
         return self.relatives(**kwargs)
 
+    def iter_children(
+            self,
+            fn_types: abc.Sequence[int]|None = None,
+            no_intermediate: bool = False
+    ) -> abc.Iterator['DagNode']:
+        return _graphs.iter_children(self.mdagpath, fn_types, no_intermediate)
+
     def ancestors(self, **kwargs) -> list['DagNode']:
         if self.is_world:
             return []
@@ -774,6 +1176,15 @@ class DagNode(Entity[TFnDagNode], typing.Generic[TFnDagNode]):
         kwargs['allDescendents'] = True
         return self.relatives(**kwargs)
 
+    def iter_descendents(
+            self,
+            breadth_first: bool = False,
+            fn_types: abc.Sequence[int]|None = None,
+            no_intermediate: bool = False
+    ) -> abc.Iterator['DagNode']:
+        root = None if self.is_world else self.mdagpath
+        return _graphs.iter_dag(root, breadth_first, fn_types, no_intermediate)
+
     def siblings(self, **kwargs) -> list['DagNode']:
         if self.is_world:
             return []
@@ -1019,6 +1430,80 @@ class NurbsCurve(CurveShape[_om2.MFnNurbsCurve]):
     _mel_type = 'nurbsCurve'
 
 
+class MeshSnapshotField(enum.Flag):
+    POINTS = enum.auto()
+    NORMALS = enum.auto()
+    UVS = enum.auto()
+    COLORS = enum.auto()
+    TOPOLOGY = enum.auto()
+    EDGES = enum.auto()
+    ALL = POINTS | NORMALS | UVS | COLORS | TOPOLOGY | EDGES
+
+
+class MeshSnapshot(object):
+    u"""
+    メッシュのジオメトリを NumPy 配列としてまとめて抜き出したもの
+      fields に含まれないフィールドは None（UV、カラーは空の dict）になる
+    """
+
+    @property
+    def space(self) -> int:
+        return self.__space
+
+    @property
+    def fields(self) -> MeshSnapshotField:
+        return self.__fields
+
+    def __init__(
+            self,
+            mfn_mesh: _om2.MFnMesh,
+            space: int = _om2.MSpace.kObject,
+            fields: MeshSnapshotField = MeshSnapshotField.ALL
+    ) -> None:
+        self.__space = space
+        self.__fields = fields
+
+        # (頂点数, 3)
+        self.points: _np.ndarray|None = None
+        # (フェース数,), (フェースバーテックス数,)
+        self.face_vertex_counts: _np.ndarray|None = None
+        self.face_vertex_indices: _np.ndarray|None = None
+        # (フェースバーテックス数, 3)
+        self.normals: _np.ndarray|None = None
+        # UVセット名: (UV数, 2), UVセット名: (フェースバーテックス数,)
+        self.uvs: dict[str, _np.ndarray] = {}
+        self.uv_indices: dict[str, _np.ndarray] = {}
+        # カラーセット名: (フェースバーテックス数, 4)
+        self.colors: dict[str, _np.ndarray] = {}
+        # (エッジ数, 2)
+        self.edge_vertex_indices: _np.ndarray|None = None
+
+        if fields & MeshSnapshotField.POINTS:
+            self.points = _mesh_impl.to_point_array(mfn_mesh.getPoints(space))
+
+        if fields & (MeshSnapshotField.TOPOLOGY | MeshSnapshotField.UVS):
+            counts, connects = _mesh_impl.get_topology(mfn_mesh)
+            if fields & MeshSnapshotField.TOPOLOGY:
+                self.face_vertex_counts = counts
+                self.face_vertex_indices = connects
+
+            if fields & MeshSnapshotField.UVS:
+                for name in mfn_mesh.getUVSetNames():
+                    us, vs = mfn_mesh.getUVs(name)
+                    self.uvs[name] = _np.column_stack((_np.array(us, dtype=_np.float64), _np.array(vs, dtype=_np.float64)))
+                    self.uv_indices[name] = _mesh_impl.get_face_vertex_uv_ids(mfn_mesh, name, counts)
+
+        if fields & MeshSnapshotField.NORMALS:
+            self.normals = _mesh_impl.get_face_vertex_normals(mfn_mesh, space)
+
+        if fields & MeshSnapshotField.COLORS:
+            for name in mfn_mesh.getColorSetNames():
+                self.colors[name] = _mesh_impl.to_color_array(mfn_mesh.getFaceVertexColors(name))
+
+        if fields & MeshSnapshotField.EDGES:
+            self.edge_vertex_indices = _mesh_impl.get_edge_vertices(mfn_mesh)
+
+
 class Mesh(SurfaceShape[_om2.MFnMesh]):
 
     _mfn_type = _om2.MFn.kMesh
@@ -1029,6 +1514,11 @@ class Mesh(SurfaceShape[_om2.MFnMesh]):
     def create(**kwargs) -> 'Mesh':
         return _graphs.create_node(Mesh._mel_type, **kwargs)
 
+    def __init__(self, obj: str|_om2.MObject|_om2.MDagPath|None) -> None:
+        super(Mesh, self).__init__(obj)
+        self.__point_indices: dict[int, '_spatial.PointIndex'] = {}
+        self.__point_index_key: int|None = None
+
     @property
     def face_count(self) -> int:
         return self.mfn.numPolygons
@@ -1056,6 +1546,60 @@ class Mesh(SurfaceShape[_om2.MFnMesh]):
     def points(self, space: int =_om2.MSpace.kObject) -> _om2.MFloatPointArray:
         return self.mfn.getFloatPoints(space)
 
+    def snapshot(
+            self,
+            space: int = _om2.MSpace.kObject,
+            fields: MeshSnapshotField = MeshSnapshotField.ALL
+    ) -> MeshSnapshot:
+        # ワールド空間の値は MDagPath から作った MFnMesh でないと取れない
+        mfn = self.mfn if space == _om2.MSpace.kObject else _om2.MFnMesh(self.mdagpath)
+        return MeshSnapshot(mfn, space, fields)
+
+    def point_index(self, space: int = _om2.MSpace.kObject) -> '_spatial.PointIndex':
+        u"""
+        頂点位置の KD 木を返す
+          メッシュ（ワールド空間の場合は上位のトランスフォームも）のプラグが dirty になるまでは、作り直さずに使いまわす
+          dirty の監視はノードごとに 1 つのコールバックを全メッシュで共有し、KD 木を捨てた時点で外す
+          不要になった KD 木を捨てて監視を外すには release_point_indices() を呼ぶ（ラッパーが解放された時にも外す）
+        """
+        index = self.__point_indices.get(space, None)
+        if index is not None:
+            return index
+
+        # spatial は nodetypes を import しているので、循環しないようにここで import する
+        from . import spatial as _spatial
+
+        mfn = self.mfn if space == _om2.MSpace.kObject else _om2.MFnMesh(self.mdagpath)
+        index = _spatial.PointIndex(_mesh_impl.to_point_array(mfn.getPoints(space)))
+        self.__watch_point_indices(space)
+        self.__point_indices[space] = index
+        return index
+
+    def release_point_indices(self) -> None:
+        u"""
+        point_index() でキャッシュした KD 木を捨てて、dirty の監視を外す
+        """
+        self.__point_indices.clear()
+        if self.__point_index_key is not None:
+            _dirty_watch_impl.unwatch(self.__point_index_key)
+
+    def __watch_point_indices(self, space: int) -> None:
+        if self.__point_index_key is None:
+            self.__point_index_key = _dirty_watch_impl.new_key()
+            weakref.finalize(self, _dirty_watch_impl.unwatch, self.__point_index_key)
+
+        # オブジェクト空間ならメッシュだけ、ワールド空間なら上位のトランスフォームも監視する
+        mdagpath = _om2.MDagPath(self.mdagpath)
+        mobjs = [mdagpath.node()]
+        if space != _om2.MSpace.kObject:
+            mdagpath.pop()
+            while mdagpath.length() > 0:
+                mobjs.append(mdagpath.node())
+                mdagpath.pop()
+
+        # コールバックが self を掴むとラッパーが解放されなくなるので、キャッシュの dict だけを渡す
+        _dirty_watch_impl.watch(self.__point_index_key, mobjs, self.__point_indices.clear)
+
     def connected_shaders(self) -> dict['ShadingEngine', list[int]]:
         mobjs, face_ids = self.mfn.getConnectedShaders(self.instance_number)
 
@@ -0,0 +1,41 @@
+u"""
+qymel が組み立てた MDGModifier の操作を、undo できる 1 つの操作として実行するためのコマンド
+  qymel.maya.internal.modifier_impl.commit() から自動で読み込まれる
+"""
+import maya.api.OpenMaya as _om2
+
+from qymel.maya.internal import modifier_impl as _modifier_impl
+
+
+def maya_useNewAPI():
+    pass
+
+
+class CommitModifierCommand(_om2.MPxCommand):
+
+    def __init__(self):
+        super(CommitModifierCommand, self).__init__()
+        self.__modifiers: list[_om2.MDGModifier] = []
+
+    def doIt(self, args: _om2.MArgList) -> None:
+        operation = _modifier_impl.take_pending()
+        self.__modifiers = operation()
+
+    def redoIt(self) -> None:
+        for modifier in self.__modifiers:
+            modifier.doIt()
+
+    def undoIt(self) -> None:
+        for modifier in reversed(self.__modifiers):
+            modifier.undoIt()
+
+    def isUndoable(self) -> bool:
+        return True
+
+
+def initializePlugin(mobj: _om2.MObject) -> None:
+    _om2.MFnPlugin(mobj, 'QyMEL').registerCommand(_modifier_impl.COMMAND_NAME, CommitModifierCommand)
+
+
+def uninitializePlugin(mobj: _om2.MObject) -> None:
+    _om2.MFnPlugin(mobj).deregisterCommand(_modifier_impl.COMMAND_NAME)
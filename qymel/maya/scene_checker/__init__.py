@@ -1,3 +1,4 @@
 from .checker import *
+from .context import *
 from .groups import *
 from .items import *
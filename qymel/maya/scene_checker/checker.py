@@ -1,5 +1,13 @@
 import collections.abc as abc
+import concurrent.futures
+import multiprocessing
+
+import maya.api.OpenMaya as _om2
+
+from . import context as _context
 from . import groups as _groups
+from . import items as _items
+from . import tracking as _tracking
 
 
 class Checker(object):
@@ -8,26 +16,69 @@ class Checker(object):
     def groups(self) -> abc.Sequence[_groups.CheckItemGroup]:
         return self.__groups
 
+    @property
+    def context(self) -> _context.SceneContext:
+        return self.__context
+
     def __init__(self):
         self.__groups: list[_groups.CheckItemGroup] = []
+        self.__context = _context.SceneContext()
+        self.__tracker = _tracking.DirtyNodeTracker()
+        self.__context_serial = 0
+        self.__listeners: list[abc.Callable[[str, abc.Sequence[_items.CheckResult]], None]] = []
 
     def append(self, label: str) -> _groups.CheckItemGroup:
         group = _groups.CheckItemGroup(label)
+        for listener in self.__listeners:
+            group.add_listener(listener)
         self.__groups.append(group)
         return group
 
+    def add_listener(self, listener: abc.Callable[[str, abc.Sequence[_items.CheckResult]], None]):
+        u"""
+        全グループに listener を登録する。serialization.ResultWriter.write を渡すと実行しながら書き出せる
+        """
+        self.__listeners.append(listener)
+        for group in self.__groups:
+            group.add_listener(listener)
+
+    def remove_listener(self, listener: abc.Callable[[str, abc.Sequence[_items.CheckResult]], None]):
+        self.__listeners.remove(listener)
+        for group in self.__groups:
+            group.remove_listener(listener)
+
     def clear_results(self):
         for group in self.__groups:
             group.clear_results()
 
-    def execute_all(self):
-        for group in self.__groups:
-            group.execute_all()
+    def execute_all(self, max_workers: int|None = None):
+        u"""
+        max_workers を指定すると、read-only な項目の _analyze() を別プロセスで並列に実行する
+          _analyze() は純粋な Python なので、スレッドでは GIL に阻まれて速くならない
+          ワーカーは mayapy を起動し直すので、mayapy（maya.standalone）で実行している時だけ有効で、
+          Maya の GUI 上では sys.executable が maya 本体になってしまうため、常に順番に実行する
+        """
+        # 全グループで同じシーン情報を使いまわす
+        self.__context.invalidate()
+
+        if max_workers is None or not _can_use_processes():
+            for group in self.__groups:
+                group.execute_all(context=self.__context)
+            return
+
+        with concurrent.futures.ProcessPoolExecutor(
+                max_workers=max_workers,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_initialize_worker
+        ) as executor:
+            for group in self.__groups:
+                group.execute_all(executor, self.__context)
 
     def execute_group(self, group_name: str) -> _groups.CheckItemGroup|None:
         for group in self.__groups:
-            if group == group_name:
-                group.execute_all()
+            if group.label == group_name:
+                self.__context.invalidate()
+                group.execute_all(context=self.__context)
                 return group
         return None
 
@@ -43,6 +94,54 @@ class Checker(object):
                 return True
         return False
 
+    def timings(self) -> dict[_items.CheckItem, float]:
+        result = {}
+        for group in self.__groups:
+            result.update(group.timings())
+        return result
+
+    def execute_incremental(self, group: _groups.CheckItemGroup|None = None) -> list[_items.CheckItem]:
+        u"""
+        前回の execute_incremental() 以降に変更されたノードに関係する項目だけを再実行する
+          初回呼び出しで変更の監視を始めて全項目を実行する。監視は stop_tracking() で止める
+          group を渡した場合はそのグループだけを対象にする
+        """
+        self.__tracker.start()
+
+        if self.__tracker.serial != self.__context_serial:
+            self.__context.invalidate()
+            self.__context_serial = self.__tracker.serial
+
+        executed = []
+        for target in ([group] if group is not None else self.__groups):
+            executed.extend(target.execute_dirty(self.__tracker, self.__context))
+
+        # 全グループが取り出し終わった変更は捨てる
+        serials = [target.tracked_serial for target in self.__groups]
+        if None not in serials:
+            self.__tracker.discard(min(serials))
+
+        return executed
+
+    def stop_tracking(self):
+        self.__tracker.stop()
+        self.__tracker.clear()
+        for group in self.__groups:
+            group.clear_results()
+
     def modify_all(self):
         for group in self.__groups:
             group.modify_all()
+        # 修正でシーンが変わっているので、次の実行では取り直す
+        self.__context.invalidate()
+
+
+def _can_use_processes() -> bool:
+    return _om2.MGlobal.mayaState() == _om2.MGlobal.kLibraryApp
+
+
+def _initialize_worker():
+    # CheckItem を復元する時に、項目を定義したモジュール（maya.cmds や qymel.maya を import する）が読み込まれるので、
+    # 先に Maya を初期化しておく
+    import maya.standalone
+    maya.standalone.initialize(name='python')
@@ -0,0 +1,56 @@
+import collections.abc as abc
+
+import maya.cmds as _cmds
+
+from ..internal.types import *
+from ..internal import graphs as _graphs
+
+
+class SceneContext(object):
+    u"""
+    チェック1回分のシーン情報をまとめて持っておくためのもの
+      各ビューは最初にアクセスされた時に一度だけ計算して、invalidate() されるまで使いまわす
+      CheckItem からは self.context でアクセスする
+    """
+
+    def __init__(self):
+        self.__cache: dict[object, object] = {}
+
+    def invalidate(self) -> None:
+        self.__cache.clear()
+
+    def is_cached(self, key: object) -> bool:
+        return key in self.__cache
+
+    def get(self, key: object, factory: abc.Callable[[], object]) -> object:
+        u"""
+        key に対応する値を返す。まだ計算されていなければ factory() で計算してキャッシュする
+          プロジェクト固有のビューを追加したい場合はこれを使う
+        """
+        if key not in self.__cache:
+            self.__cache[key] = factory()
+        return self.__cache[key]
+
+    def nodes(self, type_name: str) -> list[TDependNode]:
+        return self.get(('nodes', type_name), lambda: _graphs.ls_nodes(type=type_name))
+
+    def meshes(self) -> list[TDependNode]:
+        return self.nodes('mesh')
+
+    def transforms(self) -> list[TDependNode]:
+        return self.nodes('transform')
+
+    def shading_engines(self) -> list[TDependNode]:
+        return self.nodes('shadingEngine')
+
+    def references(self) -> list[TDependNode]:
+        return self.nodes('reference')
+
+    def namespaces(self) -> list[str]:
+        return self.get('namespaces', _list_namespaces)
+
+
+def _list_namespaces() -> list[str]:
+    # ルートの UI, shared は Maya が勝手に作るので除外する
+    namespaces = _cmds.namespaceInfo(':', listOnlyNamespaces=True, recurse=True, absoluteName=True) or []
+    return [namespace for namespace in namespaces if namespace not in (':UI', ':shared')]
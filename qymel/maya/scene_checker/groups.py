@@ -1,8 +1,14 @@
 import collections.abc as abc
+import concurrent.futures
 import functools
 import itertools
+import time
 
+import maya.api.OpenMaya as _om2
+
+from . import context as _context
 from . import items as _items
+from . import tracking as _tracking
 
 
 class CheckItemGroup(object):
@@ -16,6 +22,10 @@ class CheckItemGroup(object):
         self.__items: dict[str, list[_items.CheckItem]] = {}
         self.__category_orders: dict[str, int] = {}
         self.__results: dict[_items.CheckItem, abc.Sequence[_items.CheckResult]]|None = {}
+        self.__timings: dict[_items.CheckItem, float] = {}
+        self.__dependencies: dict[_items.CheckItem, set[int]] = {}
+        self.__tracked_serial: int|None = None
+        self.__listeners: list[abc.Callable[[str, abc.Sequence[_items.CheckResult]], None]] = []
 
     def append(self, item: _items.CheckItem):
         if item.category not in self.__items:
@@ -64,19 +74,144 @@ class CheckItemGroup(object):
 
     def clear_results(self):
         self.__results = {}
+        self.__timings = {}
+        self.__dependencies = {}
+        self.__tracked_serial = None
+
+    @property
+    def tracked_serial(self) -> int|None:
+        return self.__tracked_serial
+
+    def add_listener(self, listener: abc.Callable[[str, abc.Sequence[_items.CheckResult]], None]):
+        u"""
+        項目の結果が出るたびに listener(グループのラベル, 結果) を呼ぶ
+        """
+        self.__listeners.append(listener)
+
+    def remove_listener(self, listener: abc.Callable[[str, abc.Sequence[_items.CheckResult]], None]):
+        self.__listeners.remove(listener)
+
+    def set_results(self, item: _items.CheckItem, results: abc.Sequence[_items.CheckResult]):
+        # 保存しておいた結果を、実行せずに復元する時に使う
+        self.__results[item] = results
 
     def is_executed(self, item: _items.CheckItem) -> bool:
         return item in self.__results
 
-    def execute(self, item: _items.CheckItem) -> abc.Sequence[_items.CheckResult]:
-        results = item.execute()
+    def execute(
+            self,
+            item: _items.CheckItem,
+            context: _context.SceneContext|None = None
+    ) -> abc.Sequence[_items.CheckResult]:
+        start = time.perf_counter()
+        results = item.execute(context)
+        self.__timings[item] = time.perf_counter() - start
         self.__results[item] = results
+        self.__notify(results)
         return results
 
-    def execute_all(self):
+    def execute_all(
+            self,
+            executor: concurrent.futures.Executor|None = None,
+            context: _context.SceneContext|None = None
+    ):
+        u"""
+        executor を渡すと、read-only な項目の解析フェーズをそこで並列に実行する
+          抽出フェーズと read-only でない項目は、これまで通りメインスレッドで順番に実行する
+          結果は items() の順に格納されるので、実行順によらず results() は同じになる
+        context を渡さなければ、この呼び出しの中だけで共有する SceneContext を作る
+        """
         self.clear_results()
+        context = context or _context.SceneContext()
+
+        if executor is None:
+            for item in self.items():
+                self.execute(item, context)
+            return
+
+        futures: dict[_items.CheckItem, concurrent.futures.Future] = {}
         for item in self.items():
-            self.execute(item)
+            if item.is_read_only:
+                start = time.perf_counter()
+                data = item.extract(context)
+                self.__timings[item] = time.perf_counter() - start
+                futures[item] = executor.submit(_analyze_item, item, data)
+            else:
+                self.execute(item, context)
+
+        results: dict[_items.CheckItem, abc.Sequence[_items.CheckResult]] = {}
+        for item, future in futures.items():
+            item_results, elapsed = future.result()
+            for result in item_results:
+                result._bind(item)
+            results[item] = item_results
+            self.__timings[item] += elapsed
+            self.__notify(item_results)
+
+        self.__results = {item: results.get(item) or self.__results[item] for item in self.items()}
+
+    def execute_dirty(
+            self,
+            tracker: _tracking.DirtyNodeTracker,
+            context: _context.SceneContext|None = None
+    ) -> abc.Sequence[_items.CheckItem]:
+        u"""
+        前回の execute_dirty() 以降に tracker が記録した変更の影響を受ける項目だけを再実行する
+          影響を受けない項目は前回の結果をそのまま残す
+          watch_types を宣言していない項目は毎回再実行する
+          初回は全項目を実行する
+        再実行した項目を返す
+        """
+        context = context or _context.SceneContext()
+        serial = tracker.serial
+
+        if self.__tracked_serial is None:
+            self.execute_all(context=context)
+            executed = self.items()
+        else:
+            hash_codes, type_names = tracker.changes_since(self.__tracked_serial)
+            executed = [
+                item for item in self.items()
+                if not self.is_executed(item) or self.__is_affected(item, hash_codes, type_names)
+            ]
+            for item in executed:
+                self.execute(item, context)
+
+        for item in executed:
+            # 常に再実行する項目のために監視を増やしても意味がない
+            if len(item.watch_types) == 0:
+                continue
+            dependencies = _to_mobjects(itertools.chain.from_iterable(
+                result.dependencies for result in self.__results[item]
+            ))
+            self.__dependencies[item] = {_om2.MObjectHandle(mobj).hashCode() for mobj in dependencies}
+            tracker.watch(dependencies)
+            for type_name in item.watch_types:
+                tracker.watch(node.mobject for node in context.nodes(type_name))
+
+        self.__tracked_serial = serial
+        return executed
+
+    def __notify(self, results: abc.Sequence[_items.CheckResult]):
+        for listener in self.__listeners:
+            listener(self.__label, results)
+
+    def __is_affected(self, item: _items.CheckItem, hash_codes: set[int], type_names: set[str]) -> bool:
+        # 監視するタイプを宣言していない項目は、どのノードのアトリビュート変更に依存するか分からないので常に再実行する
+        if len(item.watch_types) == 0:
+            return True
+        if len(hash_codes) == 0:
+            return False
+        if not type_names.isdisjoint(item.watch_types):
+            return True
+        return not hash_codes.isdisjoint(self.__dependencies.get(item, ()))
+
+    def timings(self) -> dict[_items.CheckItem, float]:
+        u"""
+        直近の実行で各項目にかかった秒数
+          read-only な項目は抽出と解析の合計（並列実行時の待ち時間は含まない）
+        """
+        return {item: self.__timings[item] for item in self.items() if item in self.__timings}
 
     def modify(self, error: _items.CheckResult) -> None:
         error.item.modify(error)
@@ -111,4 +246,23 @@ class CheckItemGroup(object):
         return any(result.is_error for result in self.results())
 
     def has_modifiables(self) -> bool:
-        return any(result.is_modifiable for result in self.results())
\ No newline at end of file
+        return any(result.is_modifiable for result in self.results())
+
+
+def _analyze_item(item: _items.CheckItem, data: object) -> tuple[abc.Sequence[_items.CheckResult], float]:
+    start = time.perf_counter()
+    results = item.analyze(data)
+    return results, time.perf_counter() - start
+
+
+def _to_mobjects(node_names: abc.Iterable[str]) -> list[_om2.MObject]:
+    # 削除済みのノードやコンポーネント表記も混ざりうるので、解決できたものだけを返す
+    result = []
+    for node_name in set(node_names):
+        sel = _om2.MSelectionList()
+        try:
+            sel.add(node_name)
+            result.append(sel.getDependNode(0))
+        except RuntimeError:
+            pass
+    return result
@@ -1,15 +1,29 @@
 import collections.abc
-import abc
 import enum
 import math
 
+from . import context as _context
+
 
 class CheckItem(object):
+    u"""
+    チェック項目
+      サブクラスは _extract() と _analyze() の組か、_execute() のどちらかを実装する
+      _read_only = True の項目は必ず _extract() と _analyze() を実装すること（_execute() は呼ばれない）
+      _execute() を実装しなかった場合は、_extract() の戻り値を _analyze() に渡して実行する
+    """
 
     _label = ''
     _category = ''
     _description = ''
     _eps = 1e-4
+    # True にすると副作用のない項目として扱い、_extract() をメインスレッドで、_analyze() をワーカーで実行する
+    _read_only = False
+    # 結果がこれらのタイプのノード（と結果の dependencies）にしか依存しないことを宣言する
+    # （空なら、インクリメンタル実行のたびに必ず再実行する）
+    _watch_types: tuple[str, ...] = ()
+
+    __context: _context.SceneContext|None = None
 
     @staticmethod
     def find_from_module(module) -> collections.abc.Sequence['CheckItem']:
@@ -32,33 +46,85 @@ class CheckItem(object):
     def description(self) -> str:
         return self.__class__._description
 
+    @property
+    def is_read_only(self) -> bool:
+        return self.__class__._read_only
+
+    @property
+    def watch_types(self) -> tuple[str, ...]:
+        return self.__class__._watch_types
+
+    @property
+    def context(self) -> _context.SceneContext:
+        if self.__context is None:
+            self.__context = _context.SceneContext()
+        return self.__context
+
     def __str__(self) -> str:
         return f'[{self.category}][{self.label}] {self.description}'
 
-    def execute(self) -> collections.abc.Sequence['CheckResult']:
+    def __getstate__(self) -> dict[str, object]:
+        # 別プロセスに渡す時に、Maya のオブジェクトを抱えたコンテキストは持っていかない
+        state = self.__dict__.copy()
+        state.pop('_CheckItem__context', None)
+        return state
+
+    def execute(self, context: _context.SceneContext|None = None) -> collections.abc.Sequence['CheckResult']:
+        if self.is_read_only:
+            return self.analyze(self.extract(context))
+
+        self.__context = context or _context.SceneContext()
         self.__results: list[CheckResult] = []
         self._execute()
         return self.__results or [CheckResult.success(self)]
 
+    def extract(self, context: _context.SceneContext|None = None) -> object:
+        self.__context = context or _context.SceneContext()
+        return self._extract()
+
+    def analyze(self, data: object) -> collections.abc.Sequence['CheckResult']:
+        self.__results: list[CheckResult] = []
+        self._analyze(data)
+        return self.__results or [CheckResult.success(self)]
+
     def modify(self, error: 'CheckResult') -> None:
         self._modify(error)
 
-    @abc.abstractmethod
     def _execute(self) -> None:
-        raise NotImplementedError()
+        self._analyze(self._extract())
 
     def _modify(self, error: 'CheckResult') -> None:
         pass
 
-    def append_warning(self, nodes: str | list[str] | None, message: str, modifiable: bool = False):
+    def _extract(self) -> object:
+        # シーンから必要なデータを抜き出す（メインスレッドで実行される）
+        raise NotImplementedError(f'{self.__class__.__name__} must implement _extract() and _analyze(), or _execute()')
+
+    def _analyze(self, data: object) -> None:
+        # _extract() の戻り値を解析して append_warning/append_error する（Maya API を呼んではいけない）
+        raise NotImplementedError(f'{self.__class__.__name__} must implement _analyze()')
+
+    def append_warning(
+            self,
+            nodes: str | list[str] | None,
+            message: str,
+            modifiable: bool = False,
+            dependencies: list[str] | None = None
+    ):
         if nodes is not None:
             nodes = [nodes] if isinstance(nodes, str) else nodes
-        self.__results.append(CheckResult.warning(self, message, modifiable, nodes))
-
-    def append_error(self, nodes: str | list[str] | None, message: str, modifiable: bool = False):
+        self.__results.append(CheckResult.warning(self, message, modifiable, nodes, dependencies))
+
+    def append_error(
+            self,
+            nodes: str | list[str] | None,
+            message: str,
+            modifiable: bool = False,
+            dependencies: list[str] | None = None
+    ):
         if nodes is not None:
             nodes = [nodes] if isinstance(nodes, str) else nodes
-        self.__results.append(CheckResult.error(self, message, modifiable, nodes))
+        self.__results.append(CheckResult.error(self, message, modifiable, nodes, dependencies))
 
     def float_equals(self, lhs: float, rhs: float) -> bool:
         return math.fabs(lhs - rhs) < self.__class__._eps
@@ -87,18 +153,30 @@ class CheckResult(object):
         return CheckResult(item, CheckResultStatus.SUCCESS, '', [])
 
     @staticmethod
-    def warning(item: CheckItem, message: str, modifiable: bool, nodes: list[str] | None = None) -> 'CheckResult':
+    def warning(
+            item: CheckItem,
+            message: str,
+            modifiable: bool,
+            nodes: list[str] | None = None,
+            dependencies: list[str] | None = None
+    ) -> 'CheckResult':
         status = CheckResultStatus.WARNING
         if modifiable:
             status |= CheckResultStatus.MODIFIABLE
-        return CheckResult(item, status, message, nodes or [])
+        return CheckResult(item, status, message, nodes or [], dependencies)
 
     @staticmethod
-    def error(item: CheckItem, message: str, modifiable: bool, nodes: list[str] | None = None) -> 'CheckResult':
+    def error(
+            item: CheckItem,
+            message: str,
+            modifiable: bool,
+            nodes: list[str] | None = None,
+            dependencies: list[str] | None = None
+    ) -> 'CheckResult':
         status = CheckResultStatus.ERROR
         if modifiable:
             status |= CheckResultStatus.MODIFIABLE
-        return CheckResult(item, status, message, nodes or [])
+        return CheckResult(item, status, message, nodes or [], dependencies)
 
     @property
     def item(self) -> CheckItem:
@@ -116,6 +194,14 @@ class CheckResult(object):
     def nodes(self) -> list[str]:
         return self.__nodes
 
+    @property
+    def dependencies(self) -> list[str]:
+        u"""
+        この結果が依存しているノード。これらが変更されたらインクリメンタル実行で再チェックされる
+          指定されなければ nodes と同じ
+        """
+        return self.__dependencies
+
     @property
     def is_success(self) -> bool:
         return self.status == CheckResultStatus.SUCCESS
@@ -132,11 +218,23 @@ class CheckResult(object):
     def is_modifiable(self) -> bool:
         return self.status & CheckResultStatus.MODIFIABLE == CheckResultStatus.MODIFIABLE
 
-    def __init__(self, item: CheckItem, status: CheckResultStatus, message: str, nodes: list[str]):
+    def __init__(
+            self,
+            item: CheckItem,
+            status: CheckResultStatus,
+            message: str,
+            nodes: list[str],
+            dependencies: list[str] | None = None
+    ):
         self.__item = item
         self.__status = status
         self.__message = message
         self.__nodes = nodes
+        self.__dependencies = dependencies if dependencies is not None else nodes
 
     def __str__(self) -> str:
         return f'[{self.item.category}][{self.item.label}] {self.status} {self.message}'
+
+    def _bind(self, item: CheckItem) -> None:
+        # 別プロセスで解析した結果は CheckItem のコピーを指しているので、元の CheckItem に付け替える
+        self.__item = item
@@ -0,0 +1,349 @@
+u"""
+チェック結果の書き出しと読み込み
+
+  JSON Lines (.jsonl) と、列ごとにまとめたバイナリ (.qcr) の 2 形式に対応する
+  どちらもノード名やチェック項目はテーブルに登録して ID で参照する
+  結果は届いた順に追記するので、実行中に書き出してもメモリに溜め込まない
+"""
+import abc
+import array
+import collections
+import collections.abc
+import io
+import json
+import struct
+import sys
+
+from . import groups as _groups
+from . import items as _items
+
+
+FORMAT_NAME = 'qymel.scene_checker.results'
+FORMAT_VERSION = 1
+
+_BINARY_MAGIC = b'QYCR'
+_BLOCK_STRINGS = 1
+_BLOCK_ITEMS = 2
+_BLOCK_RESULTS = 3
+
+
+ResultRecord = collections.namedtuple('ResultRecord', ['group', 'category', 'label', 'status', 'message', 'nodes'])
+
+
+class ResultWriter(object):
+    u"""
+    チェック結果を書き出す基底クラス
+      CheckItemGroup.add_listener(writer.write) のようにつなぐと、実行しながら書き出せる
+    """
+
+    def __init__(self, stream: io.IOBase, owns_stream: bool = False):
+        self._stream = stream
+        self.__owns_stream = owns_stream
+        self.__item_ids: dict[tuple[str, str, str], int] = {}
+        self.__node_ids: dict[str, int] = {}
+
+    def __enter__(self) -> 'ResultWriter':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def write(self, group_label: str, results: collections.abc.Iterable[_items.CheckResult]) -> None:
+        for result in results:
+            item = result.item
+            item_id = self.__intern_item(group_label, item.category, item.label)
+            node_ids = [self.__intern_node(node) for node in result.nodes]
+            self._write_result(item_id, result.status.value, result.message, node_ids)
+
+    def flush(self) -> None:
+        self._stream.flush()
+
+    def close(self) -> None:
+        self.flush()
+        if self.__owns_stream:
+            self._stream.close()
+
+    @abc.abstractmethod
+    def _write_item(self, item_id: int, group_label: str, category: str, label: str) -> None:
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    def _write_node(self, node_id: int, node_name: str) -> None:
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    def _write_result(self, item_id: int, status: int, message: str, node_ids: list[int]) -> None:
+        raise NotImplementedError()
+
+    def __intern_item(self, group_label: str, category: str, label: str) -> int:
+        key = (group_label, category, label)
+        item_id = self.__item_ids.get(key, None)
+        if item_id is None:
+            item_id = len(self.__item_ids)
+            self.__item_ids[key] = item_id
+            self._write_item(item_id, group_label, category, label)
+        return item_id
+
+    def __intern_node(self, node_name: str) -> int:
+        node_id = self.__node_ids.get(node_name, None)
+        if node_id is None:
+            node_id = len(self.__node_ids)
+            self.__node_ids[node_name] = node_id
+            self._write_node(node_id, node_name)
+        return node_id
+
+
+class JsonLinesResultWriter(ResultWriter):
+
+    def __init__(self, stream: io.TextIOBase, owns_stream: bool = False):
+        super().__init__(stream, owns_stream)
+        self.__write_line({'type': 'header', 'format': FORMAT_NAME, 'version': FORMAT_VERSION})
+
+    def _write_item(self, item_id: int, group_label: str, category: str, label: str) -> None:
+        self.__write_line({'type': 'item', 'id': item_id, 'group': group_label, 'category': category, 'label': label})
+
+    def _write_node(self, node_id: int, node_name: str) -> None:
+        self.__write_line({'type': 'node', 'id': node_id, 'name': node_name})
+
+    def _write_result(self, item_id: int, status: int, message: str, node_ids: list[int]) -> None:
+        self.__write_line({'type': 'result', 'item': item_id, 'status': status, 'message': message, 'nodes': node_ids})
+
+    def __write_line(self, obj: dict[str, object]) -> None:
+        self._stream.write(json.dumps(obj, ensure_ascii=False, separators=(',', ':')) + '\n')
+
+
+class BinaryResultWriter(ResultWriter):
+    u"""
+    chunk_size 件ずつ、項目ID・ステータス・メッセージID・ノードIDをそれぞれ連続した配列にして書き出す
+      文字列（メッセージ、ノード名、項目名）は文字列テーブルに一度だけ書く
+    """
+
+    def __init__(self, stream: io.BufferedIOBase, owns_stream: bool = False, chunk_size: int = 4096):
+        super().__init__(stream, owns_stream)
+        self.__chunk_size = chunk_size
+        self.__string_ids: dict[str, int] = {}
+        self.__pending_strings: list[str] = []
+        self.__pending_items: list[tuple[int, int, int]] = []
+        self.__rows = _ResultColumns()
+        stream.write(_BINARY_MAGIC + struct.pack('<H', FORMAT_VERSION))
+
+    def flush(self) -> None:
+        self.__flush_rows()
+        super().flush()
+
+    def _write_item(self, item_id: int, group_label: str, category: str, label: str) -> None:
+        self.__pending_items.append((self.__intern(group_label), self.__intern(category), self.__intern(label)))
+
+    def _write_node(self, node_id: int, node_name: str) -> None:
+        # ノード名も文字列テーブルに入れるので、ノードIDは文字列IDと同じにならない点に注意
+        self.__rows.node_names.append(self.__intern(node_name))
+
+    def _write_result(self, item_id: int, status: int, message: str, node_ids: list[int]) -> None:
+        rows = self.__rows
+        rows.item_ids.append(item_id)
+        rows.statuses.append(status)
+        rows.message_ids.append(self.__intern(message))
+        rows.node_counts.append(len(node_ids))
+        rows.node_ids.extend(rows.node_names[node_id] for node_id in node_ids)
+        if len(rows.item_ids) >= self.__chunk_size:
+            self.__flush_rows()
+
+    def __intern(self, value: str) -> int:
+        string_id = self.__string_ids.get(value, None)
+        if string_id is None:
+            string_id = len(self.__string_ids)
+            self.__string_ids[value] = string_id
+            self.__pending_strings.append(value)
+        return string_id
+
+    def __flush_rows(self) -> None:
+        if len(self.__pending_strings) > 0:
+            payload = bytearray(struct.pack('<I', len(self.__pending_strings)))
+            for value in self.__pending_strings:
+                data = value.encode('utf-8')
+                payload += struct.pack('<I', len(data)) + data
+            self.__write_block(_BLOCK_STRINGS, payload)
+            self.__pending_strings = []
+
+        if len(self.__pending_items) > 0:
+            payload = bytearray(struct.pack('<I', len(self.__pending_items)))
+            for ids in self.__pending_items:
+                payload += struct.pack('<III', *ids)
+            self.__write_block(_BLOCK_ITEMS, payload)
+            self.__pending_items = []
+
+        rows = self.__rows
+        if len(rows.item_ids) > 0:
+            payload = bytearray(struct.pack('<I', len(rows.item_ids)))
+            for column in (rows.item_ids, rows.statuses, rows.message_ids, rows.node_counts, rows.node_ids):
+                payload += _to_little_endian(column)
+            self.__write_block(_BLOCK_RESULTS, payload)
+            rows.clear()
+
+    def __write_block(self, kind: int, payload: bytes|bytearray) -> None:
+        self._stream.write(struct.pack('<BI', kind, len(payload)))
+        self._stream.write(payload)
+
+
+class _ResultColumns(object):
+
+    def __init__(self):
+        # node_names はノードID → 文字列IDの表で、チャンクをまたいで使う
+        self.node_names = array.array('I')
+        self.item_ids = array.array('I')
+        self.statuses = array.array('I')
+        self.message_ids = array.array('I')
+        self.node_counts = array.array('I')
+        self.node_ids = array.array('I')
+
+    def clear(self) -> None:
+        for column in (self.item_ids, self.statuses, self.message_ids, self.node_counts, self.node_ids):
+            del column[:]
+
+
+def open_writer(file_path: str) -> ResultWriter:
+    u"""
+    拡張子が .jsonl なら JSON Lines、それ以外ならバイナリで書き出す
+    """
+    if file_path.endswith('.jsonl'):
+        return JsonLinesResultWriter(open(file_path, 'w', encoding='utf-8'), owns_stream=True)
+    return BinaryResultWriter(open(file_path, 'wb'), owns_stream=True)
+
+
+def read_records(file_path: str) -> collections.abc.Iterator[ResultRecord]:
+    u"""
+    書き出した結果を 1 件ずつ読み込む（ファイル全体をメモリに載せない）
+    """
+    with open(file_path, 'rb') as f:
+        head = f.read(len(_BINARY_MAGIC))
+        f.seek(0)
+        if head == _BINARY_MAGIC:
+            yield from _read_binary(f)
+        else:
+            yield from _read_json_lines(io.TextIOWrapper(f, encoding='utf-8'))
+
+
+def load_results(file_path: str, groups: collections.abc.Iterable[_groups.CheckItemGroup]) -> int:
+    u"""
+    書き出した結果を、ラベル・カテゴリ・項目名が一致する CheckItemGroup の項目に結果として復元する
+      再実行せずに CheckerWindow で表示するためのもの。復元した結果の件数を返す
+    """
+    items: dict[tuple[str, str, str], tuple[_groups.CheckItemGroup, _items.CheckItem]] = {}
+    for group in groups:
+        group.clear_results()
+        for item in group.items():
+            items[(group.label, item.category, item.label)] = (group, item)
+
+    results: dict[tuple[str, str, str], list[_items.CheckResult]] = {}
+    for record in read_records(file_path):
+        key = (record.group, record.category, record.label)
+        if key not in items:
+            continue
+        _, item = items[key]
+        status = _items.CheckResultStatus(record.status)
+        results.setdefault(key, []).append(_items.CheckResult(item, status, record.message, list(record.nodes)))
+
+    for key, item_results in results.items():
+        group, item = items[key]
+        group.set_results(item, item_results)
+
+    return sum(len(item_results) for item_results in results.values())
+
+
+def diff_records(
+        lhs: collections.abc.Iterable[ResultRecord],
+        rhs: collections.abc.Iterable[ResultRecord]
+) -> tuple[list[ResultRecord], list[ResultRecord]]:
+    u"""
+    2 回の実行結果を比べて、rhs で増えた結果と無くなった結果を返す
+    """
+    lhs_counts = collections.Counter(lhs)
+    rhs_counts = collections.Counter(rhs)
+    return list((rhs_counts - lhs_counts).elements()), list((lhs_counts - rhs_counts).elements())
+
+
+def _read_json_lines(stream: io.TextIOBase) -> collections.abc.Iterator[ResultRecord]:
+    items: dict[int, tuple[str, str, str]] = {}
+    nodes: dict[int, str] = {}
+    for line in stream:
+        if not line.strip():
+            continue
+        obj = json.loads(line)
+        kind = obj['type']
+        if kind == 'result':
+            group, category, label = items[obj['item']]
+            node_names = tuple(nodes[node_id] for node_id in obj['nodes'])
+            yield ResultRecord(group, category, label, obj['status'], obj['message'], node_names)
+        elif kind == 'node':
+            nodes[obj['id']] = obj['name']
+        elif kind == 'item':
+            items[obj['id']] = (obj['group'], obj['category'], obj['label'])
+        elif kind == 'header':
+            _check_version(obj['version'])
+
+
+def _read_binary(stream: io.BufferedIOBase) -> collections.abc.Iterator[ResultRecord]:
+    stream.read(len(_BINARY_MAGIC))
+    _check_version(struct.unpack('<H', stream.read(2))[0])
+
+    strings: list[str] = []
+    items: list[tuple[str, str, str]] = []
+
+    while True:
+        header = stream.read(5)
+        if len(header) < 5:
+            break
+        kind, length = struct.unpack('<BI', header)
+        payload = memoryview(stream.read(length))
+        count = struct.unpack_from('<I', payload)[0]
+        offset = 4
+
+        if kind == _BLOCK_STRINGS:
+            for _ in range(count):
+                size = struct.unpack_from('<I', payload, offset)[0]
+                offset += 4
+                strings.append(bytes(payload[offset:offset + size]).decode('utf-8'))
+                offset += size
+
+        elif kind == _BLOCK_ITEMS:
+            for _ in range(count):
+                group_id, category_id, label_id = struct.unpack_from('<III', payload, offset)
+                offset += 12
+                items.append((strings[group_id], strings[category_id], strings[label_id]))
+
+        elif kind == _BLOCK_RESULTS:
+            columns = []
+            for _ in range(4):
+                columns.append(_from_little_endian(payload[offset:offset + count * 4]))
+                offset += count * 4
+            item_ids, statuses, message_ids, node_counts = columns
+            node_ids = _from_little_endian(payload[offset:])
+
+            node_offset = 0
+            for i in range(count):
+                group, category, label = items[item_ids[i]]
+                node_end = node_offset + node_counts[i]
+                node_names = tuple(strings[node_id] for node_id in node_ids[node_offset:node_end])
+                node_offset = node_end
+                yield ResultRecord(group, category, label, statuses[i], strings[message_ids[i]], node_names)
+
+
+def _check_version(version: int) -> None:
+    if version > FORMAT_VERSION:
+        raise ValueError(f'unsupported result format version: {version}')
+
+
+def _to_little_endian(column: array.array) -> bytes:
+    if sys.byteorder == 'little':
+        return column.tobytes()
+    swapped = array.array(column.typecode, column)
+    swapped.byteswap()
+    return swapped.tobytes()
+
+
+def _from_little_endian(data: memoryview) -> array.array:
+    column = array.array('I')
+    column.frombytes(bytes(data))
+    if sys.byteorder != 'little':
+        column.byteswap()
+    return column
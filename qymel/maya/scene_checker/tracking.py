@@ -0,0 +1,116 @@
+import collections.abc as abc
+
+import maya.api.OpenMaya as _om2
+
+
+# 呼び出し回数が極端に多くなる可能性のある静的メソッドをキャッシュ化しておく
+_om2_MObjectHandle = _om2.MObjectHandle
+
+
+class DirtyNodeTracker(object):
+    u"""
+    MMessage のコールバックで、変更のあったノードを記録しておく
+      変更ごとに通し番号を振るので、複数のグループがそれぞれ前回の実行以降の変更だけを取り出せる
+      アトリビュート変更はノード単位のコールバックなので、watch() したノードだけが対象になる
+      （名前の変更はシーン全体で 1 つのコールバックで拾う）
+    """
+
+    @property
+    def serial(self) -> int:
+        return self.__serial
+
+    @property
+    def is_tracking(self) -> bool:
+        return len(self.__callback_ids) > 0
+
+    def __init__(self) -> None:
+        self.__serial = 0
+        self.__entries: dict[int, tuple[int, str]] = {}
+        self.__callback_ids: list[int] = []
+        self.__node_callback_ids: dict[int, int] = {}
+
+    def start(self) -> None:
+        if self.is_tracking:
+            return
+        self.__callback_ids = [
+            _om2.MDGMessage.addNodeAddedCallback(self.__on_node_added, 'dependNode'),
+            _om2.MDGMessage.addNodeRemovedCallback(self.__on_node_removed, 'dependNode'),
+            _om2.MDGMessage.addConnectionCallback(self.__on_connection_changed),
+            _om2.MDagMessage.addAllDagChangesCallback(self.__on_dag_changed),
+            _om2.MNodeMessage.addNameChangedCallback(_om2.MObject.kNullObj, self.__on_name_changed),
+        ]
+
+    def stop(self) -> None:
+        if not self.is_tracking:
+            return
+        _om2.MMessage.removeCallbacks(self.__callback_ids)
+        self.__callback_ids = []
+        if len(self.__node_callback_ids) > 0:
+            _om2.MMessage.removeCallbacks(list(self.__node_callback_ids.values()))
+        self.__node_callback_ids.clear()
+
+    def watch(self, mobjs: abc.Iterable[_om2.MObject]) -> None:
+        u"""
+        アトリビュートの変更を監視するノードを追加する
+        """
+        for mobj in mobjs:
+            hash_code = _om2_MObjectHandle(mobj).hashCode()
+            if hash_code in self.__node_callback_ids:
+                continue
+            self.__node_callback_ids[hash_code] = _om2.MNodeMessage.addAttributeChangedCallback(
+                mobj, self.__on_attribute_changed)
+
+    def clear(self) -> None:
+        self.__entries.clear()
+
+    def discard(self, serial: int) -> None:
+        u"""
+        serial 以前の変更を捨てる（全員が取り出し終わった変更を溜め込まないため）
+        """
+        self.__entries = {
+            hash_code: entry for hash_code, entry in self.__entries.items() if entry[0] > serial
+        }
+
+    def changes_since(self, serial: int) -> tuple[set[int], set[str]]:
+        u"""
+        serial より後に変更されたノードの MObjectHandle.hashCode() とノードタイプ名を返す
+        """
+        hash_codes = set()
+        type_names = set()
+        for hash_code, (entry_serial, type_name) in self.__entries.items():
+            if entry_serial > serial:
+                hash_codes.add(hash_code)
+                type_names.add(type_name)
+        return hash_codes, type_names
+
+    def __mark(self, mobj: _om2.MObject) -> None:
+        if mobj.isNull():
+            return
+        self.__serial += 1
+        hash_code = _om2_MObjectHandle(mobj).hashCode()
+        self.__entries[hash_code] = (self.__serial, _om2.MFnDependencyNode(mobj).typeName)
+
+    def __on_node_added(self, mobj: _om2.MObject, *_) -> None:
+        self.__mark(mobj)
+
+    def __on_node_removed(self, mobj: _om2.MObject, *_) -> None:
+        self.__mark(mobj)
+        callback_id = self.__node_callback_ids.pop(_om2_MObjectHandle(mobj).hashCode(), None)
+        if callback_id is not None:
+            _om2.MMessage.removeCallback(callback_id)
+
+    def __on_connection_changed(self, src_mplug: _om2.MPlug, dst_mplug: _om2.MPlug, *_) -> None:
+        self.__mark(src_mplug.node())
+        self.__mark(dst_mplug.node())
+
+    def __on_dag_changed(self, _, child: _om2.MDagPath, parent: _om2.MDagPath, *__) -> None:
+        if child.isValid():
+            self.__mark(child.node())
+        if parent.isValid():
+            self.__mark(parent.node())
+
+    def __on_attribute_changed(self, _, mplug: _om2.MPlug, *__) -> None:
+        self.__mark(mplug.node())
+
+    def __on_name_changed(self, mobj: _om2.MObject, *_) -> None:
+        self.__mark(mobj)
@@ -32,6 +32,17 @@ class CheckerWindow(_app.MainWindowBase):
     def close_on_success(self, value: bool):
         self.__close_on_success = value
 
+    @property
+    def incremental(self) -> bool:
+        return self.__incremental
+
+    @incremental.setter
+    def incremental(self, value: bool):
+        # 有効にすると、再実行時は前回から変更のあったノードに関係する項目だけをチェックする
+        self.__incremental = value
+        if not value:
+            self.checker.stop_tracking()
+
     def __init__(self, checker: _checker.Checker, parent: QObject = None):
         super().__init__(parent=parent)
         self._checker = checker
@@ -52,6 +63,7 @@ class CheckerWindow(_app.MainWindowBase):
         self._controls.modify_all_requested.connect(self.__modify_all)
 
         self.__close_on_success = False
+        self.__incremental = False
 
     def _setup_ui(self, central_widget: QWidget):
         self.setWindowTitle('QyMEL Maya Scene Checker')
@@ -77,7 +89,8 @@ class CheckerWindow(_app.MainWindowBase):
         self.reload()
 
     def _shutdown_ui(self):
-        pass
+        if self.__incremental:
+            self.checker.stop_tracking()
 
     def _serialize(self, settings: QSettings):
         settings.setValue('split', self._main_splitter.sizes())
@@ -126,7 +139,10 @@ class CheckerWindow(_app.MainWindowBase):
     @_ui_scopes.wait_cursor_scope
     def execute_all(self):
         group = self._groups.selected_group
-        group.execute_all()
+        if self.__incremental:
+            self.checker.execute_incremental(group)
+        else:
+            group.execute_all()
         self._items.load_results()
         self._controls.load_from(group.results())
         self.__reload_description(None)
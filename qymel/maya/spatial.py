@@ -0,0 +1,590 @@
+import collections.abc as abc
+
+import maya.api.OpenMaya as _om2
+import numpy as _np
+
+from . import nodetypes as _nodetypes
+from .internal import graphs as _graphs
+from .internal import kdtree_impl as _kdtree_impl
+
+
+# 呼び出し回数が極端に多くなる可能性のある静的メソッドをキャッシュ化しておく
+_om2_MObjectHandle = _om2.MObjectHandle
+_om2_MDagPath = _om2.MDagPath
+_om2_MFnDependencyNode = _om2.MFnDependencyNode
+_om2_MFnMatrixData = _om2.MFnMatrixData
+_om2_MFn_kTransform = _om2.MFn.kTransform
+_om2_MItDependencyGraph = _om2.MItDependencyGraph
+
+# これらのノードがヒストリの上流にあるノードは、時間の変更で値が変わる
+_TIME_SOURCE_TYPES = frozenset([
+    _om2.MFn.kTime,
+    _om2.MFn.kExpression,
+    _om2.MFn.kAnimCurveTimeToAngular,
+    _om2.MFn.kAnimCurveTimeToDistance,
+    _om2.MFn.kAnimCurveTimeToTime,
+    _om2.MFn.kAnimCurveTimeToUnitless,
+])
+
+_IDENTITY = _np.identity(4, dtype=_np.float64)
+_IDENTITY.flags.writeable = False
+
+
+class WorldMatrixCache(object):
+    u"""
+    DAG パスごとのワールド行列のキャッシュ
+      ワールド行列は親のワールド行列にローカル行列（matrix と offsetParentMatrix アトリビュート）を掛けて、上から順に組み立てる
+      inheritsTransform がオフのノードは親のワールド行列を掛けない
+      キャッシュしたノードのアトリビュートが変わると、そのノード以下のエントリを捨てる
+      時間の変更があった場合は、ヒストリの上流にアニメーションカーブなどがあるノード以下のエントリだけを捨てる
+      DAG の組み換えがあった場合は全エントリを捨てる
+      コンストレイントなど、他のノードの変更で間接的に動く場合は検知できないので invalidate() を呼ぶこと
+    add_listener() で登録した関数は、エントリを捨てるたびに捨てたキー（全エントリの場合は None）を受け取る
+    使い終わったら close() でコールバックを外すこと（with 文でも使える）
+    """
+
+    @property
+    def size(self) -> int:
+        return len(self.__matrices)
+
+    def __init__(self) -> None:
+        # キーは MDagPath.fullPathName()（インスタンスごとに別のエントリになる）
+        self.__matrices: dict[str, _np.ndarray] = {}
+        self.__children: dict[str, set[str]] = {}
+        self.__node_paths: dict[int, set[str]] = {}
+        self.__time_dependent: set[int] = set()
+        self.__node_callback_ids: dict[int, int] = {}
+        self.__callback_ids: list[int] = []
+        self.__listeners: list[abc.Callable[[set[str]|None], None]] = []
+
+    def __enter__(self) -> 'WorldMatrixCache':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.clear()
+        if len(self.__callback_ids) > 0:
+            _om2.MMessage.removeCallbacks(self.__callback_ids)
+            self.__callback_ids = []
+
+    def clear(self) -> None:
+        self.__matrices.clear()
+        self.__children.clear()
+        self.__node_paths.clear()
+        self.__time_dependent.clear()
+        if len(self.__node_callback_ids) > 0:
+            _om2.MMessage.removeCallbacks(list(self.__node_callback_ids.values()))
+            self.__node_callback_ids.clear()
+        self.__notify(None)
+
+    def invalidate(self, node: _nodetypes.DagNode) -> None:
+        self.__notify(self.__invalidate_path(node.mdagpath.fullPathName()))
+
+    def add_listener(self, listener: abc.Callable[[set[str]|None], None]) -> None:
+        self.__listeners.append(listener)
+
+    def remove_listener(self, listener: abc.Callable[[set[str]|None], None]) -> None:
+        if listener in self.__listeners:
+            self.__listeners.remove(listener)
+
+    def world_matrix(self, node: _nodetypes.DagNode) -> _om2.MMatrix:
+        return _om2.MMatrix(self.world_matrix_array(node).ravel().tolist())
+
+    def world_matrix_array(self, node: _nodetypes.DagNode) -> _np.ndarray:
+        u"""
+        ワールド行列を (4, 4) の配列で返す（キャッシュそのものなので書き換えないこと）
+        """
+        return self.__get(node.mdagpath)
+
+    def world_matrices(self, nodes: abc.Iterable[_nodetypes.DagNode]) -> _np.ndarray:
+        u"""
+        ワールド行列を (ノード数, 4, 4) の配列で返す
+        """
+        matrices = [self.__get(node.mdagpath) for node in nodes]
+        if len(matrices) == 0:
+            return _np.zeros((0, 4, 4), dtype=_np.float64)
+        return _np.stack(matrices)
+
+    def __get(self, mdagpath: _om2.MDagPath) -> _np.ndarray:
+        key = mdagpath.fullPathName()
+        matrix = self.__matrices.get(key, None)
+        if matrix is not None:
+            return matrix
+
+        if len(self.__callback_ids) == 0:
+            self.__callback_ids = [
+                _om2.MDagMessage.addAllDagChangesCallback(self.__on_changed),
+                _om2.MDGMessage.addTimeChangeCallback(self.__on_time_changed),
+            ]
+
+        mobj = mdagpath.node()
+        if not mobj.hasFn(_om2_MFn_kTransform):
+            # シェイプなどはローカル行列を持たない
+            matrix = self.__parent_matrix(mdagpath, key)
+        else:
+            # ワールド行列 = matrix * offsetParentMatrix * 親のワールド行列
+            #   inheritsTransform がオフの場合は親のワールド行列を掛けない
+            #   どちらのアトリビュートの変更も __watch のコールバックで検知する
+            mfn_node = _om2_MFnDependencyNode(mobj)
+            matrix = _plug_matrix(mfn_node, 'matrix')
+            if mfn_node.hasAttribute('offsetParentMatrix'):
+                matrix = matrix @ _plug_matrix(mfn_node, 'offsetParentMatrix')
+            if mfn_node.findPlug('inheritsTransform', False).asBool():
+                matrix = matrix @ self.__parent_matrix(mdagpath, key)
+            self.__watch(mobj, key)
+
+        matrix.flags.writeable = False
+        self.__matrices[key] = matrix
+        return matrix
+
+    def __parent_matrix(self, mdagpath: _om2.MDagPath, key: str) -> _np.ndarray:
+        # 親から順に組み立てる。親のエントリがあればそこから先は計算しない
+        parent_path = _om2_MDagPath(mdagpath)
+        parent_path.pop()
+        if parent_path.length() == 0:
+            return _IDENTITY
+        self.__children.setdefault(parent_path.fullPathName(), set()).add(key)
+        return self.__get(parent_path)
+
+    def __watch(self, mobj: _om2.MObject, key: str) -> None:
+        hash_code = _om2_MObjectHandle(mobj).hashCode()
+        self.__node_paths.setdefault(hash_code, set()).add(key)
+        if hash_code not in self.__node_callback_ids:
+            self.__node_callback_ids[hash_code] = _om2.MNodeMessage.addAttributeChangedCallback(
+                mobj, self.__on_attribute_changed
+            )
+            if _is_time_dependent(mobj):
+                self.__time_dependent.add(hash_code)
+
+    def __invalidate_path(self, key: str) -> set[str]:
+        invalidated = set()
+        stack = [key]
+        while len(stack) > 0:
+            current = stack.pop()
+            if self.__matrices.pop(current, None) is not None:
+                invalidated.add(current)
+            stack.extend(self.__children.pop(current, ()))
+        return invalidated
+
+    def __invalidate_nodes(self, hash_codes: abc.Iterable[int]) -> None:
+        invalidated = set()
+        for hash_code in hash_codes:
+            for key in list(self.__node_paths.get(hash_code, ())):
+                invalidated.update(self.__invalidate_path(key))
+        self.__notify(invalidated)
+
+    def __notify(self, keys: set[str]|None) -> None:
+        if keys is not None and len(keys) == 0:
+            return
+        for listener in list(self.__listeners):
+            listener(keys)
+
+    def __on_changed(self, *_) -> None:
+        self.clear()
+
+    def __on_time_changed(self, *_) -> None:
+        self.__invalidate_nodes(self.__time_dependent)
+
+    def __on_attribute_changed(self, msg: int, mplug: _om2.MPlug, *_) -> None:
+        if not msg & (
+                _om2.MNodeMessage.kAttributeSet
+                | _om2.MNodeMessage.kConnectionMade
+                | _om2.MNodeMessage.kConnectionBroken
+        ):
+            return
+        self.__invalidate_nodes([_om2_MObjectHandle(mplug.node()).hashCode()])
+
+
+def _is_time_dependent(mobj: _om2.MObject) -> bool:
+    u"""
+    ヒストリの上流に time ノードや、時間を入力とするアニメーションカーブ、エクスプレッションがあるか
+    """
+    ite = _om2_MItDependencyGraph(
+        mobj,
+        _om2.MFn.kInvalid,
+        _om2_MItDependencyGraph.kUpstream,
+        _om2_MItDependencyGraph.kDepthFirst,
+        _om2_MItDependencyGraph.kNodeLevel
+    )
+    while not ite.isDone():
+        if ite.currentNode().apiType() in _TIME_SOURCE_TYPES:
+            return True
+        ite.next()
+    return False
+
+
+def _plug_matrix(mfn_node: _om2.MFnDependencyNode, name: str) -> _np.ndarray:
+    return _to_array(_om2_MFnMatrixData(mfn_node.findPlug(name, False).asMObject()).matrix())
+
+
+def _to_array(mmatrix: _om2.MMatrix) -> _np.ndarray:
+    return _np.array(mmatrix, dtype=_np.float64).reshape(4, 4)
+
+
+class PointIndex(object):
+    u"""
+    点群の KD 木。クエリはすべて複数点をまとめて受け取り、NumPy 配列で返す
+    """
+
+    @property
+    def points(self) -> _np.ndarray:
+        return self.__tree.points
+
+    def __init__(self, points: _np.ndarray, leaf_size: int = 32) -> None:
+        self.__tree = _kdtree_impl.build(points, leaf_size)
+
+    def __len__(self) -> int:
+        return len(self.__tree.points)
+
+    def nearest(self, points: _np.ndarray|abc.Sequence[abc.Sequence[float]]) -> tuple[_np.ndarray, _np.ndarray]:
+        u"""
+        各点に最も近い点の (インデックス, 距離) を返す
+        """
+        return _kdtree_impl.nearest(self.__tree, _np.asarray(points, dtype=_np.float64))
+
+    def within_radius(
+            self,
+            points: _np.ndarray|abc.Sequence[abc.Sequence[float]],
+            radius: float
+    ) -> list[_np.ndarray]:
+        u"""
+        各点から radius 以内にある点のインデックスを返す
+        """
+        return _kdtree_impl.within_radius(self.__tree, _np.asarray(points, dtype=_np.float64), radius)
+
+    def mirror_map(self, axis: int = 0, tolerance: float = 1e-4) -> _np.ndarray:
+        u"""
+        axis 軸（0:x, 1:y, 2:z）で反転した位置にある点のインデックスを返す。見つからない点は -1
+        """
+        mirrored = self.__tree.points.copy()
+        mirrored[:, axis] *= -1.0
+        ids, distances = _kdtree_impl.nearest(self.__tree, mirrored)
+        return _np.where(distances <= tolerance, ids, -1)
+
+
+class BoundingBoxIndex(object):
+    u"""
+    シェイプのワールドバウンディングボックスの空間インデックス
+      ボックスのクエリは一様グリッドで候補を絞り込み、レイと最近傍のクエリは全ボックスに対して NumPy でまとめて判定する
+      track=True の場合、トランスフォームやシェイプの変更を検知して、次のクエリの前に変更のあった分だけ更新する
+      トランスフォームの変更は内部の WorldMatrixCache が捨てたエントリから知る
+      時間の変更では、ヒストリが時間に依存するシェイプだけを更新する
+      （ヒストリ上流のノードの変更でシェイプが変形した場合は検知できないので update() を呼ぶこと）
+    使い終わったら close() でコールバックを外すこと（with 文でも使える）
+    """
+
+    # 1 つのボックスがこれより多くのセルにまたがる場合は、グリッドに入れずに毎回判定する
+    _MAX_CELLS_PER_BOX = 64
+
+    @property
+    def size(self) -> int:
+        return len(self.__shapes)
+
+    @property
+    def cell_size(self) -> float:
+        return self.__cell_size
+
+    def __init__(
+            self,
+            shapes: abc.Iterable[_nodetypes.Shape]|None = None,
+            cell_size: float|None = None,
+            track: bool = True
+    ) -> None:
+        self.__matrix_cache = WorldMatrixCache()
+        self.__requested_shapes = list(shapes) if shapes is not None else None
+        self.__requested_cell_size = cell_size
+        self.__track = track
+
+        self.__shapes: list[_nodetypes.Shape] = []
+        self.__ids: dict[str, int] = {}
+        self.__mins = _np.zeros((0, 3), dtype=_np.float64)
+        self.__maxs = _np.zeros((0, 3), dtype=_np.float64)
+        self.__cell_size = 1.0
+        self.__cells: dict[tuple[int, int, int], set[int]] = {}
+        self.__box_cells: list[list[tuple[int, int, int]]|None] = []
+        self.__large_ids: set[int] = set()
+
+        self.__dirty_ids: set[int] = set()
+        self.__time_dependent_ids: list[int] = []
+        self.__needs_rebuild = False
+        self.__node_ids: dict[int, list[int]] = {}
+        self.__node_callback_ids: list[int] = []
+        self.__callback_ids: list[int] = []
+
+        if track:
+            self.__matrix_cache.add_listener(self.__on_matrices_invalidated)
+        self.build()
+
+    def __enter__(self) -> 'BoundingBoxIndex':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.__remove_callbacks()
+        self.__matrix_cache.close()
+
+    def build(self) -> None:
+        self.__remove_callbacks()
+        self.__matrix_cache.clear()
+
+        shapes = self.__requested_shapes
+        if shapes is None:
+            shapes = _iter_shapes()
+        self.__shapes = [shape for shape in shapes if not shape.mdagpath.node().isNull()]
+        self.__ids = {shape.mdagpath.fullPathName(): i for i, shape in enumerate(self.__shapes)}
+
+        self.__mins, self.__maxs = self.__compute_boxes(self.__shapes)
+
+        self.__cell_size = self.__requested_cell_size or _estimate_cell_size(self.__mins, self.__maxs)
+        self.__cells.clear()
+        self.__large_ids.clear()
+        self.__box_cells = [None] * len(self.__shapes)
+        for i in range(len(self.__shapes)):
+            self.__insert(i)
+
+        self.__dirty_ids.clear()
+        self.__needs_rebuild = False
+        if self.__track:
+            self.__add_callbacks()
+
+    def update(self, shapes: abc.Iterable[_nodetypes.Shape]|None = None) -> None:
+        u"""
+        shapes（省略時は変更が検知されたもの）のバウンディングボックスを計算し直す
+        """
+        if self.__needs_rebuild:
+            self.build()
+            return
+
+        if shapes is None:
+            ids = sorted(self.__dirty_ids)
+        else:
+            ids = sorted(self.__ids[shape.mdagpath.fullPathName()] for shape in shapes)
+        if len(ids) == 0:
+            return
+
+        for i in ids:
+            self.__matrix_cache.invalidate(self.__shapes[i])
+        # invalidate の通知で印が付き直すので、外すのはその後
+        self.__dirty_ids.difference_update(ids)
+        mins, maxs = self.__compute_boxes([self.__shapes[i] for i in ids])
+
+        for i, box_min, box_max in zip(ids, mins, maxs):
+            self.__remove(i)
+            self.__mins[i] = box_min
+            self.__maxs[i] = box_max
+            self.__insert(i)
+
+    def shapes(self) -> list[_nodetypes.Shape]:
+        return list(self.__shapes)
+
+    def bounding_box(self, shape: _nodetypes.Shape) -> _om2.MBoundingBox:
+        self.update()
+        i = self.__ids[shape.mdagpath.fullPathName()]
+        return _om2.MBoundingBox(_om2.MPoint(*self.__mins[i]), _om2.MPoint(*self.__maxs[i]))
+
+    def query_box(self, box_min: abc.Sequence[float], box_max: abc.Sequence[float]) -> list[_nodetypes.Shape]:
+        u"""
+        ボックスと重なるシェイプを返す
+        """
+        return [self.__shapes[i] for i in self.query_box_ids(box_min, box_max)]
+
+    def query_box_ids(self, box_min: abc.Sequence[float], box_max: abc.Sequence[float]) -> _np.ndarray:
+        self.update()
+        box_min = _np.asarray(box_min, dtype=_np.float64)
+        box_max = _np.asarray(box_max, dtype=_np.float64)
+
+        lower, upper = self.__cell_range(box_min, box_max)
+        if _np.prod(upper - lower + 1) > len(self.__shapes):
+            # セルを舐めるより全部調べる方が速い
+            candidates = _np.arange(len(self.__shapes))
+        else:
+            candidate_set = set(self.__large_ids)
+            for key in _iter_cells(lower, upper):
+                candidate_set.update(self.__cells.get(key, ()))
+            candidates = _np.fromiter(candidate_set, dtype=_np.int64, count=len(candidate_set))
+
+        if len(candidates) == 0:
+            return candidates
+
+        overlaps = _np.all(
+            (self.__mins[candidates] <= box_max) & (self.__maxs[candidates] >= box_min),
+            axis=1
+        )
+        return _np.sort(candidates[overlaps])
+
+    def query_ray(
+            self,
+            origin: abc.Sequence[float],
+            direction: abc.Sequence[float],
+            max_distance: float = _np.inf
+    ) -> list[tuple[_nodetypes.Shape, float]]:
+        u"""
+        レイと交差するボックスのシェイプを、交差するまでの距離が近い順に (シェイプ, 距離) で返す
+          direction は正規化しなくてよい（距離は direction の長さを単位とする）
+        """
+        self.update()
+        origin = _np.asarray(origin, dtype=_np.float64)
+        direction = _np.asarray(direction, dtype=_np.float64)
+
+        # スラブ法
+        with _np.errstate(divide='ignore', invalid='ignore'):
+            inv = 1.0 / direction
+            t0 = (self.__mins - origin) * inv
+            t1 = (self.__maxs - origin) * inv
+        t_near = _np.nanmax(_np.minimum(t0, t1), axis=1)
+        t_far = _np.nanmin(_np.maximum(t0, t1), axis=1)
+
+        t_near = _np.maximum(t_near, 0.0)
+        hits = _np.nonzero((t_near <= t_far) & (t_near <= max_distance))[0]
+        order = hits[_np.argsort(t_near[hits], kind='stable')]
+        return [(self.__shapes[i], float(t_near[i])) for i in order]
+
+    def nearest(self, point: abc.Sequence[float], k: int = 1) -> list[tuple[_nodetypes.Shape, float]]:
+        u"""
+        point に近いボックスのシェイプを k 個、(シェイプ, ボックスまでの距離) で近い順に返す
+          point がボックスの中にある場合の距離は 0
+        """
+        self.update()
+        count = len(self.__shapes)
+        if count == 0 or k <= 0:
+            return []
+
+        point = _np.asarray(point, dtype=_np.float64)
+        offsets = _np.maximum(_np.maximum(self.__mins - point, point - self.__maxs), 0.0)
+        distances = _np.linalg.norm(offsets, axis=1)
+
+        k = min(k, count)
+        ids = _np.argpartition(distances, k - 1)[:k] if k < count else _np.arange(count)
+        ids = ids[_np.argsort(distances[ids], kind='stable')]
+        return [(self.__shapes[i], float(distances[i])) for i in ids]
+
+    def __compute_boxes(self, shapes: abc.Sequence[_nodetypes.Shape]) -> tuple[_np.ndarray, _np.ndarray]:
+        if len(shapes) == 0:
+            return _np.zeros((0, 3), dtype=_np.float64), _np.zeros((0, 3), dtype=_np.float64)
+
+        # ローカルのボックスの 8 頂点をまとめてワールド行列で変換する
+        local = _np.empty((len(shapes), 2, 3), dtype=_np.float64)
+        for i, shape in enumerate(shapes):
+            bbox = _om2.MFnDagNode(shape.mdagpath).boundingBox
+            local[i, 0] = tuple(bbox.min)[:3]
+            local[i, 1] = tuple(bbox.max)[:3]
+
+        selector = _np.array([[x, y, z] for x in (0, 1) for y in (0, 1) for z in (0, 1)])
+        corners = _np.ones((len(shapes), 8, 4), dtype=_np.float64)
+        for axis in range(3):
+            corners[:, :, axis] = local[:, selector[:, axis], axis]
+
+        world = corners @ self.__matrix_cache.world_matrices(shapes)
+        return world[:, :, :3].min(axis=1), world[:, :, :3].max(axis=1)
+
+    def __cell_range(self, box_min: _np.ndarray, box_max: _np.ndarray) -> tuple[_np.ndarray, _np.ndarray]:
+        lower = _np.floor(box_min / self.__cell_size).astype(_np.int64)
+        upper = _np.floor(box_max / self.__cell_size).astype(_np.int64)
+        return lower, upper
+
+    def __insert(self, i: int) -> None:
+        lower, upper = self.__cell_range(self.__mins[i], self.__maxs[i])
+        if _np.prod(upper - lower + 1) > self.__class__._MAX_CELLS_PER_BOX:
+            self.__large_ids.add(i)
+            self.__box_cells[i] = None
+            return
+
+        keys = list(_iter_cells(lower, upper))
+        for key in keys:
+            self.__cells.setdefault(key, set()).add(i)
+        self.__box_cells[i] = keys
+
+    def __remove(self, i: int) -> None:
+        keys = self.__box_cells[i]
+        if keys is None:
+            self.__large_ids.discard(i)
+            return
+        for key in keys:
+            cell = self.__cells.get(key, None)
+            if cell is not None:
+                cell.discard(i)
+                if len(cell) == 0:
+                    del self.__cells[key]
+        self.__box_cells[i] = None
+
+    def __add_callbacks(self) -> None:
+        self.__callback_ids = [
+            _om2.MDagMessage.addAllDagChangesCallback(self.__on_structure_changed),
+            _om2.MDGMessage.addTimeChangeCallback(self.__on_time_changed),
+        ]
+        if self.__requested_shapes is None:
+            self.__callback_ids.append(_om2.MDGMessage.addNodeAddedCallback(self.__on_structure_changed, 'shape'))
+            self.__callback_ids.append(_om2.MDGMessage.addNodeRemovedCallback(self.__on_structure_changed, 'shape'))
+
+        # トランスフォームの変更は WorldMatrixCache が監視しているので、ここではシェイプ自身の変更だけを監視する
+        #   インスタンスされたシェイプは同じノードを複数のパスで持つので、コールバックはノードごとに 1 つにする
+        self.__time_dependent_ids = []
+        for i, shape in enumerate(self.__shapes):
+            mobj = shape.mdagpath.node()
+            hash_code = _om2_MObjectHandle(mobj).hashCode()
+            if hash_code not in self.__node_ids:
+                self.__node_ids[hash_code] = []
+                self.__node_callback_ids.append(
+                    _om2.MNodeMessage.addAttributeChangedCallback(mobj, self.__on_attribute_changed)
+                )
+            self.__node_ids[hash_code].append(i)
+            if _is_time_dependent(mobj):
+                self.__time_dependent_ids.append(i)
+
+    def __remove_callbacks(self) -> None:
+        callback_ids = self.__callback_ids + self.__node_callback_ids
+        if len(callback_ids) > 0:
+            _om2.MMessage.removeCallbacks(callback_ids)
+        self.__callback_ids = []
+        self.__node_callback_ids = []
+        self.__node_ids.clear()
+
+    def __on_structure_changed(self, *_) -> None:
+        self.__needs_rebuild = True
+
+    def __on_time_changed(self, *_) -> None:
+        self.__dirty_ids.update(self.__time_dependent_ids)
+
+    def __on_matrices_invalidated(self, keys: set[str]|None) -> None:
+        if keys is None:
+            self.__dirty_ids.update(range(len(self.__shapes)))
+            return
+        ids = self.__ids
+        self.__dirty_ids.update(ids[key] for key in keys if key in ids)
+
+    def __on_attribute_changed(self, msg: int, mplug: _om2.MPlug, *_) -> None:
+        if not msg & (
+                _om2.MNodeMessage.kAttributeSet
+                | _om2.MNodeMessage.kConnectionMade
+                | _om2.MNodeMessage.kConnectionBroken
+        ):
+            return
+        self.__dirty_ids.update(self.__node_ids.get(_om2_MObjectHandle(mplug.node()).hashCode(), ()))
+
+
+def _iter_shapes() -> abc.Iterator[_nodetypes.Shape]:
+    ite = _om2.MItDag(_om2.MItDag.kDepthFirst, _om2.MFn.kShape)
+    while not ite.isDone():
+        mdagpath = ite.getPath()
+        if not _om2.MFnDagNode(mdagpath).isIntermediateObject:
+            yield _graphs.to_node_instance(_om2_MFnDependencyNode(mdagpath.node()), mdagpath)
+        ite.next()
+
+
+def _iter_cells(lower: _np.ndarray, upper: _np.ndarray) -> abc.Iterator[tuple[int, int, int]]:
+    for x in range(int(lower[0]), int(upper[0]) + 1):
+        for y in range(int(lower[1]), int(upper[1]) + 1):
+            for z in range(int(lower[2]), int(upper[2]) + 1):
+                yield x, y, z
+
+
+def _estimate_cell_size(mins: _np.ndarray, maxs: _np.ndarray) -> float:
+    # ボックスの大きさの中央値くらいにしておくと、1 つのボックスが入るセルの数がだいたい 8 個以下になる
+    if len(mins) == 0:
+        return 1.0
+    size = float(_np.median(_np.max(maxs - mins, axis=1)))
+    return size if size > 1e-6 else 1.0
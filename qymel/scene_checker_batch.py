@@ -0,0 +1,322 @@
+u"""
+シーンチェッカーを mayapy のワーカープロセスで複数ファイルに対して実行する
+
+  mayapy -m qymel.scene_checker_batch --module my_checks --workers 8 --output results.jsonl a.ma b.mb ...
+
+ワーカーは起動したまま複数のファイルを順番に処理するので、mayapy の起動コストはワーカー数分しかかからない
+結果はファイルごとに 1 行の JSON として、終わった順に書き出す
+
+qymel.maya 以下のモジュールは import するだけで maya.cmds を使うため、maya.standalone.initialize より前には import できない
+-m で起動すると親パッケージも import されるので、このモジュールは qymel.maya の外に置き、Maya 関連の import はワーカーの初期化後に行う
+"""
+import argparse
+import collections
+import collections.abc as abc
+import importlib
+import json
+import os
+import queue
+import subprocess
+import sys
+import threading
+import time
+import traceback
+
+
+
+_MODULE_NAME = 'qymel.scene_checker_batch'
+
+# ワーカーの標準出力には Maya のログも混ざるので、結果の行には目印を付ける
+_RESULT_PREFIX = '@@qymel.scene_checker@@ '
+
+# 失敗したときの記録に残す、ワーカーの標準エラー出力の末尾の行数
+_STDERR_TAIL_LINES = 50
+
+
+class BatchOptions(object):
+
+    def __init__(
+            self,
+            module_name: str,
+            workers: int = 1,
+            retries: int = 0,
+            timeout: float|None = None,
+            mayapy: str|None = None
+    ):
+        self.module_name = module_name
+        self.workers = max(1, workers)
+        self.retries = max(0, retries)
+        self.timeout = timeout
+        self.mayapy = mayapy or sys.executable
+
+
+class BatchSummary(object):
+
+    @property
+    def total(self) -> int:
+        return sum(self.counts.values())
+
+    def __init__(self):
+        self.counts: dict[str, int] = {}
+        self.elapsed = 0.0
+
+    def add(self, record: dict[str, object]) -> None:
+        status = record['status']
+        self.counts[status] = self.counts.get(status, 0) + 1
+
+    def __str__(self) -> str:
+        counts = ', '.join(f'{status}: {count}' for status, count in sorted(self.counts.items()))
+        return f'{self.total} files in {self.elapsed:.1f} sec ({counts})'
+
+
+def run(
+        file_paths: abc.Sequence[str],
+        options: BatchOptions,
+        on_record: abc.Callable[[dict[str, object]], None]
+) -> BatchSummary:
+    u"""
+    file_paths を options.workers 個のワーカーに振り分けてチェックする
+      on_record はファイルのチェックが終わるたびに（呼び出し元のスレッドとは別のスレッドから）呼ばれる
+    """
+    summary = BatchSummary()
+    start = time.perf_counter()
+
+    tasks = queue.Queue()
+    for file_path in file_paths:
+        tasks.put(file_path)
+
+    lock = threading.Lock()
+
+    def _on_record(record: dict[str, object]) -> None:
+        with lock:
+            summary.add(record)
+            on_record(record)
+
+    threads = [
+        threading.Thread(target=_dispatch, args=(tasks, options, _on_record), daemon=True)
+        for _ in range(min(options.workers, len(file_paths)))
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    summary.elapsed = time.perf_counter() - start
+    return summary
+
+
+def main(args: abc.Sequence[str]|None = None) -> int:
+    parser = argparse.ArgumentParser(prog=_MODULE_NAME)
+    parser.add_argument('files', nargs='*', help='チェックするシーンファイル')
+    parser.add_argument('--module', required=True, help='CheckItem を定義したモジュール')
+    parser.add_argument('--file-list', help='チェックするシーンファイルを 1 行に 1 つずつ書いたテキストファイル')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--retries', type=int, default=0, help='失敗やタイムアウトしたファイルを再試行する回数')
+    parser.add_argument('--timeout', type=float, default=None, help='1 ファイルあたりの制限時間（秒）')
+    parser.add_argument('--mayapy', default=None, help='ワーカーに使う mayapy（省略時はこのプロセスと同じもの）')
+    parser.add_argument('--output', default=None, help='結果の書き出し先（省略時は標準出力）')
+    parser.add_argument('--worker', action='store_true', help=argparse.SUPPRESS)
+    parsed = parser.parse_args(args)
+
+    if parsed.worker:
+        _worker_main(parsed.module)
+        return 0
+
+    file_paths = list(parsed.files)
+    if parsed.file_list:
+        with open(parsed.file_list, 'r', encoding='utf-8') as f:
+            file_paths.extend(line.strip() for line in f if line.strip())
+
+    options = BatchOptions(parsed.module, parsed.workers, parsed.retries, parsed.timeout, parsed.mayapy)
+
+    output = open(parsed.output, 'w', encoding='utf-8') if parsed.output else sys.stdout
+    try:
+        def _write(record: dict[str, object]) -> None:
+            output.write(json.dumps(record, ensure_ascii=False) + '\n')
+            output.flush()
+
+        summary = run(file_paths, options, _write)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+    print(summary, file=sys.stderr)
+    failed = sum(count for status, count in summary.counts.items() if status not in ('success', 'warning'))
+    return 0 if failed == 0 else 1
+
+
+class _WorkerProcess(object):
+
+    def __init__(self, options: BatchOptions):
+        self.__options = options
+        self.__process: subprocess.Popen|None = None
+        self.__lines: queue.Queue|None = None
+        self.__stderr_lines: collections.deque[str] = collections.deque(maxlen=_STDERR_TAIL_LINES)
+        self.__stderr_thread: threading.Thread|None = None
+
+    def check(self, file_path: str) -> dict[str, object]:
+        if self.__process is None or self.__process.poll() is not None:
+            self.__start()
+
+        self.__stderr_lines.clear()
+        self.__process.stdin.write(file_path + '\n')
+        self.__process.stdin.flush()
+
+        deadline = None if self.__options.timeout is None else time.perf_counter() + self.__options.timeout
+        while True:
+            remaining = None if deadline is None else max(0.0, deadline - time.perf_counter())
+            try:
+                line = self.__lines.get(timeout=remaining)
+            except queue.Empty:
+                self.kill()
+                return self.__failure(file_path, 'timeout', f'timed out after {self.__options.timeout} sec')
+
+            if line is None:
+                self.kill()
+                return self.__failure(file_path, 'failed', 'worker process exited unexpectedly')
+
+            if line.startswith(_RESULT_PREFIX):
+                return json.loads(line[len(_RESULT_PREFIX):])
+
+    def kill(self) -> None:
+        if self.__process is None:
+            return
+        if self.__process.poll() is None:
+            self.__process.kill()
+        self.__process.wait()
+        self.__process = None
+        # 失敗の記録に残せるよう、標準エラー出力を最後まで読み終えるのを待つ
+        self.__stderr_thread.join(timeout=5)
+
+    def close(self) -> None:
+        if self.__process is None:
+            return
+        try:
+            self.__process.stdin.close()
+            self.__process.wait(timeout=10)
+        except (OSError, subprocess.TimeoutExpired):
+            pass
+        self.kill()
+
+    def __start(self) -> None:
+        self.__process = subprocess.Popen(
+            _worker_command(self.__options),
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            encoding='utf-8',
+            errors='replace',
+            bufsize=1,
+        )
+        # パイプの読み込みはブロックするので、別スレッドで読んでキューに積んでおく
+        #   標準エラー出力も読み続けないとパイプが詰まってワーカーが止まるので、末尾だけ残しておく
+        self.__lines = queue.Queue()
+        self.__stderr_lines = collections.deque(maxlen=_STDERR_TAIL_LINES)
+        self.__stderr_thread = threading.Thread(target=_read_stderr, args=(self.__process.stderr, self.__stderr_lines), daemon=True)
+        threading.Thread(target=_read_lines, args=(self.__process.stdout, self.__lines), daemon=True).start()
+        self.__stderr_thread.start()
+
+    def __failure(self, file_path: str, status: str, error: str) -> dict[str, object]:
+        record = {'file': file_path, 'status': status, 'error': error}
+        # check のたびに空にしているので、残っているのはそのファイルの処理中に出た分
+        if len(self.__stderr_lines) > 0:
+            record['stderr'] = '\n'.join(self.__stderr_lines)
+        return record
+
+
+def _worker_command(options: BatchOptions) -> list[str]:
+    return [options.mayapy, '-m', _MODULE_NAME, '--worker', '--module', options.module_name]
+
+
+def _read_lines(stream, lines: queue.Queue) -> None:
+    for line in stream:
+        lines.put(line.rstrip('\n'))
+    lines.put(None)
+
+
+def _read_stderr(stream, lines: collections.deque) -> None:
+    for line in stream:
+        lines.append(line.rstrip('\n'))
+
+
+def _dispatch(
+        tasks: queue.Queue,
+        options: BatchOptions,
+        on_record: abc.Callable[[dict[str, object]], None]
+) -> None:
+    worker = _WorkerProcess(options)
+    try:
+        while True:
+            try:
+                file_path = tasks.get_nowait()
+            except queue.Empty:
+                break
+
+            start = time.perf_counter()
+            for attempt in range(options.retries + 1):
+                record = worker.check(file_path)
+                if record['status'] not in ('failed', 'timeout'):
+                    break
+
+            record['attempts'] = attempt + 1
+            record['elapsed'] = time.perf_counter() - start
+            on_record(record)
+    finally:
+        worker.close()
+
+
+def _worker_main(module_name: str) -> None:
+    import maya.standalone
+    maya.standalone.initialize(name='python')
+
+    # qymel.maya は初期化が済んでからでないと import できない
+    from qymel.maya import system as _system
+    from qymel.maya.scene_checker import checker as _checker
+    from qymel.maya.scene_checker import items as _items
+
+    module = importlib.import_module(module_name)
+    checker = _checker.Checker()
+    checker.append(module_name).extend(_items.CheckItem.find_from_module(module))
+
+    for line in sys.stdin:
+        file_path = line.strip()
+        if not file_path:
+            continue
+
+        try:
+            _system.Scene.open(file_path, force=True)
+            checker.execute_all()
+            record = _to_record(file_path, checker)
+        except Exception:
+            record = {'file': file_path, 'status': 'failed', 'error': traceback.format_exc()}
+
+        sys.stdout.write(_RESULT_PREFIX + json.dumps(record, ensure_ascii=False) + '\n')
+        sys.stdout.flush()
+
+    maya.standalone.uninitialize()
+
+
+def _to_record(file_path: str, checker: 'qymel.maya.scene_checker.Checker') -> dict[str, object]:
+    results = []
+    status = 'success'
+    for group in checker.groups:
+        for result in group.results():
+            if result.is_error:
+                status = 'error'
+            elif result.is_warning and status == 'success':
+                status = 'warning'
+            if result.is_success:
+                continue
+            results.append({
+                'group': group.label,
+                'category': result.item.category,
+                'label': result.item.label,
+                'status': str(result.status),
+                'message': result.message,
+                'nodes': result.nodes,
+            })
+    return {'file': file_path, 'status': status, 'results': results}
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,53 @@
+import unittest
+
+import maya.standalone
+maya.standalone.initialize(name='python')
+
+import maya.cmds as cmds
+import maya.api.OpenMaya as om2
+import qymel.maya as qm
+
+
+class TestAnimCurveSampler(unittest.TestCase):
+
+    def setUp(self) -> None:
+        cmds.file(new=True, force=True)
+        cube1 = cmds.polyCube()[0]
+        for frame, value in ((1, 0.0), (8, 5.0), (20, -3.0)):
+            cmds.setKeyframe(cube1, attribute='translateX', time=frame, value=value)
+            cmds.setKeyframe(cube1, attribute='rotateY', time=frame, value=value * 10.0)
+        cmds.keyTangent(cube1, attribute='rotateY', weightedTangents=True)
+        cmds.keyTangent(cube1, attribute='rotateY', time=(8, 8), outWeight=3.0, outAngle=30.0, lock=False)
+        cmds.setInfinity(cube1, attribute='translateX', preInfinity='linear', postInfinity='linear')
+        self.curves = [qm.eval_node(curve) for curve in cmds.listConnections(cube1, type='animCurve')]
+
+    def test_sample(self):
+        sampler = qm.AnimCurveSampler(self.curves)
+        samples = sampler.sample(-5.0, 25.0, 0.5)
+        frames = qm.AnimCurveSampler.frames(-5.0, 25.0, 0.5)
+        self.assertEqual(samples.shape, (len(self.curves), len(frames)))
+        for curve, values in zip(self.curves, samples):
+            for frame, value in zip(frames, values):
+                self.assertAlmostEqual(value, curve.evaluate(frame))
+
+    def test_sample_key_data(self):
+        expected = qm.AnimCurveSampler(self.curves).sample(-5.0, 25.0, 0.25)
+        for max_workers in (None, 2):
+            sampler = qm.AnimCurveSampler(self.curves, use_key_data=True, max_workers=max_workers)
+            actual = sampler.sample(-5.0, 25.0, 0.25)
+            self.assertLess(abs(actual - expected).max(), 1e-4)
+
+    def test_iter_chunks(self):
+        sampler = qm.AnimCurveSampler(self.curves)
+        chunks = list(sampler.iter_chunks(1.0, 20.0, chunk_size=1))
+        self.assertEqual([first for first, _ in chunks], list(range(len(self.curves))))
+        self.assertTrue(all(block.shape == (1, 20) for _, block in chunks))
+
+    def test_unit_conversion(self):
+        for curve in self.curves:
+            self.assertFalse(curve.is_unitless_input)
+            self.assertAlmostEqual(curve.values_array()[1], curve.mfn.value(1) * curve.output_scale)
+
+        curve_ua = qm.AnimCurveUA.create()
+        self.assertTrue(curve_ua.is_unitless_input)
+        self.assertAlmostEqual(curve_ua.output_scale, om2.MAngle(1.0).asUnits(om2.MAngle.uiUnit()))
@@ -32,6 +32,9 @@ class _TestComponent(unittest.TestCase):
         self.assertEqual(list(comp.elements), self.elements)
         self.assertEqual(len(comp), len(self.elements))
 
+        cmds.delete(self.cube1)
+        self.assertEqual(comp.exists, False)
+
     def _test_elements(self):
         comp = self.cls(self.mobj, self.dagpath)
         for i, elem in enumerate(self.elements):
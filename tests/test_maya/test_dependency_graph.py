@@ -0,0 +1,42 @@
+import unittest
+
+import maya.standalone
+maya.standalone.initialize(name='python')
+
+import maya.cmds as cmds
+import qymel.maya as qm
+
+
+class TestDependencyGraphSnapshot(unittest.TestCase):
+
+    def setUp(self) -> None:
+        cmds.file(new=True, force=True)
+        cube1, self.poly_cube1 = cmds.polyCube()
+        self.shape1 = cmds.ls(cmds.listRelatives(cube1, shapes=True), long=True)[0]
+        self.cube2 = cmds.polyCube()[0]
+
+    def test_sources(self):
+        snapshot = qm.DependencyGraphSnapshot()
+        shape = qm.eval_node(self.shape1)
+
+        sources = [node.mel_object for node in snapshot.sources(shape)]
+        self.assertCountEqual(sources, cmds.ls(cmds.listConnections(self.shape1, source=True, destination=False), long=True))
+
+        history = [node.mel_object for node in snapshot.history(shape)]
+        self.assertEqual(history[0], self.shape1)
+        self.assertIn(self.poly_cube1, history)
+
+    def test_tracking(self):
+        snapshot = qm.DependencyGraphSnapshot()
+        snapshot.start_tracking()
+        try:
+            cube2 = qm.eval_node(self.cube2)
+            self.assertEqual(snapshot.sources(cube2), [])
+
+            cmds.connectAttr(f'{self.poly_cube1}.width', f'{self.cube2}.tx')
+            self.assertEqual([node.mel_object for node in snapshot.sources(cube2)], [self.poly_cube1])
+
+            cmds.disconnectAttr(f'{self.poly_cube1}.width', f'{self.cube2}.tx')
+            self.assertEqual(snapshot.sources(cube2), [])
+        finally:
+            snapshot.stop_tracking()
@@ -1,3 +1,8 @@
+import gc
+import json
+import os
+import shutil
+import tempfile
 import unittest
 
 import maya.standalone
@@ -5,7 +10,10 @@ maya.standalone.initialize(name='python')
 
 import maya.cmds as cmds
 import maya.api.OpenMaya as om2
+import numpy as np
 import qymel.maya as qm
+from qymel.maya.internal import factory
+from qymel.maya.internal import graphs
 
 
 class TestGeneral(unittest.TestCase):
@@ -45,6 +53,82 @@ class TestGeneral(unittest.TestCase):
         with self.assertRaises(TypeError):
             self.assertIsNone(qm.eval_node(f'{self.shape1}.vtx[0]'))
 
+    def test_eval_node_identity(self):
+        node = qm.eval_node(self.cube1)
+        self.assertIs(qm.eval_node(self.cube1), node)
+        self.assertIs(qm.eval_node(self.cube2).parent(), node)
+
+        cmds.delete(self.cube2)
+        cube2, _ = cmds.polyCube()
+        self.assertIsNot(qm.eval_node(cube2), node)
+
+    def test_node_instance_cache_prune(self):
+        entries = graphs._NodeInstanceCache.entries
+        node = qm.eval_node(self.cube1)
+        hash_code = node.mobject_handle.hashCode()
+        self.assertIn(hash_code, entries)
+
+        # ラッパーが解放された入れ物は、次に引いた時に捨てられる
+        del node
+        gc.collect()
+        self.assertEqual(len(entries[hash_code]), 0)
+        self.assertIsNone(graphs._NodeInstanceCache.find(om2.MGlobal.getSelectionListByName(self.cube1).getDependNode(0), None))
+        self.assertNotIn(hash_code, entries)
+
+        node = qm.eval_node(self.cube2)
+        hash_code = node.mobject_handle.hashCode()
+        del node
+        gc.collect()
+        graphs._NodeInstanceCache.prune()
+        self.assertNotIn(hash_code, entries)
+
+    def test_iter_dag(self):
+        node = qm.eval_node(self.cube1)
+        expected = cmds.listRelatives(self.cube1, allDescendents=True, fullPath=True)
+        self.assertCountEqual([child.mel_object for child in node.iter_descendents()], expected)
+        self.assertCountEqual([child.mel_object for child in node.iter_descendents(breadth_first=True)], expected)
+
+        meshes = [child.mel_object for child in node.iter_descendents(fn_types=[om2.MFn.kMesh])]
+        self.assertCountEqual(meshes, cmds.ls(expected, type='mesh', long=True))
+
+        children = cmds.listRelatives(self.cube1, children=True, fullPath=True)
+        self.assertSequenceEqual([child.mel_object for child in node.children()], children)
+
+    def test_relatives(self):
+        group = cmds.group(empty=True, parent=self.cube1)
+        locator = cmds.spaceLocator()[0]
+        locator = cmds.parent(locator, group)[0]
+        hidden = cmds.spaceLocator()[0]
+        hidden = cmds.parent(hidden, self.cube2)[0]
+        cmds.setAttr(f'{cmds.listRelatives(hidden, shapes=True, fullPath=True)[0]}.intermediateObject', True)
+
+        # listRelatives と同じ結果を同じ順番で返す
+        node = qm.eval_node(self.cube1)
+        for kwargs in [
+            {'allDescendents': True},
+            {'allDescendents': True, 'type': 'transform'},
+            {'allDescendents': True, 'type': ['mesh', 'locator']},
+            {'allDescendents': True, 'type': 'shape'},
+            {'allDescendents': True, 'shapes': True},
+            {'allDescendents': True, 'noIntermediate': True},
+            {'ad': True, 'ni': True, 'typ': 'shape'},
+            {'children': True},
+            {'children': True, 'type': 'transform'},
+            {},
+        ]:
+            expected = cmds.listRelatives(self.cube1, fullPath=True, **kwargs) or []
+            self.assertSequenceEqual([relative.mel_object for relative in node.relatives(**kwargs)], expected, kwargs)
+
+        expected = cmds.listRelatives(self.cube1, allDescendents=True, fullPath=True)
+        self.assertSequenceEqual([relative.mel_object for relative in node.descendents()], expected)
+        expected = cmds.listRelatives(self.cube1, allDescendents=True, type='mesh', fullPath=True)
+        self.assertSequenceEqual([relative.mel_object for relative in node.descendents(type='mesh')], expected)
+
+        # 対応していないフラグは cmds で処理する
+        locator_node = qm.eval_node(cmds.ls(locator, long=True)[0])
+        expected = cmds.listRelatives(locator_node.mel_object, allParents=True, fullPath=True)
+        self.assertSequenceEqual([relative.mel_object for relative in locator_node.parents()], expected)
+
     def test_eval_plug(self):
         for name in self.cubes:
             self.assertIsNone(qm.eval_plug(name))
@@ -69,6 +153,52 @@ class TestGeneral(unittest.TestCase):
         self.assertEqual(comp.mel_object[0], f'{self.shape1}.vtx[0:1]')
 
 
+class TestGeneralNodeTypeHierarchy(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.cache_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.cache_dir, 'node_type_hierarchy_{}.json'.format(cmds.about(apiVersion=True)))
+        self.hierarchy = factory.NodeFactory._type_hierarchy
+        self.hierarchy_path = factory.NodeFactory._type_hierarchy_path
+
+    def tearDown(self) -> None:
+        factory.NodeFactory._type_hierarchy = self.hierarchy
+        factory.NodeFactory._type_hierarchy_path = self.hierarchy_path
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    def test_miss(self):
+        factory.NodeFactory.load_type_hierarchy(self.cache_dir)
+        self.assertIn('transform', factory.NodeFactory._type_hierarchy)
+
+        with open(self.path, 'r') as f:
+            data = json.load(f)
+        self.assertEqual(data['types'], factory.NodeFactory._type_hierarchy)
+        self.assertEqual(os.listdir(self.cache_dir), [os.path.basename(self.path)])
+
+    def test_load(self):
+        factory.NodeFactory.load_type_hierarchy(self.cache_dir)
+        with open(self.path, 'r') as f:
+            data = json.load(f)
+
+        # ディスクの内容がそのまま使われる
+        data['types']['transform'] = ['cachedBase', 'transform']
+        with open(self.path, 'w') as f:
+            json.dump(data, f)
+        factory.NodeFactory.load_type_hierarchy(self.cache_dir)
+        self.assertEqual(factory.NodeFactory._type_hierarchy['transform'], ['cachedBase', 'transform'])
+
+    def test_corrupt_file(self):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        for content in ['{broken', json.dumps({'transform': ['dagNode', 'transform']}), json.dumps({'format': 2, 'types': []})]:
+            with open(self.path, 'w') as f:
+                f.write(content)
+
+            factory.NodeFactory.load_type_hierarchy(self.cache_dir)
+            self.assertIn('transform', factory.NodeFactory._type_hierarchy)
+            with open(self.path, 'r') as f:
+                self.assertIsInstance(json.load(f)['types'], dict)
+
+
 class TestGeneralColorSet(unittest.TestCase):
 
     def setUp(self) -> None:
@@ -138,3 +268,184 @@ class TestGeneralUvSet(unittest.TestCase):
         self.assertEqual(uvset.name, self.uvset)
         self.assertEqual(uvset.mel_object, self.uvset)
         self.assertEqual(uvset.mesh.mel_object, self.shape1)
+
+
+class TestGeneralMeshSnapshot(unittest.TestCase):
+
+    def setUp(self) -> None:
+        cmds.file(new=True, force=True)
+        cube1, _ = cmds.polyCube()
+        cmds.setAttr(f'{cube1}.t', 1, 2, 3, type='double3')
+        self.shape1 = cmds.ls(cmds.listRelatives(cube1, shapes=True), long=True)[0]
+        self.dagpath = om2.MGlobal.getSelectionListByName(self.shape1).getDagPath(0)
+
+    def test_points(self):
+        mfn = om2.MFnMesh(self.dagpath)
+        for space in [om2.MSpace.kObject, om2.MSpace.kWorld]:
+            snapshot = qm.Mesh(self.shape1).snapshot(space, qm.MeshSnapshotField.POINTS)
+            self.assertEqual(snapshot.points.shape, (mfn.numVertices, 3))
+            for got, expected in zip(snapshot.points, mfn.getPoints(space)):
+                self.assertSequenceEqual(list(got), list(expected)[:3])
+            self.assertIsNone(snapshot.normals)
+            self.assertIsNone(snapshot.face_vertex_counts)
+
+    def test_topology(self):
+        mfn = om2.MFnMesh(self.dagpath)
+        snapshot = qm.Mesh(self.shape1).snapshot(fields=qm.MeshSnapshotField.TOPOLOGY | qm.MeshSnapshotField.EDGES)
+        counts, connects = mfn.getVertices()
+        self.assertSequenceEqual(list(snapshot.face_vertex_counts), list(counts))
+        self.assertSequenceEqual(list(snapshot.face_vertex_indices), list(connects))
+        self.assertEqual(snapshot.edge_vertex_indices.shape, (mfn.numEdges, 2))
+        for i, vertices in enumerate(snapshot.edge_vertex_indices):
+            self.assertSequenceEqual(list(vertices), list(mfn.getEdgeVertices(i)))
+
+    def test_normals_uvs(self):
+        mfn = om2.MFnMesh(self.dagpath)
+        snapshot = qm.Mesh(self.shape1).snapshot()
+        self.assertEqual(snapshot.normals.shape, (mfn.numFaceVertices, 3))
+
+        miter = om2.MItMeshFaceVertex(self.dagpath)
+        i = 0
+        while not miter.isDone():
+            self.assertSequenceEqual(list(snapshot.normals[i]), list(miter.getNormal()))
+            self.assertEqual(snapshot.uv_indices['map1'][i], miter.getUVIndex('map1'))
+            i += 1
+            miter.next()
+
+        us, vs = mfn.getUVs('map1')
+        self.assertSequenceEqual(list(snapshot.uvs['map1'][:, 0]), list(us))
+        self.assertSequenceEqual(list(snapshot.uvs['map1'][:, 1]), list(vs))
+
+
+class TestGeneralSkinClusterWeights(unittest.TestCase):
+
+    def setUp(self) -> None:
+        cmds.file(new=True, force=True)
+        self.cube1 = cmds.polyCube()[0]
+        self.joints = []
+        for i in range(3):
+            cmds.select(clear=True)
+            self.joints.append(cmds.joint(position=(0, i - 1, 0)))
+        skin = cmds.skinCluster(*self.joints, self.cube1, toSelectedBones=True)[0]
+
+        # 途中のインフルエンスを外して、matrix の論理インデックスと influenceObjects() 上の位置をずらす
+        cmds.skinCluster(skin, edit=True, removeInfluence=self.joints[1])
+        self.skin = qm.eval_node(skin)
+        self.mesh = qm.eval_node(cmds.listRelatives(self.cube1, shapes=True)[0])
+
+    def test_weights_array(self):
+        joint = qm.eval_node(self.joints[2])
+        self.assertEqual(self.skin.influence_index(joint), 2)
+
+        weights = self.skin.weights_array(self.mesh)
+        self.assertEqual(weights.shape, (self.mesh.vertex_count, 2))
+
+        column = self.skin.weights_array(self.mesh, influences=[joint])[:, 0]
+        for i, weight in enumerate(column):
+            expected = cmds.skinPercent(self.skin.full_name, f'{self.cube1}.vtx[{i}]', transform=self.joints[2], query=True)
+            self.assertAlmostEqual(weight, expected)
+            self.assertAlmostEqual(weights[i, 1], expected)
+
+    def test_set_weights_array(self):
+        joint0 = qm.eval_node(self.joints[0])
+        joint2 = qm.eval_node(self.joints[2])
+        weights = np.zeros((self.mesh.vertex_count, 2))
+        weights[:, 1] = 1.0
+        self.skin.set_weights_array(self.mesh, weights, influences=[joint0, joint2])
+
+        for i in range(self.mesh.vertex_count):
+            vtx = f'{self.cube1}.vtx[{i}]'
+            self.assertAlmostEqual(cmds.skinPercent(self.skin.full_name, vtx, transform=self.joints[0], query=True), 0.0)
+            self.assertAlmostEqual(cmds.skinPercent(self.skin.full_name, vtx, transform=self.joints[2], query=True), 1.0)
+
+
+class TestGeneralMembershipIndex(unittest.TestCase):
+
+    def setUp(self) -> None:
+        cmds.file(new=True, force=True)
+        self.cube1 = cmds.polyCube()[0]
+        self.cube2 = cmds.polyCube()[0]
+        self.set1 = cmds.sets(self.cube1, self.cube2)
+        self.set2 = cmds.sets(self.cube2, f'{self.cube1}.vtx[0:3]')
+
+    def test_contains(self):
+        index1 = qm.ObjectSet(self.set1).membership_index()
+        cube1 = qm.eval_node(self.cube1)
+        cube2 = qm.eval_node(self.cube2)
+        self.assertIn(cube1, index1)
+        self.assertIn(cube2, index1)
+
+        index2 = qm.ObjectSet(self.set2).membership_index()
+        self.assertIn(cube2, index2)
+        self.assertEqual([node.mel_object for node in index1.intersection(index2).nodes()], [cube2.mel_object])
+        self.assertEqual([node.mel_object for node in index1.difference(index2).nodes()], [cube1.mel_object])
+
+    def test_flatten_components(self):
+        index = qm.ObjectSet(self.set2).membership_index(flatten_components=True)
+        shape = qm.eval_node(cmds.listRelatives(self.cube1, shapes=True, fullPath=True)[0])
+        self.assertTrue(index.contains(shape, include_components=True))
+        self.assertFalse(index.contains(shape))
+        self.assertSequenceEqual(list(index.component_indices(shape)), [0, 1, 2, 3])
+
+    def test_combine_components(self):
+        set3 = cmds.sets(f'{self.cube1}.vtx[0]')
+        index2 = qm.ObjectSet(self.set2).membership_index(flatten_components=True)
+        index3 = qm.ObjectSet(set3).membership_index(flatten_components=True)
+        shape = qm.eval_node(cmds.listRelatives(self.cube1, shapes=True, fullPath=True)[0])
+
+        difference = index2.difference(index3)
+        self.assertTrue(difference.contains(shape, include_components=True))
+        self.assertSequenceEqual(list(difference.component_indices(shape)), [1, 2, 3])
+        self.assertEqual([node.mel_object for node in difference.component_owners()], [shape.mel_object])
+
+        intersection = index2.intersection(index3)
+        self.assertTrue(intersection.contains(shape, include_components=True))
+        self.assertSequenceEqual(list(intersection.component_indices(shape)), [0])
+
+        # インデックスが残らなければ所有ノードからも外れる
+        empty = index3.difference(index2)
+        self.assertFalse(empty.contains(shape, include_components=True))
+        self.assertEqual(empty.component_owners(), [])
+
+    def test_display_layer(self):
+        layer = qm.DisplayLayer.create(name='layer1', empty=True)
+        layer.add(qm.eval_node(self.cube1))
+        index = layer.membership_index()
+        self.assertIn(qm.eval_node(self.cube1), index)
+        self.assertNotIn(qm.eval_node(self.cube2), index)
+
+
+class TestGeneralAnimCurveArrays(unittest.TestCase):
+
+    def setUp(self) -> None:
+        cmds.file(new=True, force=True)
+        self.cube1 = cmds.polyCube()[0]
+        for frame, value in ((1, 0.0), (10, 90.0), (20, -45.0)):
+            cmds.setKeyframe(self.cube1, attribute='rotateX', time=frame, value=value)
+        self.curve = qm.eval_node(cmds.listConnections(f'{self.cube1}.rotateX', source=True, destination=False)[0])
+
+    def test_keys_values(self):
+        self.assertEqual(len(self.curve.keys_array()), self.curve.key_count)
+        for lhs, rhs in zip(self.curve.keys_array(), self.curve.keys()):
+            self.assertAlmostEqual(lhs, rhs)
+        for lhs, rhs in zip(self.curve.values_array(), self.curve.values()):
+            self.assertAlmostEqual(lhs, rhs)
+
+    def test_evaluate_many(self):
+        times = [1.0, 5.5, 10.0, 15.0, 25.0]
+        for lhs, time in zip(self.curve.evaluate_many(times), times):
+            self.assertAlmostEqual(lhs, self.curve.evaluate(time))
+
+        # AnimCurveTU は入力の変換を独自に行う
+        for frame, value in ((1, 1.0), (10, 0.0)):
+            cmds.setKeyframe(self.cube1, attribute='visibility', time=frame, value=value)
+        curve = qm.eval_node(cmds.listConnections(f'{self.cube1}.visibility', source=True, destination=False)[0])
+        self.assertIsInstance(curve, qm.AnimCurveTU)
+        for lhs, time in zip(curve.evaluate_many(times), times):
+            self.assertAlmostEqual(lhs, curve.evaluate(time))
+
+    def test_set_keys_array(self):
+        self.curve.set_keys_array([1.0, 2.0, 3.0], [10.0, 20.0, 30.0])
+        self.assertSequenceEqual(list(self.curve.keys_array()), [1.0, 2.0, 3.0])
+        for lhs, rhs in zip(self.curve.values_array(), [10.0, 20.0, 30.0]):
+            self.assertAlmostEqual(lhs, rhs)
@@ -94,6 +94,19 @@ class TestMeshVertexIter(TestCase):
             self.assertSequenceEqual(list(vtx.position()), list(miter.position()))
             miter.next()
 
+    def test_batch(self):
+        miter = om2.MItMeshVertex(self.dagpath)
+        iter = self._get_iter()
+        positions = iter.positions()
+        normals = iter.vertex_normals()
+        on_boundary = iter.on_boundary_mask()
+        self.assertEqual(positions.shape, (len(iter._comp), 3))
+        for i in range(len(positions)):
+            self.assertFloatSequenceEquals(positions[i], list(miter.position())[:3])
+            self.assertFloatSequenceEquals(normals[i], list(miter.getNormal()))
+            self.assertEqual(on_boundary[i], miter.onBoundary())
+            miter.next()
+
     def _get_iter(self):
         mcomp = om2.MFnSingleIndexedComponent()
         mobj = mcomp.create(om2.MFn.kMeshVertComponent)
@@ -147,6 +160,22 @@ class TestMeshFaceIter(TestCase):
             self.assertSequenceEqual(list(face.normals()), list(miter.getNormals()))
             miter.next()
 
+    def test_batch(self):
+        miter = om2.MItMeshPolygon(self.dagpath)
+        iter = self._get_iter()
+        centers = iter.centers()
+        areas = iter.areas()
+        normals = iter.face_normals()
+        zero_area = iter.is_zero_area_mask()
+        on_boundary = iter.on_boundary_mask()
+        for i in range(len(areas)):
+            self.assertFloatSequenceEquals(centers[i], list(miter.center())[:3])
+            self.assertAlmostEqual(areas[i], miter.getArea(), places=4)
+            self.assertFloatSequenceEquals(normals[i], list(miter.getNormal()))
+            self.assertEqual(zero_area[i], miter.zeroArea())
+            self.assertEqual(on_boundary[i], miter.onBoundary())
+            miter.next()
+
     def test_triangle(self):
         miter = om2.MItMeshPolygon(self.dagpath)
         iter = self._get_iter()
@@ -203,6 +232,18 @@ class TestMeshEdgeIter(TestCase):
             self.assertSequenceEqual(list(edge.points()), [miter.point(0), miter.point(1)])
             miter.next()
 
+    def test_batch(self):
+        miter = om2.MItMeshEdge(self.dagpath)
+        iter = self._get_iter()
+        centers = iter.centers()
+        lengths = iter.lengths()
+        on_boundary = iter.on_boundary_mask()
+        for i in range(len(lengths)):
+            self.assertFloatSequenceEquals(centers[i], list(miter.center())[:3])
+            self.assertAlmostEqual(lengths[i], miter.length(), places=4)
+            self.assertEqual(on_boundary[i], miter.onBoundary())
+            miter.next()
+
     def _get_iter(self):
         mcomp = om2.MFnSingleIndexedComponent()
         mobj = mcomp.create(om2.MFn.kMeshEdgeComponent)
@@ -274,6 +315,19 @@ class TestMeshVertexFaceITer(TestCase):
             self.assertSequenceEqual(list(vf.position()), list(miter.position()))
             miter.next()
 
+    def test_batch(self):
+        iter = self._get_iter()
+        positions = iter.positions()
+        normals = iter.face_vertex_normals()
+        for i, (vtx_id, face_id) in enumerate(iter._comp.elements):
+            miter = om2.MItMeshFaceVertex(self.dagpath)
+            while not miter.isDone():
+                if miter.vertexId() == vtx_id and miter.faceId() == face_id:
+                    break
+                miter.next()
+            self.assertFloatSequenceEquals(positions[i], list(miter.position())[:3])
+            self.assertFloatSequenceEquals(normals[i], list(miter.getNormal()))
+
     def _get_iter(self):
         mcomp = om2.MFnDoubleIndexedComponent()
         mobj = mcomp.create(om2.MFn.kMeshVtxFaceComponent)
@@ -5,7 +5,9 @@ maya.standalone.initialize(name='python')
 
 import maya.cmds as cmds
 import maya.api.OpenMaya as om2
+import numpy as np
 import qymel.maya as qm
+from qymel.maya.internal import plug_impl
 
 
 class TestPlugPlug(unittest.TestCase):
@@ -56,6 +58,96 @@ class TestPlugPlug(unittest.TestCase):
             plug, full_name, mplug, mattr = self.__get_plug(name)
             self.assertEqual(plug.get(), cmds.getAttr(full_name))
 
+    def test_get_many(self):
+        plugs = [self.__get_plug(name)[0] for name in self.names]
+        self.assertEqual(qm.Plug.get_many(plugs), [plug.get() for plug in plugs])
+
+        values = qm.Plug.get_many([plugs[0], plugs[0]], as_array=True)
+        self.assertEqual(values.shape, (2, 3))
+        self.assertSequenceEqual(list(values[0]), list(plugs[0].get()))
+
+    def test_sparse_elements(self):
+        cmds.addAttr(self.cube1, longName='sparse', attributeType='double', multi=True)
+        for index, value in [(2, 1.0), (5, 2.0), (9, 3.0)]:
+            cmds.setAttr(f'{self.cube1}.sparse[{index}]', value)
+        plug, _, _, _ = self.__get_plug(f'{self.cube1}.sparse')
+
+        self.assertSequenceEqual(list(plug.logical_indices()), [2, 5, 9])
+        self.assertSequenceEqual([element.mplug.logicalIndex() for element in plug.elements()], [2, 5, 9])
+        self.assertEqual(plug.get(), [1.0, 2.0, 3.0])
+
+        indices, values = plug.get_elements(as_array=True)
+        self.assertSequenceEqual(list(indices), [2, 5, 9])
+        self.assertSequenceEqual(list(values), [1.0, 2.0, 3.0])
+
+        with qm.PlugWriter() as writer:
+            writer.set(plug, {5: 4.0, 7: 5.0})
+        indices, values = plug.get_elements()
+        self.assertSequenceEqual(list(indices), [2, 5, 7, 9])
+        self.assertEqual(values, [1.0, 4.0, 5.0, 3.0])
+
+        # get_elements() の値は dict にすれば論理インデックスを保ったまま書き戻せる
+        indices, values = plug.get_elements(as_array=True)
+        with qm.PlugWriter() as writer:
+            writer.set(plug, dict(zip(indices, values * 2.0)))
+        indices, values = plug.get_elements()
+        self.assertSequenceEqual(list(indices), [2, 5, 7, 9])
+        self.assertEqual(values, [2.0, 8.0, 10.0, 6.0])
+
+        # リストは要素数に関係なく論理インデックス 0 から順に書き込む
+        with qm.PlugWriter() as writer:
+            writer.set(plug, [11.0, 12.0, 13.0, 14.0])
+        indices, values = plug.get_elements()
+        self.assertSequenceEqual(list(indices), [0, 1, 2, 3, 5, 7, 9])
+        self.assertEqual(values, [11.0, 12.0, 13.0, 14.0, 8.0, 10.0, 6.0])
+
+        with qm.PlugWriter() as writer:
+            writer.set(plug, [21.0])
+        self.assertEqual(plug.get_elements()[1][:2], [21.0, 12.0])
+
+        plug_t, _, _, _ = self.__get_plug(self.t)
+        with self.assertRaises(RuntimeError):
+            plug_t.logical_indices()
+
+    def test_get_attr_batch(self):
+        nodes = qm.Transform.ls()
+        self.assertEqual(qm.DependNode.get_attr_batch(nodes, 'visibility'), [node.visibility.get() for node in nodes])
+        self.assertEqual(qm.DependNode.get_attr_batch(nodes, 'translate', True).shape, (len(nodes), 3))
+
+    def test_getter_cache(self):
+        qm.Plug.clear_getter_cache()
+        plug, full_name, mplug, mattr = self.__get_plug(self.t)
+        plug2, full_name2, _, _ = self.__get_plug(self.t2)
+
+        plug.get()
+        info = qm.Plug.getter_cache_info()
+        self.assertEqual(info.hits, 0)
+        self.assertGreater(info.misses, 0)
+
+        self.assertEqual(plug2.get(), cmds.getAttr(full_name2)[0])
+        self.assertEqual(qm.Plug.getter_cache_info().hits, 1)
+        self.assertEqual(qm.Plug.getter_cache_info().misses, info.misses)
+
+    def test_getter_cache_bounds(self):
+        qm.Plug.clear_getter_cache()
+        for name in self.names:
+            self.__get_plug(name)[0].get()
+        self.assertGreater(qm.Plug.getter_cache_info().size, 0)
+
+        # 上限を超えると古いものから捨てる
+        max_size = plug_impl._MAX_CACHE_SIZE
+        plug_impl._MAX_CACHE_SIZE = 2
+        try:
+            for name in self.names:
+                self.__get_plug(name)[0].get()
+            self.assertLessEqual(qm.Plug.getter_cache_info().size, 2)
+        finally:
+            plug_impl._MAX_CACHE_SIZE = max_size
+
+        # シーンを作り直すと全て捨てる
+        cmds.file(new=True, force=True)
+        self.assertEqual(qm.Plug.getter_cache_info().size, 0)
+
     def test_get_attr(self):
         for name in self.names:
             plug, full_name, mplug, mattr = self.__get_plug(name)
@@ -74,6 +166,82 @@ class TestPlugPlug(unittest.TestCase):
 
         self.assertEqual(got, expected)
 
+    def test_full_name(self):
+        for name in self.names + [self.t2, f'{self.cube1}.worldMatrix[0]']:
+            plug, full_name, mplug, mattr = self.__get_plug(name)
+            self.assertEqual(plug.full_name, full_name)
+
+    def test_exists(self):
+        cmds.addAttr(self.cube1, longName='dynamicAttr')
+        plug, _, _, _ = self.__get_plug(self.t2)
+        plug_dynamic, _, _, _ = self.__get_plug(f'{self.cube1}.dynamicAttr')
+        self.assertTrue(plug.exists)
+        self.assertTrue(plug_dynamic.exists)
+
+        cmds.deleteAttr(f'{self.cube1}.dynamicAttr')
+        self.assertFalse(plug_dynamic.exists)
+
+        cmds.delete(plug.node().full_name)
+        self.assertFalse(plug.exists)
+
+    def test_name_cache(self):
+        plug, full_name, mplug, mattr = self.__get_plug(self.t2)
+        node = plug.node()
+        self.assertEqual(plug.mel_object, full_name)
+
+        new_parent = cmds.createNode('transform', name='newParent')
+        cmds.parent(node.full_name, new_parent)
+        self.assertEqual(node.full_name, f'|{new_parent}|{node.name}')
+        self.assertEqual(plug.mel_object, f'|{new_parent}|{node.name}.translate')
+
+        cmds.rename(new_parent, 'renamedParent')
+        self.assertEqual(node.full_name, f'|renamedParent|{node.name}')
+        self.assertEqual(plug.mel_object, f'|renamedParent|{node.name}.translate')
+
+        # プラグの名前はアトリビュートのリネームでも変わる
+        cmds.addAttr(node.full_name, longName='before', shortName='bf')
+        plug_dynamic = qm.Plug(f'{node.full_name}.before')
+        self.assertEqual(plug_dynamic.full_name, f'|renamedParent|{node.name}.before')
+        self.assertEqual(plug_dynamic.mel_object, f'|renamedParent|{node.name}.bf')
+        cmds.renameAttr(f'{node.full_name}.before', 'after')
+        self.assertEqual(plug_dynamic.full_name, f'|renamedParent|{node.name}.after')
+        cmds.renameAttr(f'{node.full_name}.bf', 'af')
+        self.assertEqual(plug_dynamic.mel_object, f'|renamedParent|{node.name}.af')
+
+        qm.set_name_cache_enabled(False)
+        try:
+            self.assertFalse(qm.is_name_cache_enabled())
+            cmds.rename('renamedParent', 'uncachedParent')
+            self.assertEqual(node.full_name, f'|uncachedParent|{node.name}')
+        finally:
+            qm.set_name_cache_enabled(True)
+
+    def test_plug_writer(self):
+        plug, full_name, mplug, mattr = self.__get_plug(self.t)
+        plug_y, full_name_y, _, _ = self.__get_plug(self.ty)
+
+        cmds.setAttr(full_name, 0, 0, 0, type='double3')
+        cmds.flushUndo()
+
+        with qm.PlugWriter() as writer:
+            writer.set(plug, np.array([4.0, 5.0, 6.0]))
+            self.assertEqual(len(writer), 1)
+        self.assertEqual(cmds.getAttr(full_name), [(4.0, 5.0, 6.0)])
+
+        writer = qm.PlugWriter()
+        writer.extend([plug_y, f'{self.cube1}.v'], [7.0, False])
+        writer.apply()
+        self.assertEqual(len(writer), 0)
+        self.assertEqual(cmds.getAttr(full_name_y), 7.0)
+        self.assertFalse(cmds.getAttr(f'{self.cube1}.v'))
+
+        # まとめた書き込みは 1 回の undo で戻る
+        cmds.undo()
+        self.assertEqual(cmds.getAttr(full_name_y), 5.0)
+        self.assertTrue(cmds.getAttr(f'{self.cube1}.v'))
+        cmds.undo()
+        self.assertEqual(cmds.getAttr(full_name), [(0.0, 0.0, 0.0)])
+
     def test_connect(self):
         plug, full_name, mplug, mattr = self.__get_plug(self.t)
         plug2, full_name2, _, _ = self.__get_plug(self.t2)
@@ -89,6 +257,33 @@ class TestPlugPlug(unittest.TestCase):
         destinations = cmds.ls(cmds.listConnections(full_name, plugs=True, source=False), long=True)
         self.assertNotIn(full_name2, destinations)
 
+    def test_connection_batch(self):
+        plug, full_name, mplug, mattr = self.__get_plug(self.t)
+        plug2, full_name2, _, _ = self.__get_plug(self.t2)
+        plug_r, full_name_r, _, _ = self.__get_plug(f'{self.cube1}.r')
+        cmds.flushUndo()
+
+        with qm.ConnectionBatch() as batch:
+            batch.connect(plug, plug2)
+            batch.disconnect(plug_r, plug2)
+            self.assertEqual(len(batch), 2)
+        self.assertEqual(len(batch.failures), 1)
+        self.assertEqual(batch.failures[0].operation, qm.ConnectionBatch.DISCONNECT)
+        self.assertEqual(cmds.listConnections(full_name2, plugs=True, destination=False), [f'{cmds.ls(self.cube1)[0]}.translate'])
+
+        batch = qm.ConnectionBatch()
+        batch.connect(plug_r, plug2)
+        self.assertEqual(len(batch.apply()), 1)
+        batch.connect(plug_r, plug2, force=True)
+        self.assertEqual(len(batch.apply()), 0)
+        self.assertEqual(cmds.listConnections(full_name2, plugs=True, destination=False), [f'{cmds.ls(self.cube1)[0]}.rotate'])
+
+        # まとめた操作は 1 回の undo で戻る
+        cmds.undo()
+        self.assertEqual(cmds.listConnections(full_name2, plugs=True, destination=False), [f'{cmds.ls(self.cube1)[0]}.translate'])
+        cmds.undo()
+        self.assertIsNone(cmds.listConnections(full_name2, plugs=True, destination=False))
+
     def test_connection(self):
         plug, full_name, mplug, mattr = self.__get_plug(self.t)
         plug2, full_name2, _, _ = self.__get_plug(self.t2)
@@ -0,0 +1,229 @@
+import unittest
+import concurrent.futures
+import os
+import sys
+import tempfile
+import unittest.mock
+
+import maya.standalone
+maya.standalone.initialize(name='python')
+
+import maya.cmds as cmds
+from qymel.maya import scene_checker as sc
+from qymel.maya.scene_checker import serialization
+from qymel import scene_checker_batch
+
+
+class _MeshCountItem(sc.CheckItem):
+    _label = 'mesh count'
+    _category = 'mesh'
+    _read_only = True
+
+    def _extract(self):
+        return [node.mel_object for node in self.context.meshes()]
+
+    def _analyze(self, data):
+        for mesh in data:
+            self.append_warning(mesh, 'mesh found')
+
+
+class _TransformItem(sc.CheckItem):
+    _label = 'transform'
+    _category = 'transform'
+
+    def _execute(self):
+        for node in self.context.transforms():
+            self.append_error(node.mel_object, 'transform found', modifiable=True)
+
+
+class _ScaleItem(sc.CheckItem):
+    _label = 'scale'
+    _category = 'transform'
+
+    def _execute(self):
+        for node in self.context.transforms():
+            if node.sx.get() != 1.0:
+                self.append_error(node.mel_object, 'scaled')
+
+
+class _WatchedScaleItem(_ScaleItem):
+    _label = 'watched scale'
+    _watch_types = ('transform',)
+
+
+class TestSceneChecker(unittest.TestCase):
+
+    def setUp(self) -> None:
+        cmds.file(new=True, force=True)
+        cmds.polyCube()
+        cmds.polyCube()
+
+    def __create_checker(self) -> sc.Checker:
+        checker = sc.Checker()
+        checker.append('test').extend([_MeshCountItem(), _TransformItem()])
+        return checker
+
+    def test_execute_group(self):
+        checker = self.__create_checker()
+        other = checker.append('other')
+        item = _TransformItem()
+        other.append(item)
+
+        # グループはオブジェクトではなくラベルで探す
+        group = checker.execute_group('other')
+        self.assertIs(group, other)
+        self.assertTrue(other.is_executed(item))
+        self.assertFalse(any(checker.groups[0].is_executed(item) for item in checker.groups[0].items()))
+        self.assertIsNone(checker.execute_group('missing'))
+
+    def test_execute_parallel(self):
+        checker = self.__create_checker()
+        checker.execute_all()
+        expected = [(result.item.label, result.message, result.nodes) for result in checker.groups[0].results()]
+
+        checker.execute_all(max_workers=4)
+        actual = [(result.item.label, result.message, result.nodes) for result in checker.groups[0].results()]
+        self.assertEqual(actual, expected)
+        self.assertEqual(len(checker.timings()), 2)
+
+    def test_extract_analyze(self):
+        item = _MeshCountItem()
+        context = sc.SceneContext()
+
+        data = item.extract(context)
+        self.assertEqual(sorted(data), sorted(cmds.ls(type='mesh', long=True)))
+        self.assertIs(item.context, context)
+
+        # _analyze() は抜き出したデータだけで動く
+        results = item.analyze(['|a|aShape', '|b|bShape'])
+        self.assertEqual([result.nodes for result in results], [['|a|aShape'], ['|b|bShape']])
+        self.assertTrue(all(result.is_warning for result in results))
+        self.assertTrue(item.analyze([])[0].is_success)
+
+        expected = [result.nodes for result in item.analyze(data)]
+        self.assertEqual([result.nodes for result in item.execute(context)], expected)
+
+        # _read_only でない項目でも、_execute() を実装しなければ _extract() と _analyze() で実行する
+        class _SerialMeshCountItem(_MeshCountItem):
+            _read_only = False
+
+        results = _SerialMeshCountItem().execute(context)
+        self.assertEqual([result.nodes for result in results], expected)
+
+        with self.assertRaises(NotImplementedError):
+            sc.CheckItem().execute(context)
+
+    def test_execute_with_executor(self):
+        group = self.__create_checker().groups[0]
+        group.execute_all()
+        expected = [(result.item, result.message, result.nodes) for result in group.results()]
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+            group.execute_all(executor)
+        actual = [(result.item, result.message, result.nodes) for result in group.results()]
+        self.assertEqual(actual, expected)
+
+    def test_execute_incremental(self):
+        checker = sc.Checker()
+        unwatched = _ScaleItem()
+        watched = _WatchedScaleItem()
+        group = checker.append('test')
+        group.extend([unwatched, watched])
+
+        try:
+            self.assertCountEqual(checker.execute_incremental(), [unwatched, watched])
+            self.assertTrue(group.is_success())
+
+            # 監視していないタイプのノードの変更では、watch_types を宣言した項目は再実行しない
+            cmds.createNode('network')
+            self.assertEqual(checker.execute_incremental(), [unwatched])
+
+            # 成功していた（dependencies の無い）項目も、アトリビュートの変更で再実行される
+            cmds.setAttr('pCube1.sx', 2)
+            self.assertCountEqual(checker.execute_incremental(), [unwatched, watched])
+            for item in (unwatched, watched):
+                results = group.results(item)
+                self.assertEqual(len(results), 1)
+                self.assertTrue(results[0].is_error)
+                self.assertEqual(results[0].nodes, ['|pCube1'])
+
+            cmds.setAttr('pCube1.sx', 1)
+            checker.execute_incremental()
+            self.assertTrue(group.is_success())
+        finally:
+            checker.stop_tracking()
+
+    def test_serialization(self):
+        for ext in ('.jsonl', '.qcr'):
+            checker = self.__create_checker()
+            temp_dir = tempfile.TemporaryDirectory()
+            self.addCleanup(temp_dir.cleanup)
+            file_path = os.path.join(temp_dir.name, 'results' + ext)
+
+            with serialization.open_writer(file_path) as writer:
+                checker.add_listener(writer.write)
+                checker.execute_all()
+                checker.remove_listener(writer.write)
+
+            group = checker.groups[0]
+            expected = [(result.item, result.status, result.message, result.nodes) for result in group.results()]
+
+            self.assertEqual(serialization.load_results(file_path, checker.groups), len(expected))
+            actual = [(result.item, result.status, result.message, result.nodes) for result in group.results()]
+            self.assertEqual(actual, expected)
+
+
+# mayapy の代わりに起動するワーカー
+#   Maya のログのような行を混ぜつつ結果を返し、crash を含むファイルでは標準エラー出力に書いて落ちる
+_STUB_WORKER = '''
+import json
+import sys
+
+for line in sys.stdin:
+    file_path = line.strip()
+    if 'crash' in file_path:
+        sys.stderr.write('fatal error: ' + file_path + '\\n')
+        sys.stderr.flush()
+        sys.exit(3)
+    sys.stdout.write('// Maya log line\\n')
+    record = {'file': file_path, 'status': 'success', 'results': []}
+    sys.stdout.write(PREFIX + json.dumps(record) + '\\n')
+    sys.stdout.flush()
+'''
+
+
+class TestSceneCheckerBatch(unittest.TestCase):
+
+    def setUp(self) -> None:
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.stub_path = os.path.join(temp_dir.name, 'stub_worker.py')
+        with open(self.stub_path, 'w', encoding='utf-8') as f:
+            f.write(f'PREFIX = {scene_checker_batch._RESULT_PREFIX!r}\n' + _STUB_WORKER)
+
+    def test_run(self):
+        file_paths = ['a.ma', 'crash.ma', 'b.mb', 'c.ma']
+        options = scene_checker_batch.BatchOptions('my_checks', workers=2, retries=1)
+        records = []
+
+        with unittest.mock.patch.object(scene_checker_batch, '_worker_command', return_value=[sys.executable, self.stub_path]):
+            summary = scene_checker_batch.run(file_paths, options, records.append)
+
+        self.assertCountEqual([record['file'] for record in records], file_paths)
+        self.assertEqual(summary.counts, {'success': 3, 'failed': 1})
+
+        records = {record['file']: record for record in records}
+        crashed = records['crash.ma']
+        self.assertEqual(crashed['status'], 'failed')
+        self.assertEqual(crashed['attempts'], 2)
+        self.assertIn('fatal error: crash.ma', crashed['stderr'])
+
+        # 落ちたワーカーは起動し直して、残りのファイルを処理する
+        for file_path in ('a.ma', 'b.mb', 'c.ma'):
+            self.assertEqual(records[file_path]['status'], 'success')
+            self.assertEqual(records[file_path]['attempts'], 1)
+            self.assertNotIn('stderr', records[file_path])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,223 @@
+import gc
+import unittest
+
+import maya.standalone
+maya.standalone.initialize(name='python')
+
+import maya.cmds as cmds
+import maya.api.OpenMaya as om2
+import qymel.maya as qm
+from qymel.maya.internal import dirty_watch_impl
+
+
+_IDENTITY_LIST = [1, 0, 0, 0, 0, 1, 0, 0, 0, 0, 1, 0, 0, 0, 0, 1]
+
+
+class TestWorldMatrixCache(unittest.TestCase):
+
+    def setUp(self) -> None:
+        cmds.file(new=True, force=True)
+        self.parent = cmds.createNode('transform', name='parent')
+        self.child = cmds.polyCube()[0]
+        cmds.parent(self.child, self.parent)
+        self.child = cmds.ls(self.child, long=True)[0]
+        cmds.xform(self.parent, translation=(1, 2, 3), rotation=(10, 20, 30))
+        cmds.xform(self.child, translation=(4, 5, 6), scale=(2, 2, 2))
+
+    def __expected(self, node: str) -> list[float]:
+        return list(qm.eval_node(node).mdagpath.inclusiveMatrix())
+
+    def test_world_matrix(self):
+        with qm.WorldMatrixCache() as cache:
+            child = qm.eval_node(self.child)
+            for lhs, rhs in zip(cache.world_matrix(child), self.__expected(self.child)):
+                self.assertAlmostEqual(lhs, rhs)
+
+            matrices = cache.world_matrices([qm.eval_node(self.parent), child])
+            self.assertEqual(matrices.shape, (2, 4, 4))
+            for lhs, rhs in zip(matrices[1].ravel(), self.__expected(self.child)):
+                self.assertAlmostEqual(lhs, rhs)
+
+    def test_offset_parent_matrix(self):
+        offset = [1, 0, 0, 0, 0, 0, 1, 0, 0, -1, 0, 0, 7, 8, 9, 1]
+        cmds.setAttr(f'{self.child}.offsetParentMatrix', offset, type='matrix')
+        with qm.WorldMatrixCache() as cache:
+            child = qm.eval_node(self.child)
+            for lhs, rhs in zip(cache.world_matrix(child), self.__expected(self.child)):
+                self.assertAlmostEqual(lhs, rhs)
+
+            # offsetParentMatrix の変更も検知する
+            cmds.setAttr(f'{self.child}.offsetParentMatrix', _IDENTITY_LIST, type='matrix')
+            for lhs, rhs in zip(cache.world_matrix(child), self.__expected(self.child)):
+                self.assertAlmostEqual(lhs, rhs)
+
+    def test_inherits_transform(self):
+        cmds.setAttr(f'{self.child}.inheritsTransform', False)
+        with qm.WorldMatrixCache() as cache:
+            child = qm.eval_node(self.child)
+            for lhs, rhs in zip(cache.world_matrix(child), self.__expected(self.child)):
+                self.assertAlmostEqual(lhs, rhs)
+
+            # 親を動かしても変わらず、inheritsTransform を戻すと親の行列を掛ける
+            cmds.setAttr(f'{self.parent}.translateX', 10)
+            for lhs, rhs in zip(cache.world_matrix(child), self.__expected(self.child)):
+                self.assertAlmostEqual(lhs, rhs)
+            cmds.setAttr(f'{self.child}.inheritsTransform', True)
+            for lhs, rhs in zip(cache.world_matrix(child), self.__expected(self.child)):
+                self.assertAlmostEqual(lhs, rhs)
+
+    def test_invalidate(self):
+        with qm.WorldMatrixCache() as cache:
+            child = qm.eval_node(self.child)
+            cache.world_matrix(child)
+
+            invalidated = []
+            cache.add_listener(invalidated.append)
+            cmds.setAttr(f'{self.parent}.translateX', 10)
+            self.assertEqual(invalidated, [{'|parent', self.child}])
+            for lhs, rhs in zip(cache.world_matrix(child), self.__expected(self.child)):
+                self.assertAlmostEqual(lhs, rhs)
+
+    def test_time_change(self):
+        cmds.setKeyframe(self.parent, attribute='translateY', time=1, value=0)
+        cmds.setKeyframe(self.parent, attribute='translateY', time=10, value=20)
+        static = cmds.createNode('transform', name='static')
+        cmds.currentTime(1)
+
+        with qm.WorldMatrixCache() as cache:
+            child = qm.eval_node(self.child)
+            cache.world_matrix(child)
+            cache.world_matrix(qm.eval_node(static))
+
+            # アニメーションしているノード以下のエントリだけが捨てられる
+            invalidated = []
+            cache.add_listener(invalidated.append)
+            cmds.currentTime(10)
+            self.assertEqual(invalidated, [{'|parent', self.child}])
+            for lhs, rhs in zip(cache.world_matrix(child), self.__expected(self.child)):
+                self.assertAlmostEqual(lhs, rhs)
+
+
+class TestPointIndex(unittest.TestCase):
+
+    def setUp(self) -> None:
+        cmds.file(new=True, force=True)
+        sphere = cmds.polySphere(subdivisionsAxis=12, subdivisionsHeight=8)[0]
+        self.shape = cmds.listRelatives(sphere, shapes=True, fullPath=True)[0]
+
+    def test_nearest(self):
+        mesh = qm.eval_node(self.shape)
+        index = mesh.point_index()
+        self.assertIs(mesh.point_index(), index)
+
+        points = index.points
+        ids, distances = index.nearest(points + 1e-3)
+        self.assertSequenceEqual(list(ids), list(range(len(points))))
+
+        neighbors = index.within_radius(points[:1], 1e-6)
+        self.assertSequenceEqual(list(neighbors[0]), [0])
+
+    def test_mirror_map(self):
+        mesh = qm.eval_node(self.shape)
+        mirror = mesh.point_index().mirror_map(axis=0, tolerance=1e-4)
+        points = mesh.point_index().points
+        self.assertTrue((mirror >= 0).all())
+        for i, j in enumerate(mirror):
+            self.assertAlmostEqual(points[i][0], -points[j][0], places=4)
+
+    def test_cache_invalidation(self):
+        mesh = qm.eval_node(self.shape)
+        index = mesh.point_index()
+        cmds.move(1, 0, 0, f'{self.shape}.vtx[0]', relative=True)
+        self.assertIsNot(mesh.point_index(), index)
+
+        # ワールド空間の KD 木はトランスフォームの変更でも作り直す
+        index = mesh.point_index(om2.MSpace.kWorld)
+        self.assertIs(mesh.point_index(om2.MSpace.kWorld), index)
+        cmds.setAttr(f'{cmds.listRelatives(self.shape, parent=True, fullPath=True)[0]}.translateY', 5)
+        world_index = mesh.point_index(om2.MSpace.kWorld)
+        self.assertIsNot(world_index, index)
+        self.assertAlmostEqual(world_index.points[0][1], mesh.point_index().points[0][1] + 5)
+
+    def test_shared_callbacks(self):
+        gc.collect()
+        base_count = dirty_watch_impl.watched_node_count()
+
+        group = cmds.createNode('transform', name='group')
+        meshes = []
+        for _ in range(3):
+            sphere = cmds.polySphere()[0]
+            cmds.parent(sphere, group)
+            meshes.append(qm.eval_node(cmds.listRelatives(f'{group}|{sphere}', shapes=True, fullPath=True)[0]))
+
+        # 親のトランスフォームのコールバックは全メッシュで共有する
+        for mesh in meshes:
+            mesh.point_index()
+        self.assertEqual(dirty_watch_impl.watched_node_count(), base_count + 3)
+        for mesh in meshes:
+            mesh.point_index(om2.MSpace.kWorld)
+        self.assertEqual(dirty_watch_impl.watched_node_count(), base_count + 3 + 3 + 1)
+
+        meshes[0].release_point_indices()
+        self.assertEqual(dirty_watch_impl.watched_node_count(), base_count + 2 + 2 + 1)
+
+        # dirty になったら KD 木を作り直すまでは監視しない
+        cmds.setAttr(f'{group}.translateY', 5)
+        self.assertEqual(dirty_watch_impl.watched_node_count(), base_count)
+        meshes[1].point_index(om2.MSpace.kWorld)
+        self.assertEqual(dirty_watch_impl.watched_node_count(), base_count + 3)
+
+        del meshes
+        gc.collect()
+        self.assertEqual(dirty_watch_impl.watched_node_count(), base_count)
+
+
+class TestBoundingBoxIndex(unittest.TestCase):
+
+    def setUp(self) -> None:
+        cmds.file(new=True, force=True)
+        self.cubes = []
+        for i in range(10):
+            cube = cmds.polyCube(width=1, height=1, depth=1)[0]
+            cmds.xform(cube, translation=(i * 3, 0, 0))
+            self.cubes.append(cube)
+
+    def __names(self, shapes) -> list[str]:
+        return [cmds.listRelatives(shape.mel_object, parent=True)[0] for shape in shapes]
+
+    def test_query_box(self):
+        with qm.BoundingBoxIndex() as index:
+            self.assertEqual(index.size, 10)
+            self.assertEqual(self.__names(index.query_box((2.0, -1, -1), (7.0, 1, 1))), self.cubes[1:3])
+            self.assertEqual(index.query_box((100, 100, 100), (101, 101, 101)), [])
+
+    def test_query_ray(self):
+        with qm.BoundingBoxIndex() as index:
+            hits = index.query_ray((-10, 0, 0), (1, 0, 0))
+            self.assertEqual(self.__names(shape for shape, _ in hits), self.cubes)
+            self.assertAlmostEqual(hits[0][1], 9.5)
+            self.assertEqual(index.query_ray((-10, 5, 0), (1, 0, 0)), [])
+
+    def test_nearest(self):
+        with qm.BoundingBoxIndex() as index:
+            nearest = index.nearest((9.2, 0, 0), k=2)
+            self.assertEqual(self.__names(shape for shape, _ in nearest), [self.cubes[3], self.cubes[2]])
+            self.assertAlmostEqual(nearest[0][1], 0.0)
+
+    def test_update(self):
+        with qm.BoundingBoxIndex() as index:
+            cmds.setAttr(f'{self.cubes[0]}.translateY', 50)
+            self.assertEqual(self.__names(index.query_box((-1, 49, -1), (1, 51, 1))), [self.cubes[0]])
+
+    def test_time_change(self):
+        cmds.setKeyframe(self.cubes[1], attribute='translateY', time=1, value=0)
+        cmds.setKeyframe(self.cubes[1], attribute='translateY', time=10, value=20)
+        cmds.currentTime(1)
+
+        with qm.BoundingBoxIndex() as index:
+            cmds.currentTime(10)
+            self.assertEqual(self.__names(index.query_box((2, 19, -1), (4, 21, 1))), [self.cubes[1]])
+
+            # 時間の変更で更新しなかったシェイプの変更も引き続き検知する
+            cmds.setAttr(f'{self.cubes[0]}.translateY', 50)
+            self.assertEqual(self.__names(index.query_box((-1, 49, -1), (1, 51, 1))), [self.cubes[0]])
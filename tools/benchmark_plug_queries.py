@@ -0,0 +1,82 @@
+u"""
+Plug.full_name / Plug.exists / Component.exists を、cmds を経由していた以前の実装と比べる
+
+mayapy tools/benchmark_plug_queries.py [ノード数] [繰り返し回数]
+"""
+import sys
+import time
+
+import maya.standalone
+maya.standalone.initialize(name='python')
+
+import maya.cmds as cmds
+import qymel.maya as qm
+
+
+_ATTRIBUTES = ['translate', 'translateX', 'rotateY', 'scale', 'visibility', 'worldMatrix[0]']
+
+
+def _legacy_full_name(plug: qm.Plug) -> str:
+    return cmds.ls(plug.mel_object, long=True)[0]
+
+
+def _legacy_plug_exists(plug: qm.Plug) -> bool:
+    return cmds.objExists(plug.mel_object)
+
+
+def _legacy_component_exists(comp: qm.Component) -> bool:
+    for mel_obj in comp.mel_object:
+        if not cmds.objExists(mel_obj):
+            return False
+    return True
+
+
+def _measure(label: str, func, items: list, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for item in items:
+            func(item)
+    elapsed = time.perf_counter() - start
+    print('  {:<28} {:>9.3f} sec'.format(label, elapsed))
+    return elapsed
+
+
+def _compare(title: str, legacy, current, items: list, repeat: int) -> None:
+    print('{} ({} x {})'.format(title, len(items), repeat))
+    legacy_elapsed = _measure('cmds', legacy, items, repeat)
+    current_elapsed = _measure('api', current, items, repeat)
+    print('  {:<28} {:>9.1f} x'.format('speedup', legacy_elapsed / max(current_elapsed, 1e-9)))
+
+
+def main(node_count: int, repeat: int) -> None:
+    cmds.file(new=True, force=True)
+
+    # 親子付けして、フルパスが長くなるようにしておく
+    parent = None
+    nodes = []
+    for i in range(node_count):
+        cube, _ = cmds.polyCube(name='benchCube{}'.format(i))
+        if parent is not None and i % 10 != 0:
+            cube = cmds.parent(cube, parent)[0]
+        parent = cube
+        nodes.append(qm.eval_node(cmds.ls(cube, long=True)[0]))
+
+    plugs = [qm.Plug('{}.{}'.format(node.full_name, attr)) for node in nodes for attr in _ATTRIBUTES]
+    comps = [qm.eval_component('{}.vtx[0:3]'.format(node.full_name)) for node in nodes]
+
+    for plug in plugs:
+        assert plug.full_name == _legacy_full_name(plug), plug.full_name
+        assert plug.exists == _legacy_plug_exists(plug), plug.full_name
+    for comp in comps:
+        assert comp.exists == _legacy_component_exists(comp), comp
+
+    _compare('Plug.full_name', _legacy_full_name, lambda plug: plug.full_name, plugs, repeat)
+    _compare('Plug.exists', _legacy_plug_exists, lambda plug: plug.exists, plugs, repeat)
+    _compare('Component.exists', _legacy_component_exists, lambda comp: comp.exists, comps, repeat)
+
+
+if __name__ == '__main__':
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 200,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    )